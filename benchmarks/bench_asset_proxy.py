@@ -0,0 +1,139 @@
+"""Benchmark /assets proxy latency: per-request client vs pooled client.
+
+Starts a local threaded asset server (like `fastapps dev` does on port 4444),
+then drives the /assets route in-process with concurrent "widget loads", each
+fetching a bundle's JS, CSS and an image. Reports p50/p99 request latency for
+the old per-request httpx client and the pooled app-lifetime client.
+
+Usage:
+    python benchmarks/bench_asset_proxy.py
+"""
+
+import asyncio
+import statistics
+import tempfile
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+from pydantic import BaseModel
+from starlette.applications import Starlette
+from starlette.responses import Response
+from starlette.routing import Route
+
+from fastapps import BaseWidget, WidgetBuildResult, WidgetMCPServer
+
+WIDGET_LOADS = 200
+CONCURRENCY = 50
+ASSETS = {
+    "bench-abcd.js": b"console.log('x');" * 20_000,
+    "bench-abcd.css": b"body{margin:0}" * 2_000,
+    "logo.png": b"\x89PNG" + b"\x00" * 30_000,
+}
+
+
+class BenchInput(BaseModel):
+    pass
+
+
+class BenchWidget(BaseWidget):
+    identifier = "bench"
+    title = "Bench"
+    input_schema = BenchInput
+
+    async def execute(self, input_data, context=None, user=None):
+        return {}
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+
+def per_request_client_app(upstream: str) -> Starlette:
+    """The previous proxy: a fresh AsyncClient (and connection) per request."""
+
+    async def proxy_assets(request):
+        path = request.path_params.get("path", "")
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            upstream_response = await client.get(f"{upstream}/{path}")
+            return Response(
+                content=upstream_response.content,
+                status_code=upstream_response.status_code,
+                headers={"content-type": upstream_response.headers["content-type"]},
+            )
+
+    return Starlette(routes=[Route("/assets/{path:path}", proxy_assets)])
+
+
+async def measure(app) -> list[float]:
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+
+            async def fetch(name: str):
+                start = time.perf_counter()
+                response = await client.get(f"/assets/{name}")
+                latencies.append(time.perf_counter() - start)
+                assert response.status_code == 200
+
+            async def widget_load():
+                async with semaphore:
+                    await asyncio.gather(*(fetch(name) for name in ASSETS))
+
+            await asyncio.gather(*(widget_load() for _ in range(WIDGET_LOADS)))
+    return latencies
+
+
+def percentile(values: list[float], pct: float) -> float:
+    return statistics.quantiles(values, n=100)[int(pct) - 1]
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        for name, content in ASSETS.items():
+            (Path(directory) / name).write_bytes(content)
+
+        httpd = ThreadingHTTPServer(
+            ("127.0.0.1", 0), partial(QuietHandler, directory=directory)
+        )
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        upstream = "http://{}:{}".format(*httpd.server_address)
+
+        widget = BenchWidget(WidgetBuildResult(name="bench", hash="abcd", html=""))
+        configurations = {
+            "per-request client": per_request_client_app(upstream),
+            "pooled client": WidgetMCPServer("bench", [widget]).get_app(
+                asset_upstream_url=upstream
+            ),
+        }
+
+        print(
+            f"{WIDGET_LOADS} widget loads x {len(ASSETS)} assets, "
+            f"{CONCURRENCY} concurrent"
+        )
+        print(f"{'proxy':<20} {'p50 ms':>8} {'p99 ms':>8}")
+        try:
+            for label, app in configurations.items():
+                latencies = asyncio.run(measure(app))
+                print(
+                    f"{label:<20} {percentile(latencies, 50) * 1000:>8.2f} "
+                    f"{percentile(latencies, 99) * 1000:>8.2f}"
+                )
+        finally:
+            httpd.shutdown()
+            httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
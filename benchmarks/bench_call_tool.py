@@ -0,0 +1,89 @@
+"""Benchmark tools/call cost for hosted vs inline bundles per response mode.
+
+Runs a fixed batch of calls per configuration and reports per-call latency
+(handler plus JSON serialization), response size and the bandwidth the
+responses would need at a sustained 1k calls/s.
+
+Usage:
+    python benchmarks/bench_call_tool.py
+"""
+
+import asyncio
+import time
+
+from mcp import types
+from pydantic import BaseModel
+
+from fastapps import BaseWidget, WidgetBuildResult, WidgetMCPServer
+
+CALLS = 1000
+TARGET_RATE = 1000  # calls per second
+
+HOSTED_HTML = """<!doctype html>
+<html>
+<head>
+  <script type="module" src="/assets/bench-abcd.js"></script>
+  <link rel="stylesheet" href="/assets/bench-abcd.css">
+</head>
+<body>
+  <div id="bench-root"></div>
+</body>
+</html>
+"""
+INLINE_HTML = (
+    '<!doctype html><html><head><script type="module">'
+    + "console.log('x');" * 60_000
+    + '</script></head><body><div id="bench-root"></div></body></html>'
+)
+
+
+class BenchInput(BaseModel):
+    query: str = "coffee"
+
+
+class BenchWidget(BaseWidget):
+    identifier = "bench"
+    title = "Bench"
+    input_schema = BenchInput
+
+    async def execute(self, input_data, context=None, user=None):
+        return {"query": input_data.query, "items": list(range(10))}
+
+
+async def measure(server: WidgetMCPServer) -> tuple[float, int]:
+    handler = server.mcp._mcp_server.request_handlers[types.CallToolRequest]
+    request = types.CallToolRequest(
+        method="tools/call",
+        params=types.CallToolRequestParams(name="bench", arguments={"query": "x"}),
+    )
+    size = 0
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        result = await handler(request)
+        size = len(result.model_dump_json(by_alias=True, exclude_none=True))
+    return (time.perf_counter() - start) / CALLS * 1e3, size
+
+
+def main():
+    print(
+        f"{'bundle':>7}  {'mode':>9}  {'ms/call':>8}  {'bytes/resp':>11}"
+        f"  {'MB/s @1k':>9}"
+    )
+    for bundle, html in (("hosted", HOSTED_HTML), ("inline", INLINE_HTML)):
+        for mode in ("embed", "reference"):
+            widget = BenchWidget(
+                WidgetBuildResult(name="bench", hash="abcd", html=html)
+            )
+            server = WidgetMCPServer(
+                name="bench", widgets=[widget], widget_response_mode=mode
+            )
+            per_call, size = asyncio.run(measure(server))
+            bandwidth = size * TARGET_RATE / 1e6
+            print(
+                f"{bundle:>7}  {mode:>9}  {per_call:>8.3f}  {size:>11}"
+                f"  {bandwidth:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
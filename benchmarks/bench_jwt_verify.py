@@ -0,0 +1,175 @@
+"""Benchmark JWTVerifier: signing algorithms and verification modes.
+
+Starts a local stub OpenID issuer, then verifies a burst of distinct tokens
+(one per user, so the verified-token cache never hits) concurrently. For
+each algorithm it compares verifying on the event loop with the bounded
+verification thread pool, and a repeat burst served from the token cache.
+
+Reports throughput, p50/p99 verification latency, and the worst event loop
+stall observed by a 1 ms ticker running alongside (what every other request
+on the server would feel).
+
+Usage:
+    python benchmarks/bench_jwt_verify.py
+"""
+
+import asyncio
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from jwt.algorithms import ECAlgorithm, OKPAlgorithm, RSAAlgorithm
+
+from fastapps import JWTVerifier
+
+TOKENS = 400
+CONCURRENCY = 50
+VERIFY_WORKERS = 4
+
+ALGORITHMS = {
+    "RS256": (
+        lambda: rsa.generate_private_key(public_exponent=65537, key_size=2048),
+        RSAAlgorithm,
+    ),
+    "ES256": (lambda: ec.generate_private_key(ec.SECP256R1()), ECAlgorithm),
+    "EdDSA": (ed25519.Ed25519PrivateKey.generate, OKPAlgorithm),
+}
+
+
+class IssuerHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        issuer = self.server
+        if self.path == "/.well-known/openid-configuration":
+            body = {"issuer": issuer.url, "jwks_uri": f"{issuer.url}/jwks.json"}
+        else:
+            body = issuer.jwks
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_issuer() -> ThreadingHTTPServer:
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), IssuerHandler)
+    httpd.url = "http://127.0.0.1:{}".format(httpd.server_address[1])
+    httpd.jwks = {"keys": []}
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+
+def make_tokens(issuer, algorithm: str) -> list[str]:
+    make_key, jwk_algorithm = ALGORITHMS[algorithm]
+    private_key = make_key()
+    jwk = jwk_algorithm.to_jwk(private_key.public_key(), as_dict=True)
+    jwk.update({"kid": algorithm, "use": "sig", "alg": algorithm})
+    issuer.jwks["keys"].append(jwk)
+
+    now = int(time.time())
+    return [
+        jwt.encode(
+            {
+                "iss": issuer.url,
+                "sub": f"user-{i}",
+                "azp": "bench",
+                "iat": now,
+                "exp": now + 3600,
+            },
+            private_key,
+            algorithm=algorithm,
+            headers={"kid": algorithm},
+        )
+        for i in range(TOKENS)
+    ]
+
+
+async def measure(verifier: JWTVerifier, tokens: list[str]):
+    latencies: list[float] = []
+    stalls: list[float] = []
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            stalls.append(time.perf_counter() - start - 0.001)
+
+    async def verify(token: str):
+        async with semaphore:
+            start = time.perf_counter()
+            assert await verifier.verify_token(token) is not None
+            latencies.append(time.perf_counter() - start)
+
+    tick = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    await asyncio.gather(*(verify(token) for token in tokens))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await tick
+    return elapsed, latencies, max(stalls, default=0.0)
+
+
+async def run(verifier: JWTVerifier, algorithm: str, tokens: list[str]):
+    """Measure a burst of new tokens, then the same burst again (cache hits)."""
+    # Discover the issuer and load its keys so only verification is measured
+    await verifier.start()
+    first = await measure(verifier, tokens)
+    repeat = await measure(verifier, tokens)
+    return first, repeat
+
+
+def percentile(values: list[float], pct: float) -> float:
+    return statistics.quantiles(values, n=100)[int(pct) - 1]
+
+
+def report(label: str, elapsed: float, latencies: list[float], stall: float):
+    print(
+        f"{label:<24} {len(latencies) / elapsed:>10.0f} "
+        f"{percentile(latencies, 50) * 1000:>8.2f} "
+        f"{percentile(latencies, 99) * 1000:>8.2f} "
+        f"{stall * 1000:>10.2f}"
+    )
+
+
+def main():
+    issuer = start_issuer()
+    try:
+        tokens = {algorithm: make_tokens(issuer, algorithm) for algorithm in ALGORITHMS}
+
+        print(f"{TOKENS} distinct tokens, {CONCURRENCY} concurrent")
+        print(
+            f"{'configuration':<24} {'tokens/s':>10} {'p50 ms':>8} "
+            f"{'p99 ms':>8} {'max stall':>10}"
+        )
+        for algorithm, algorithm_tokens in tokens.items():
+            for mode, workers in (
+                ("loop", 0),
+                (f"pool({VERIFY_WORKERS})", VERIFY_WORKERS),
+            ):
+                verifier = JWTVerifier(
+                    issuer_url=issuer.url,
+                    algorithms=[algorithm],
+                    verify_workers=workers,
+                )
+
+                first, repeat = asyncio.run(run(verifier, algorithm, algorithm_tokens))
+                report(f"{algorithm} {mode}", *first)
+                if workers == 0:
+                    report(f"{algorithm} token cache hit", *repeat)
+                verifier.close()
+    finally:
+        issuer.shutdown()
+        issuer.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Benchmark tools/list latency against the number of registered widgets.
+
+Usage:
+    python benchmarks/bench_list_tools.py
+"""
+
+import asyncio
+import time
+
+from mcp import types
+from pydantic import BaseModel, Field
+
+from fastapps import BaseWidget, WidgetBuildResult, WidgetMCPServer
+
+ITERATIONS = 2000
+
+
+class BenchInput(BaseModel):
+    query: str = Field(..., description="Search query")
+    limit: int = Field(10, ge=1, le=100)
+    tags: list[str] = Field(default_factory=list)
+
+
+def make_widgets(count: int) -> list[BaseWidget]:
+    widgets = []
+    for i in range(count):
+
+        class BenchWidget(BaseWidget):
+            identifier = f"widget_{i}"
+            title = f"Widget {i}"
+            input_schema = BenchInput
+
+            async def execute(self, input_data, context=None, user=None):
+                return {}
+
+        widgets.append(
+            BenchWidget(WidgetBuildResult(name=f"widget_{i}", hash="0000", html=""))
+        )
+    return widgets
+
+
+async def measure(server: WidgetMCPServer) -> float:
+    handler = server.mcp._mcp_server.request_handlers[types.ListToolsRequest]
+    request = types.ListToolsRequest(method="tools/list")
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        await handler(request)
+    return (time.perf_counter() - start) / ITERATIONS * 1e6
+
+
+def main():
+    print(f"{'widgets':>8}  {'build (ms)':>10}  {'tools/list (us)':>16}")
+    for count in (1, 10, 100, 500):
+        widgets = make_widgets(count)
+        start = time.perf_counter()
+        server = WidgetMCPServer(name="bench", widgets=widgets)
+        build_ms = (time.perf_counter() - start) * 1e3
+        per_call = asyncio.run(measure(server))
+        print(f"{count:>8}  {build_ms:>10.1f}  {per_call:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
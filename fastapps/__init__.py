@@ -18,7 +18,16 @@ Example:
 __author__ = "FastApps Team"
 
 from .builder.compiler import WidgetBuilder, WidgetBuildResult
+from .core.assets import StaticAssets
+from .core.cache import CacheBackend, MemoryCacheBackend, SQLiteCacheBackend
 from .core.server import WidgetMCPServer
+from .core.tracing import (
+    BatchSpanExporter,
+    FileSpanExporter,
+    OTLPHTTPSpanExporter,
+    SpanExporter,
+    ToolCallTrace,
+)
 from .core.widget import BaseWidget, ClientContext, UserContext
 from .types.schema import ConfigDict, Field
 
@@ -47,6 +56,15 @@ __all__ = [
     "WidgetMCPServer",
     "WidgetBuilder",
     "WidgetBuildResult",
+    "CacheBackend",
+    "MemoryCacheBackend",
+    "SQLiteCacheBackend",
+    "StaticAssets",
+    "ToolCallTrace",
+    "SpanExporter",
+    "BatchSpanExporter",
+    "FileSpanExporter",
+    "OTLPHTTPSpanExporter",
     "Field",
     "ConfigDict",
 ] + _auth_exports
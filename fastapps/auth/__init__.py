@@ -6,6 +6,7 @@ and re-exports FastMCP auth components.
 """
 
 from .decorators import auth_required, no_auth, optional_auth
+from .policy import AuthPolicy
 from .verifier import JWTVerifier
 
 # Re-export FastMCP auth components for convenience
@@ -20,6 +21,7 @@ __all__ = [
     "JWTVerifier",
     "TokenVerifier",
     "AccessToken",
+    "AuthPolicy",
     "auth_required",
     "no_auth",
     "optional_auth",
@@ -0,0 +1,261 @@
+"""
+Async JWKS cache for JWTVerifier.
+
+Keeps the issuer's signing keys in memory keyed by ``kid`` so token
+verification is a dictionary lookup. Keys are refreshed in the background
+once they are older than the TTL (stale keys keep being served meanwhile),
+and an unknown ``kid`` triggers at most one refetch per refetch interval so
+forged tokens cannot hammer the issuer.
+
+Optionally the key set (and, in JWTVerifier, the OpenID discovery document)
+is mirrored to disk, so a restarted server verifies tokens immediately
+instead of waiting on the issuer.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import httpx
+
+try:
+    import jwt
+
+    JWT_AVAILABLE = True
+except ImportError:
+    jwt = None
+    JWT_AVAILABLE = False
+
+# Seconds before cached keys are refreshed in the background
+DEFAULT_JWKS_TTL = 300.0
+# Minimum seconds between refetches triggered by an unknown kid
+DEFAULT_REFETCH_INTERVAL = 30.0
+DEFAULT_FETCH_TIMEOUT = 10.0
+
+
+class JWKSError(Exception):
+    """Raised when no signing key is available for a token."""
+
+
+def issuer_cache_path(cache_dir: Path, issuer_url: str, kind: str) -> Path:
+    """File in cache_dir holding an issuer's "discovery" or "jwks" document."""
+    digest = hashlib.sha256(issuer_url.encode()).hexdigest()[:16]
+    return cache_dir / f"{digest}-{kind}.json"
+
+
+def read_json_file(path: Path) -> Optional[Dict[str, Any]]:
+    """Read a cached JSON document, or None if missing or unreadable."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def write_json_file(path: Path, data: Dict[str, Any]):
+    """Atomically replace a cached JSON document."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class JWKSCache:
+    """
+    Signing keys from a JWKS endpoint, cached by key ID.
+
+    Example:
+        cache = JWKSCache("https://tenant.auth0.com/.well-known/jwks.json")
+        key = await cache.get_signing_key(kid)
+    """
+
+    def __init__(
+        self,
+        jwks_uri: str,
+        ttl: float = DEFAULT_JWKS_TTL,
+        refetch_interval: float = DEFAULT_REFETCH_INTERVAL,
+        timeout: float = DEFAULT_FETCH_TIMEOUT,
+        cache_path: Optional[Path] = None,
+    ):
+        """
+        Args:
+            jwks_uri: URL of the issuer's JSON Web Key Set
+            ttl: Seconds after which keys are refreshed in the background
+            refetch_interval: Minimum seconds between refetches for unknown
+                kids, and between retries while no keys could be fetched
+            timeout: HTTP timeout for JWKS fetches
+            cache_path: File mirroring the last fetched key set (optional).
+                Loaded on first use, so restarts skip the initial fetch.
+        """
+        self.jwks_uri = jwks_uri
+        self.ttl = ttl
+        self.refetch_interval = refetch_interval
+        self.timeout = timeout
+        self.cache_path = Path(cache_path) if cache_path is not None else None
+
+        self._keys: Dict[Optional[str], Any] = {}
+        self._fetched_at: Optional[float] = None
+        self._last_refetch: Optional[float] = None
+        # Last failed fetch while no keys were available (fail fast until
+        # refetch_interval has passed instead of queueing a fetch per request)
+        self._failed_at: Optional[float] = None
+        self._failure: Optional[Exception] = None
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.fetches = 0
+
+    @property
+    def is_stale(self) -> bool:
+        return (
+            self._fetched_at is None or time.monotonic() - self._fetched_at > self.ttl
+        )
+
+    async def get_signing_key(self, kid: Optional[str]) -> Any:
+        """
+        Return the PyJWK for a key ID.
+
+        The first call fetches the key set; later calls are served from
+        memory, scheduling a background refresh once the keys are stale.
+
+        Raises:
+            JWKSError: If the key set cannot be fetched or has no such key
+        """
+        await self.load()
+        if self.is_stale:
+            self._schedule_refresh()
+
+        key = self._lookup(kid)
+        if key is None and self._may_refetch():
+            # Key rotation: the issuer may have published a new key
+            self._last_refetch = time.monotonic()
+            await self.refresh(force=True)
+            key = self._lookup(kid)
+        if key is None:
+            raise JWKSError(f"No signing key found for kid {kid!r}")
+        return key
+
+    async def load(self):
+        """
+        Make keys available: from memory, the disk cache, or the issuer.
+
+        Raises:
+            JWKSError: If there is no usable disk cache and fetching fails
+        """
+        if self._fetched_at is not None:
+            return
+        if self.cache_path is not None and await asyncio.to_thread(
+            self._load_from_disk
+        ):
+            return
+        await self.refresh()
+
+    def _load_from_disk(self) -> bool:
+        if self.cache_path is None:
+            return False
+        try:
+            age = max(0.0, time.time() - self.cache_path.stat().st_mtime)
+            data = read_json_file(self.cache_path)
+            keys = self._parse(data or {})
+        except (OSError, ValueError):
+            return False
+        if self._fetched_at is None:
+            self._keys = keys
+            # Age carries over, so old keys are refreshed in the background
+            self._fetched_at = time.monotonic() - age
+        return True
+
+    def _lookup(self, kid: Optional[str]) -> Any:
+        key = self._keys.get(kid)
+        if key is None and kid is None and len(self._keys) == 1:
+            # Tokens without a kid are accepted when the issuer has one key
+            key = next(iter(self._keys.values()))
+        return key
+
+    def _may_refetch(self) -> bool:
+        return (
+            self._last_refetch is None
+            or time.monotonic() - self._last_refetch >= self.refetch_interval
+        )
+
+    def _schedule_refresh(self):
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._background_refresh())
+
+    async def _background_refresh(self):
+        try:
+            await self.refresh()
+        except JWKSError as e:
+            # Keep serving the stale keys; the next request retries
+            print(f"Warning: JWKS refresh failed, using cached keys: {e}")
+
+    async def refresh(self, force: bool = False):
+        """
+        Fetch the key set, coalescing concurrent callers into one request.
+
+        Args:
+            force: Refetch even if the keys are still fresh
+
+        Raises:
+            JWKSError: If fetching fails and no keys are cached
+        """
+        fetched_at = self._fetched_at
+        async with self._lock:
+            # Another caller refreshed while we waited for the lock
+            if self._fetched_at != fetched_at and (force or not self.is_stale):
+                return
+            if (
+                not self._keys
+                and self._failed_at is not None
+                and time.monotonic() - self._failed_at < self.refetch_interval
+            ):
+                raise JWKSError(
+                    f"JWKS fetch from {self.jwks_uri} recently failed: {self._failure}"
+                )
+            try:
+                data = await self._fetch()
+                keys = self._parse(data)
+            except Exception as e:
+                if self._keys:
+                    # Back off for a TTL before retrying a failing issuer
+                    self._fetched_at = time.monotonic()
+                else:
+                    self._failed_at = time.monotonic()
+                    self._failure = e
+                raise JWKSError(
+                    f"Failed to fetch JWKS from {self.jwks_uri}: {e}"
+                ) from e
+            self._keys = keys
+            self._fetched_at = time.monotonic()
+            self._failed_at = None
+            if self.cache_path is not None:
+                try:
+                    await asyncio.to_thread(write_json_file, self.cache_path, data)
+                except OSError as e:
+                    print(f"Warning: could not write JWKS cache {self.cache_path}: {e}")
+
+    async def _fetch(self) -> Dict[str, Any]:
+        self.fetches += 1
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            response = await client.get(self.jwks_uri)
+            response.raise_for_status()
+            return response.json()
+
+    @staticmethod
+    def _parse(data: Dict[str, Any]) -> Dict[Optional[str], Any]:
+        keys: Dict[Optional[str], Any] = {}
+        for jwk in data.get("keys", []):
+            if jwk.get("use", "sig") != "sig":
+                continue
+            try:
+                key = jwt.PyJWK(jwk)
+            except (jwt.PyJWKError, jwt.InvalidKeyError):
+                # Unsupported key type or algorithm
+                continue
+            keys[jwk.get("kid")] = key
+        if not keys:
+            raise ValueError("JWKS contains no usable signing keys")
+        return keys
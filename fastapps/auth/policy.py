@@ -0,0 +1,64 @@
+"""
+Compiled per-widget authorization policy.
+
+The decorators in decorators.py annotate widget classes; WidgetMCPServer
+compiles those annotations (plus server-wide auth inheritance) once per
+widget into an AuthPolicy, used both to enforce tools/call and to
+advertise securitySchemes in tools/list.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class AuthPolicy:
+    """
+    Resolved authentication requirements for one widget.
+
+    Attributes:
+        requires_auth: Calls without an access token are rejected
+        scopes: Scopes an authenticated caller must hold
+        security_schemes: securitySchemes advertised in tool metadata
+            (None when neither the widget nor the server declares any)
+    """
+
+    requires_auth: bool
+    scopes: FrozenSet[str]
+    security_schemes: Optional[Tuple[Dict[str, Any], ...]]
+
+    @classmethod
+    def compile(
+        cls,
+        widget: Any,
+        server_requires_auth: bool = False,
+        server_scopes: Optional[List[str]] = None,
+    ) -> "AuthPolicy":
+        """
+        Resolve a widget's decorators against the server's auth settings.
+
+        Per MCP spec, a widget without a decorator inherits the server
+        default: auth is required (with the server's scopes advertised)
+        when the server has auth configured, otherwise the tool is public.
+        """
+        requires_auth = getattr(widget, "_auth_required", None)
+        if requires_auth is None:
+            requires_auth = server_requires_auth
+
+        security_schemes = getattr(widget, "_security_schemes", None)
+        if security_schemes is None and server_requires_auth:
+            security_schemes = [{"type": "oauth2", "scopes": list(server_scopes or [])}]
+
+        return cls(
+            requires_auth=bool(requires_auth),
+            scopes=frozenset(getattr(widget, "_auth_scopes", None) or ()),
+            security_schemes=(
+                tuple(security_schemes) if security_schemes is not None else None
+            ),
+        )
+
+    def missing_scopes(self, granted: Iterable[str]) -> List[str]:
+        """Required scopes absent from ``granted`` (empty when allowed)."""
+        if not self.scopes or self.scopes.issubset(granted):
+            return []
+        return sorted(self.scopes.difference(granted))
@@ -0,0 +1,99 @@
+"""
+Verified-token cache for JWTVerifier.
+
+Stateless MCP clients send the same bearer token with every request. Once
+a token's signature and claims have been verified, its AccessToken is
+cached until the token's ``exp`` so repeat requests skip signature
+verification entirely.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_TOKEN_CACHE_SIZE = 1024
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU cache of verified tokens, keyed by a SHA-256 token digest.
+
+    Raw tokens are never stored as keys. Entries expire at the token's
+    ``exp`` claim; tokens without one are not cached.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_TOKEN_CACHE_SIZE):
+        """
+        Args:
+            max_entries: Maximum number of tokens kept (least recently used
+                entries are evicted first)
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+
+        self.max_entries = max_entries
+        # digest -> (exp as UNIX time, AccessToken, verification CPU seconds)
+        self._entries: "OrderedDict[bytes, Tuple[float, Any, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.saved_seconds = 0.0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[Any]:
+        """Return the cached AccessToken, or None if missing or expired."""
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, access_token, cost = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        self.saved_seconds += cost
+        return access_token
+
+    def set(
+        self, token: str, access_token: Any, expires_at: Optional[float], cost: float
+    ):
+        """
+        Cache a verified token.
+
+        Args:
+            token: Raw bearer token
+            access_token: AccessToken returned for it
+            expires_at: The token's ``exp`` claim (not cached when None)
+            cost: CPU seconds spent verifying it, credited on every hit
+        """
+        if expires_at is None or expires_at <= time.time():
+            return
+        key = self._key(token)
+        self._entries[key] = (float(expires_at), access_token, cost)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "saved_seconds": self.saved_seconds,
+        }
@@ -5,13 +5,31 @@ Provides automatic JWT validation with JWKS discovery for Auth0, Okta, Azure AD,
 and other OAuth 2.1 providers.
 """
 
-from typing import List, Optional
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
 
+from .jwks import (
+    DEFAULT_FETCH_TIMEOUT,
+    DEFAULT_JWKS_TTL,
+    DEFAULT_REFETCH_INTERVAL,
+    JWKSCache,
+    JWKSError,
+    issuer_cache_path,
+    read_json_file,
+    write_json_file,
+)
+from .token_cache import DEFAULT_TOKEN_CACHE_SIZE, VerifiedTokenCache
+
+# Signing algorithms accepted unless JWTVerifier(algorithms=...) says otherwise
+DEFAULT_ALGORITHMS = ("RS256",)
+
 try:
     import jwt
-    from jwt import PyJWKClient
     from mcp.server.auth.provider import AccessToken, TokenVerifier
 
     MCP_AUTH_AVAILABLE = True
@@ -41,18 +59,38 @@ class JWTVerifier(TokenVerifier):
         issuer_url: str,
         audience: Optional[str] = None,
         required_scopes: Optional[List[str]] = None,
+        jwks_ttl: float = DEFAULT_JWKS_TTL,
+        jwks_refetch_interval: float = DEFAULT_REFETCH_INTERVAL,
+        token_cache_size: int = DEFAULT_TOKEN_CACHE_SIZE,
+        algorithms: Optional[List[str]] = None,
+        verify_workers: int = 0,
+        cache_dir: Optional[Path | str] = None,
     ):
         """
         Initialize JWT verifier with automatic JWKS discovery.
 
+        Discovery is deferred to start() or the first verification, so
+        creating the verifier never touches the network.
+
         Args:
             issuer_url: OAuth issuer URL (e.g., https://tenant.auth0.com)
             audience: Expected audience claim in JWT (optional)
             required_scopes: List of required scopes/permissions (optional)
+            jwks_ttl: Seconds before signing keys are refreshed in the background
+            jwks_refetch_interval: Minimum seconds between JWKS refetches
+                triggered by tokens with an unknown key ID
+            token_cache_size: Verified tokens kept until their exp, so repeat
+                requests skip signature checks (0 disables the cache)
+            algorithms: Accepted signing algorithms (default ["RS256"]), e.g.
+                ["ES256", "EdDSA"] for issuers with EC/OKP keys
+            verify_workers: Run signature verification in a thread pool of
+                this size instead of on the event loop (0 disables)
+            cache_dir: Directory mirroring the issuer's discovery document and
+                JWKS, so restarts verify tokens without waiting on the issuer
 
         Raises:
-            RuntimeError: If JWKS discovery fails
             ImportError: If required dependencies are not installed
+            ValueError: If an algorithm is unknown or "none"
         """
         if not MCP_AUTH_AVAILABLE:
             raise ImportError(
@@ -63,32 +101,160 @@ class JWTVerifier(TokenVerifier):
         self.issuer_url = issuer_url.rstrip("/")
         self.audience = audience
         self.required_scopes = required_scopes or []
+        self.jwks_ttl = jwks_ttl
+        self.jwks_refetch_interval = jwks_refetch_interval
+        self.token_cache = (
+            VerifiedTokenCache(token_cache_size) if token_cache_size > 0 else None
+        )
+
+        self.algorithms = list(algorithms or DEFAULT_ALGORITHMS)
+        supported = jwt.algorithms.get_default_algorithms()
+        for algorithm in self.algorithms:
+            if algorithm == "none" or algorithm not in supported:
+                raise ValueError(
+                    f"Unsupported JWT algorithm '{algorithm}'. "
+                    f"Expected one of: {', '.join(sorted(set(supported) - {'none'}))}"
+                )
+
+        if verify_workers < 0:
+            raise ValueError("verify_workers must be >= 0")
+        self.verify_workers = verify_workers
+        self._verify_pool: Optional[ThreadPoolExecutor] = None
+
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
 
-        # Auto-discover JWKS URL from issuer
-        self.jwks_client = None
-        self._initialize_jwks()
+        # JWKS URL is discovered from the issuer on first use
+        self.jwks_cache: Optional[JWKSCache] = None
+        self._discovery_lock = asyncio.Lock()
+        self._discovery_failed_at: Optional[float] = None
+
+    def _cache_path(self, kind: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return issuer_cache_path(self.cache_dir, self.issuer_url, kind)
 
-    def _initialize_jwks(self):
+    async def start(self):
         """
-        Fetch JWKS URI from OpenID configuration.
+        Discover the issuer and load its signing keys ahead of the first token.
 
-        Queries the issuer's .well-known/openid-configuration endpoint
-        to discover the JWKS URI for token verification.
+        Called in the background at app startup by WidgetMCPServer.get_app();
+        failures are reported and retried on the next verification.
         """
         try:
-            discovery_url = f"{self.issuer_url}/.well-known/openid-configuration"
-            response = httpx.get(discovery_url, timeout=10)
-            response.raise_for_status()
-            config = response.json()
+            jwks_cache = await self._get_jwks_cache()
+            await jwks_cache.load()
+        except JWKSError as e:
+            print(f"Warning: {e}")
 
-            jwks_uri = config.get("jwks_uri")
-            if not jwks_uri:
-                raise ValueError("No jwks_uri found in OpenID configuration")
+    async def _get_jwks_cache(self) -> JWKSCache:
+        """Return the JWKS cache, running OpenID discovery on first use."""
+        if self.jwks_cache is not None:
+            return self.jwks_cache
+        async with self._discovery_lock:
+            if self.jwks_cache is None:
+                config = await self._discover()
+                self.jwks_cache = JWKSCache(
+                    config["jwks_uri"],
+                    ttl=self.jwks_ttl,
+                    refetch_interval=self.jwks_refetch_interval,
+                    cache_path=self._cache_path("jwks"),
+                )
+        return self.jwks_cache
+
+    async def _discover(self) -> Dict[str, Any]:
+        """
+        Load the OpenID configuration (from the disk cache or the issuer).
+
+        Queries the issuer's .well-known/openid-configuration endpoint to
+        discover the JWKS URI. Failed attempts are retried at most once per
+        jwks_refetch_interval so an unreachable issuer is not hammered.
+
+        Raises:
+            JWKSError: If the configuration cannot be fetched
+        """
+        cache_path = self._cache_path("discovery")
+        if cache_path is not None:
+            config = await asyncio.to_thread(read_json_file, cache_path)
+            if config and config.get("jwks_uri"):
+                return config
 
-            self.jwks_client = PyJWKClient(jwks_uri)
+        if (
+            self._discovery_failed_at is not None
+            and time.monotonic() - self._discovery_failed_at
+            < self.jwks_refetch_interval
+        ):
+            raise JWKSError(f"OpenID discovery for {self.issuer_url} recently failed")
 
+        try:
+            discovery_url = f"{self.issuer_url}/.well-known/openid-configuration"
+            async with httpx.AsyncClient(timeout=DEFAULT_FETCH_TIMEOUT) as client:
+                response = await client.get(discovery_url)
+                response.raise_for_status()
+                config = response.json()
+            if not config.get("jwks_uri"):
+                raise ValueError("No jwks_uri found in OpenID configuration")
         except Exception as e:
-            raise RuntimeError(f"Failed to initialize JWKS from {self.issuer_url}: {e}") from e
+            self._discovery_failed_at = time.monotonic()
+            raise JWKSError(
+                f"Failed to discover JWKS from {self.issuer_url}: {e}"
+            ) from e
+
+        self._discovery_failed_at = None
+        if cache_path is not None:
+            try:
+                await asyncio.to_thread(write_json_file, cache_path, config)
+            except OSError as e:
+                print(f"Warning: could not write discovery cache {cache_path}: {e}")
+        return config
+
+    def _decode(self, token: str, signing_key: Any) -> Tuple[Dict[str, Any], float]:
+        """
+        Verify the token signature and standard claims.
+
+        Returns:
+            (payload, CPU seconds spent in the verifying thread)
+        """
+        start = time.thread_time()
+        decode_options = {
+            "verify_signature": True,
+            "verify_exp": True,
+            "verify_iat": True,
+            "verify_aud": self.audience is not None,
+        }
+        payload = jwt.decode(
+            token,
+            signing_key.key,
+            algorithms=self.algorithms,
+            issuer=self.issuer_url,
+            audience=self.audience,
+            options=decode_options,
+        )
+        return payload, time.thread_time() - start
+
+    async def _verify(
+        self, token: str, signing_key: Any
+    ) -> Tuple[Dict[str, Any], float]:
+        """Run _decode on the event loop or in the verification pool."""
+        if not self.verify_workers:
+            return self._decode(token, signing_key)
+        if self._verify_pool is None:
+            self._verify_pool = ThreadPoolExecutor(
+                max_workers=self.verify_workers, thread_name_prefix="fastapps-jwt"
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._verify_pool, self._decode, token, signing_key
+        )
+
+    def close(self):
+        """Shut down the verification thread pool, if started."""
+        if self._verify_pool is not None:
+            self._verify_pool.shutdown(wait=False)
+            self._verify_pool = None
+
+    def get_token_cache_stats(self) -> Dict[str, Any]:
+        """Verified-token cache counters (empty if the cache is disabled)."""
+        return self.token_cache.stats() if self.token_cache is not None else {}
 
     async def verify_token(self, token: str) -> Optional[AccessToken]:
         """
@@ -100,26 +266,18 @@ class JWTVerifier(TokenVerifier):
         Returns:
             AccessToken object if valid, None if invalid
         """
+        if self.token_cache is not None:
+            cached = self.token_cache.get(token)
+            if cached is not None:
+                return cached
+
         try:
-            # Get signing key from JWKS
-            signing_key = self.jwks_client.get_signing_key_from_jwt(token)
-
-            # Decode and verify JWT
-            decode_options = {
-                "verify_signature": True,
-                "verify_exp": True,
-                "verify_iat": True,
-                "verify_aud": self.audience is not None,
-            }
-
-            payload = jwt.decode(
-                token,
-                signing_key.key,
-                algorithms=["RS256"],
-                issuer=self.issuer_url,
-                audience=self.audience,
-                options=decode_options,
-            )
+            # Get signing key from the cached JWKS (fetched asynchronously)
+            kid = jwt.get_unverified_header(token).get("kid")
+            jwks_cache = await self._get_jwks_cache()
+            signing_key = await jwks_cache.get_signing_key(kid)
+
+            payload, cost = await self._verify(token, signing_key)
 
             # Extract scopes from token
             # Auth0 uses "permissions", some providers use "scope" (space-separated)
@@ -141,7 +299,7 @@ class JWTVerifier(TokenVerifier):
                     return None
 
             # Build AccessToken
-            return AccessToken(
+            access_token = AccessToken(
                 token=token,
                 client_id=payload.get("azp")
                 or payload.get("client_id")
@@ -150,6 +308,9 @@ class JWTVerifier(TokenVerifier):
                 scopes=token_scopes,
                 claims=payload,
             )
+            if self.token_cache is not None:
+                self.token_cache.set(token, access_token, payload.get("exp"), cost)
+            return access_token
 
         except jwt.ExpiredSignatureError:
             # Token expired
@@ -157,6 +318,9 @@ class JWTVerifier(TokenVerifier):
         except jwt.InvalidTokenError:
             # Token invalid (bad signature, malformed, etc.)
             return None
+        except JWKSError:
+            # No signing key for this token (unknown kid, issuer unreachable)
+            return None
         except Exception:
             # Any other error (network, parsing, etc.)
             return None
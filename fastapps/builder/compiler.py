@@ -3,9 +3,28 @@ import platform
 import re
 import shutil
 import subprocess
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict, List, Optional
+
+from .compress import precompress_assets
+from .fingerprint import (
+    BUILD_FRAGMENTS_DIR,
+    BuildCache,
+    partition_widgets,
+    shared_fingerprint,
+    widget_fingerprint,
+)
+from .manifest import (
+    list_hashed_files,
+    read_manifest,
+    read_manifest_file,
+    write_manifest,
+)
+
+# Entry files recognized by build-all.mts
+WIDGET_ENTRY_FILES = ("index.jsx", "index.tsx")
 
 
 @dataclass
@@ -15,6 +34,50 @@ class WidgetBuildResult:
     name: str
     hash: str
     html: str
+    # Shared asset files (e.g. the vendor chunk) the widget's HTML loads
+    dependencies: List[str] = field(default_factory=list)
+    # Byte sizes of the html/js/css outputs, from the build manifest
+    sizes: Dict[str, int] = field(default_factory=dict)
+
+
+class LazyWidgetBuildResult(WidgetBuildResult):
+    """
+    Build result whose HTML is read from disk on first access.
+
+    Created from the build manifest so loading a project touches only
+    manifest.json; each widget's HTML is read when its resource is first
+    served.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        hash: str,
+        html_path: Path,
+        dependencies: Optional[List[str]] = None,
+        sizes: Optional[Dict[str, int]] = None,
+    ):
+        self.name = name
+        self.hash = hash
+        self.html_path = html_path
+        self._html: Optional[str] = None
+        self.dependencies = list(dependencies or [])
+        self.sizes = dict(sizes or {})
+
+    @property
+    def html(self) -> str:
+        if self._html is None:
+            self._html = self.html_path.read_text(encoding="utf-8")
+        return self._html
+
+    @html.setter
+    def html(self, value: Optional[str]):
+        self._html = value
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the HTML has been read from disk yet."""
+        return self._html is not None
 
 
 class WidgetBuilder:
@@ -31,20 +94,41 @@ class WidgetBuilder:
         self.assets_dir = self.project_root / "assets"
         self.widgets_dir = self.project_root / "widgets"
         self.framework_dir = Path(__file__).parent
+        # Seconds spent building each widget in the last build_all() call
+        self.last_build_times: Dict[str, float] = {}
 
-    def build_all(self, mode: str = "hosted") -> Dict[str, WidgetBuildResult]:
+    def build_all(
+        self,
+        mode: str = "hosted",
+        force: bool = False,
+        jobs: int = 1,
+        shared_vendor: bool = False,
+        vendor_packages: Optional[List[str]] = None,
+    ) -> Dict[str, WidgetBuildResult]:
         """
         Build all widgets in the project.
 
+        Widgets whose sources and shared build inputs are unchanged since the
+        last build (see BuildCache) reuse their previous outputs; only the
+        changed widgets are passed to the build script.
+
         Args:
             mode: Build mode - "hosted" (default, external JS/CSS references) or
                   "inline" (self-contained HTML)
+            force: Ignore the build cache and rebuild every widget from a clean
+                assets directory
+            jobs: Number of build processes to run in parallel (0 uses the
+                CPU count). Widgets are split across processes by source size.
+            shared_vendor: In hosted mode, build React (plus vendor_packages)
+                once as a shared content-hashed chunk loaded through an import
+                map, instead of bundling it into every widget
+            vendor_packages: Extra packages to include in the shared chunk
 
         Returns:
             Dictionary mapping widget names to build results.
         """
         # 1. Auto-discover widgets
-        self._discover_widgets()
+        widget_dirs = self._discover_widgets()
 
         # 2. Ensure unified build script exists in project (if not exists)
         self._ensure_build_script()
@@ -65,75 +149,310 @@ class WidgetBuilder:
                 env["BASE_URL"] = f"{public_url}/assets"
             else:
                 env["BASE_URL"] = "/assets"
+            if shared_vendor:
+                env["VENDOR"] = "1"
+                env["VENDOR_PACKAGES"] = ",".join(vendor_packages or [])
+        for key in ("VENDOR_ONLY", "MANIFEST_PATH"):
+            env.pop(key, None)
 
-        subprocess.run(
-            [npx_cmd, "tsx", build_script],
-            cwd=self.project_root,
-            check=True,
-            env=env
+        # Decide which widgets need building
+        shared = shared_fingerprint(
+            self.project_root,
+            {
+                "MODE": mode,
+                "BASE_URL": env.get("BASE_URL", ""),
+                "VENDOR": env.get("VENDOR", ""),
+                "VENDOR_PACKAGES": env.get("VENDOR_PACKAGES", ""),
+            },
+        )
+        fingerprints = {
+            name: widget_fingerprint(widget_dir, shared)
+            for name, widget_dir in widget_dirs.items()
+        }
+        cache = BuildCache(self.project_root)
+        manifest = read_manifest(self.assets_dir)
+        stale = (
+            sorted(fingerprints)
+            if force
+            else self._stale_widgets(fingerprints, cache, manifest)
         )
 
-        # 4. Parse results
-        return self._parse_build_results()
+        if not stale:
+            print("All widgets up to date (use --force to rebuild)")
+            self._prune_removed_widgets(manifest, fingerprints)
+        else:
+            full_build = force or len(stale) == len(fingerprints)
+            if not full_build:
+                print(f"Rebuilding {len(stale)} changed widget(s): {', '.join(stale)}")
+
+            jobs = min(jobs or os.cpu_count() or 1, len(stale))
+            command = [npx_cmd, "tsx", build_script]
+            if jobs > 1:
+                self._run_parallel_build(
+                    command, env, mode, stale, widget_dirs, jobs, full_build
+                )
+            else:
+                if full_build:
+                    env["CLEAN"] = "1"
+                    env.pop("WIDGETS", None)
+                else:
+                    env["CLEAN"] = "0"
+                    env["WIDGETS"] = ",".join(stale)
+
+                subprocess.run(command, cwd=self.project_root, check=True, env=env)
+            self._report_build_times(stale)
+
+        # 4. Precompress outputs so assets can be served with Content-Encoding
+        precompress_assets(self.assets_dir)
+
+        # 5. Parse results and remember what was built
+        results = self._parse_build_results()
+        cache.save({name: fp for name, fp in fingerprints.items() if name in results})
+        return results
+
+    def _run_parallel_build(
+        self,
+        command: List[str],
+        env: Dict[str, str],
+        mode: str,
+        stale: List[str],
+        widget_dirs: Dict[str, Path],
+        jobs: int,
+        clean: bool,
+    ):
+        """
+        Build stale widgets in parallel build-script processes.
+
+        Each process builds one partition (WIDGETS) into the shared assets
+        directory and writes its own manifest fragment (MANIFEST_PATH); the
+        fragments are merged into assets/manifest.json afterwards.
+        """
+        previous = None
+        if clean:
+            shutil.rmtree(self.assets_dir, ignore_errors=True)
+        else:
+            previous = read_manifest(self.assets_dir)
+        self.assets_dir.mkdir(parents=True, exist_ok=True)
+
+        fragments_dir = self.project_root / BUILD_FRAGMENTS_DIR
+        shutil.rmtree(fragments_dir, ignore_errors=True)
+        fragments_dir.mkdir(parents=True)
+
+        if env.get("VENDOR") == "1":
+            # Build the shared vendor chunk once up front; every partition
+            # then finds it current in assets/manifest.json and reuses it
+            print("Building shared vendor chunk")
+            subprocess.run(
+                command,
+                cwd=self.project_root,
+                check=True,
+                env={**env, "CLEAN": "0", "VENDOR_ONLY": "1"},
+            )
+            previous = read_manifest(self.assets_dir)
+
+        partitions = partition_widgets(stale, widget_dirs, jobs)
+        print(f"Building {len(stale)} widget(s) in {len(partitions)} parallel job(s)")
+
+        def run_partition(index: int, names: List[str]):
+            partition_env = dict(env)
+            partition_env.update(
+                {
+                    "CLEAN": "0",
+                    "WIDGETS": ",".join(names),
+                    "MANIFEST_PATH": str(fragments_dir / f"part-{index}.json"),
+                }
+            )
+            subprocess.run(
+                command, cwd=self.project_root, check=True, env=partition_env
+            )
+
+        with ThreadPoolExecutor(max_workers=len(partitions)) as pool:
+            futures = [
+                pool.submit(run_partition, index, names)
+                for index, names in enumerate(partitions)
+            ]
+            # Raise the first failure (CalledProcessError) after all finish
+            for future in futures:
+                future.exception()
+            for future in futures:
+                future.result()
+
+        # Merge: untouched widgets from the previous manifest, then each
+        # partition's own widgets from its fragment
+        widgets: Dict[str, Any] = {
+            name: entry
+            for name, entry in ((previous or {}).get("widgets") or {}).items()
+            if name in widget_dirs and name not in stale
+        }
+        vendor = (previous or {}).get("vendor")
+        for index, names in enumerate(partitions):
+            fragment = read_manifest_file(fragments_dir / f"part-{index}.json") or {}
+            fragment_widgets = fragment.get("widgets") or {}
+            widgets.update(
+                {
+                    name: fragment_widgets[name]
+                    for name in names
+                    if name in fragment_widgets
+                }
+            )
+            vendor = fragment.get("vendor", vendor)
+
+        merged: Dict[str, Any] = {"version": 1, "mode": mode, "widgets": widgets}
+        if vendor and env.get("VENDOR") == "1":
+            merged["vendor"] = vendor
+        merged["files"] = list_hashed_files(self.assets_dir)
+        write_manifest(self.assets_dir, merged)
+        shutil.rmtree(fragments_dir, ignore_errors=True)
+
+    def _report_build_times(self, built: List[str]):
+        """Record and print per-widget build times from the manifest."""
+        manifest = read_manifest(self.assets_dir) or {"widgets": {}}
+        self.last_build_times = {
+            name: manifest["widgets"][name]["buildMs"] / 1000
+            for name in built
+            if "buildMs" in manifest["widgets"].get(name, {})
+        }
+        if not self.last_build_times:
+            return
+
+        print("\nBuild times:")
+        for name, seconds in sorted(
+            self.last_build_times.items(), key=lambda item: item[1], reverse=True
+        ):
+            print(f"  {name:<30} {seconds:>7.2f}s")
+
+    def _stale_widgets(
+        self,
+        fingerprints: Dict[str, str],
+        cache: BuildCache,
+        manifest: Optional[Dict[str, Any]],
+    ) -> List[str]:
+        """Widgets whose inputs changed or whose outputs are missing."""
+        if manifest is None:
+            return sorted(fingerprints)
+
+        stale = []
+        for name, fingerprint in sorted(fingerprints.items()):
+            entry = manifest["widgets"].get(name)
+            outputs_present = entry is not None and all(
+                (self.assets_dir / output).exists()
+                for output in [
+                    *(entry[key] for key in ("html", "js", "css") if entry.get(key)),
+                    *entry.get("dependencies", []),
+                ]
+            )
+            if cache.get(name) != fingerprint or not outputs_present:
+                stale.append(name)
+        return stale
+
+    def _prune_removed_widgets(
+        self, manifest: Optional[Dict[str, Any]], fingerprints: Dict[str, str]
+    ):
+        """Delete outputs and manifest entries of widgets that no longer exist."""
+        if manifest is None:
+            return
+        removed = [name for name in manifest["widgets"] if name not in fingerprints]
+        if not removed:
+            return
+
+        for name in removed:
+            entry = manifest["widgets"].pop(name)
+            for key in ("html", "js", "css"):
+                if not entry.get(key):
+                    continue
+                for suffix in ("", ".gz", ".br"):
+                    (self.assets_dir / (entry[key] + suffix)).unlink(missing_ok=True)
+            print(f"Removed outputs of deleted widget: {name}")
+
+        manifest["files"] = list_hashed_files(self.assets_dir)
+        write_manifest(self.assets_dir, manifest)
 
     def _ensure_build_script(self):
         """
-        Ensure build script exists.
+        Ensure the project's build script matches the installed framework.
 
-        Args:
-            mode: Build mode - determines which script to copy
+        build-all.mts is a generated, gitignored copy. A copy left over from
+        an older FastApps ignores the WIDGETS/CLEAN/MANIFEST_PATH settings
+        that incremental and parallel builds rely on, so it is replaced
+        whenever it differs from the framework's script.
         """
         # Use unified build script name
         script_name = "build-all.mts"
 
         project_build_script = self.project_root / script_name
-        framework_build_script = self.framework_dir / script_name
+        source = self.framework_dir / script_name
+        if not source.exists():
+            # Fallback: check node_modules
+            source = self.project_root / "node_modules" / "fastapps" / script_name
+            if not source.exists():
+                if project_build_script.exists():
+                    return
+                raise FileNotFoundError(
+                    f"{script_name} not found. Please install fastapps: npm install --save-dev fastapps"
+                )
 
-        # Copy from framework if not exists
         if not project_build_script.exists():
-            if framework_build_script.exists():
-                shutil.copy(framework_build_script, project_build_script)
-                print(f"Copied {script_name} from FastApps framework")
-            else:
-                # Fallback: check node_modules
-                node_modules_script = (
-                    self.project_root / "node_modules" / "fastapps" / script_name
-                )
-                if node_modules_script.exists():
-                    shutil.copy(node_modules_script, project_build_script)
-                    print(f"Copied {script_name} from fastapps package")
-                else:
-                    raise FileNotFoundError(
-                        f"{script_name} not found. Please install fastapps: npm install --save-dev fastapps"
-                    )
+            shutil.copy(source, project_build_script)
+            print(f"Copied {script_name} from FastApps framework")
+        elif project_build_script.read_bytes() != source.read_bytes():
+            shutil.copy(source, project_build_script)
+            print(f"Updated {script_name} from FastApps framework")
 
-    def _discover_widgets(self):
+    def _discover_widgets(self) -> Dict[str, Path]:
         """
         Discover widgets in the widgets directory.
 
         Mounting logic is automatically injected during build,
-        so each widget only needs an index.jsx file!
+        so each widget only needs an index.jsx (or index.tsx) file!
+
+        Returns:
+            Dictionary mapping widget names to their directories.
         """
-        widget_count = 0
-        for widget_dir in self.widgets_dir.iterdir():
+        widgets: Dict[str, Path] = {}
+        for widget_dir in sorted(self.widgets_dir.iterdir()):
             if not widget_dir.is_dir() or widget_dir.name.startswith("."):
                 continue
 
             widget_name = widget_dir.name
-            index_file = widget_dir / "index.jsx"
-
-            if index_file.exists():
-                widget_count += 1
+            if any((widget_dir / index).exists() for index in WIDGET_ENTRY_FILES):
+                widgets[widget_name] = widget_dir
                 print(f"Found widget: {widget_name}")
 
-        if widget_count > 0:
-            print(f"\nReady to build {widget_count} widget(s)")
+        if widgets:
+            print(f"\nReady to build {len(widgets)} widget(s)")
+        return widgets
+
+    def load_build_results(self) -> Dict[str, WidgetBuildResult]:
+        """
+        Load results of a previous build without rebuilding.
+
+        With a build manifest this reads only manifest.json; widget HTML is
+        loaded lazily (see LazyWidgetBuildResult).
+
+        Returns:
+            Dictionary mapping widget names to build results.
+        """
+        return self._parse_build_results()
 
     def _parse_build_results(self) -> Dict[str, WidgetBuildResult]:
-        """Parse built widget HTML files."""
+        """Parse built widget HTML files, preferring the build manifest."""
+        manifest = read_manifest(self.assets_dir)
+        if manifest is not None:
+            return {
+                name: LazyWidgetBuildResult(
+                    name=name,
+                    hash=entry["hash"],
+                    html_path=self.assets_dir / entry["html"],
+                    dependencies=entry.get("dependencies"),
+                    sizes=entry.get("sizes"),
+                )
+                for name, entry in manifest["widgets"].items()
+            }
+
+        # Builds without a manifest: infer widgets from HTML file names
         results = {}
         for html_file in self.assets_dir.glob("*-*.html"):
-            match = re.match(r"(.+)-([0-9a-f]{4})\.html$", html_file.name)
+            match = re.match(r"(.+)-([0-9a-f]{4,})\.html$", html_file.name)
             if match:
                 name, hash_val = match.groups()
                 results[name] = WidgetBuildResult(
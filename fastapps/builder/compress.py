@@ -0,0 +1,145 @@
+import gzip
+import os
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+# Brotli is optional (pip install fastapps[brotli]); gzip is always produced
+try:
+    import brotli
+
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+# Text outputs worth precompressing (images/fonts are already compressed)
+COMPRESSIBLE_EXTENSIONS = frozenset(
+    {".js", ".mjs", ".css", ".html", ".json", ".svg", ".map", ".txt", ".wasm"}
+)
+# Below this size the encoding overhead outweighs the savings
+MIN_COMPRESS_SIZE = 256
+
+# Content-Encoding -> file suffix, in server preference order
+ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+def _compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=11)
+    # mtime=0 keeps output byte-identical across rebuilds
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def precompress_assets(assets_dir: Path) -> Dict[str, List[str]]:
+    """
+    Write .gz (and .br when brotli is installed) siblings for built assets.
+
+    Variants are only kept when smaller than the original and are rewritten
+    only when older than their source, so repeated calls are cheap. Variants
+    whose source no longer exists are removed.
+
+    Args:
+        assets_dir: Directory containing build outputs
+
+    Returns:
+        Dictionary mapping each compressed file name to its variant names
+    """
+    encodings = ["gzip"] + (["br"] if BROTLI_AVAILABLE else [])
+    written: Dict[str, List[str]] = {}
+
+    suffixes = tuple(ENCODING_SUFFIXES.values())
+    for path in sorted(assets_dir.iterdir()):
+        source = path.with_suffix("")
+        if path.suffix in suffixes and source.suffix in COMPRESSIBLE_EXTENSIONS:
+            if not source.exists():
+                path.unlink(missing_ok=True)
+            continue
+        if not path.is_file() or path.suffix not in COMPRESSIBLE_EXTENSIONS:
+            continue
+        source_stat = path.stat()
+        if source_stat.st_size < MIN_COMPRESS_SIZE:
+            continue
+
+        data = None
+        for encoding in encodings:
+            variant = path.with_name(path.name + ENCODING_SUFFIXES[encoding])
+            if (
+                variant.exists()
+                and variant.stat().st_mtime_ns >= source_stat.st_mtime_ns
+            ):
+                written.setdefault(path.name, []).append(variant.name)
+                continue
+
+            if data is None:
+                data = path.read_bytes()
+            compressed = _compress(data, encoding)
+            if len(compressed) >= len(data):
+                variant.unlink(missing_ok=True)
+                continue
+            variant.write_bytes(compressed)
+            written.setdefault(path.name, []).append(variant.name)
+
+    return written
+
+
+def accepted_encodings(accept_encoding: str) -> FrozenSet[str]:
+    """
+    Parse Accept-Encoding into the set of codings with a non-zero q.
+
+    "*" stands for the ENCODING_SUFFIXES codings the header doesn't name, so
+    an explicit "br;q=0" still refuses brotli under "*".
+    """
+    qualities: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[coding.strip().lower()] = quality
+
+    accepted = {coding for coding, quality in qualities.items() if quality > 0}
+    if qualities.pop("*", 0) > 0:
+        accepted.discard("*")
+        accepted.update(
+            coding for coding in ENCODING_SUFFIXES if coding not in qualities
+        )
+    return frozenset(accepted)
+
+
+def select_precompressed(
+    path: Path, accept_encoding: Optional[str], source_mtime_ns: int
+) -> Tuple[Optional[str], Path, Optional[os.stat_result]]:
+    """
+    Pick the precompressed sibling of path a client accepts.
+
+    Variants older than the source (left over from a previous build) are
+    ignored.
+
+    Args:
+        path: Requested file
+        accept_encoding: The request's Accept-Encoding header
+        source_mtime_ns: Modification time of path
+
+    Returns:
+        (encoding, variant path, variant stat), or (None, path, None) when
+        the original should be served
+    """
+    if not accept_encoding or path.suffix not in COMPRESSIBLE_EXTENSIONS:
+        return None, path, None
+
+    accepted = accepted_encodings(accept_encoding)
+    for encoding, suffix in ENCODING_SUFFIXES.items():
+        if encoding not in accepted:
+            continue
+        variant = path.with_name(path.name + suffix)
+        try:
+            variant_stat = os.stat(variant)
+        except OSError:
+            continue
+        if variant_stat.st_mtime_ns >= source_mtime_ns:
+            return encoding, variant, variant_stat
+    return None, path, None
@@ -0,0 +1,135 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+# Build cache location, relative to the project root
+BUILD_CACHE_PATH = Path(".fastapps") / "build-cache.json"
+BUILD_CACHE_VERSION = 1
+# Per-process manifest fragments written during parallel builds
+BUILD_FRAGMENTS_DIR = Path(".fastapps") / "manifests"
+
+# Project-level inputs that affect every widget's output
+SHARED_INPUTS = (
+    "widgets/index.css",
+    "package.json",
+    "package-lock.json",
+    "pnpm-lock.yaml",
+    "yarn.lock",
+    "bun.lockb",
+    "build-all.mts",
+    "tsconfig.json",
+    "tailwind.config.js",
+    "tailwind.config.ts",
+    "postcss.config.js",
+    "postcss.config.cjs",
+)
+VITE_CONFIG_GLOB = "vite.config.*"
+
+# Directory names never considered widget sources
+IGNORED_DIRS = frozenset({"node_modules", ".git", "__pycache__", "dist"})
+
+
+def _hash_files(digest: "hashlib._Hash", root: Path, files: Iterable[Path]):
+    for path in files:
+        digest.update(path.relative_to(root).as_posix().encode())
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+        digest.update(b"\0")
+
+
+def _widget_files(widget_dir: Path) -> List[Path]:
+    return sorted(
+        path
+        for path in widget_dir.rglob("*")
+        if path.is_file()
+        and not IGNORED_DIRS.intersection(path.relative_to(widget_dir).parts)
+        and not path.name.startswith(".")
+    )
+
+
+def shared_fingerprint(project_root: Path, build_env: Dict[str, str]) -> str:
+    """
+    Fingerprint inputs shared by all widgets.
+
+    Covers global CSS, lockfiles, Vite/Tailwind/PostCSS config, the build
+    script and build environment (mode, base URL).
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps(build_env, sort_keys=True).encode())
+    shared = [project_root / name for name in SHARED_INPUTS]
+    shared.extend(sorted(project_root.glob(VITE_CONFIG_GLOB)))
+    _hash_files(digest, project_root, (p for p in shared if p.is_file()))
+    return digest.hexdigest()
+
+
+def widget_fingerprint(widget_dir: Path, shared: str) -> str:
+    """Fingerprint a widget's source directory combined with shared inputs."""
+    digest = hashlib.sha256(shared.encode())
+    _hash_files(digest, widget_dir, _widget_files(widget_dir))
+    return digest.hexdigest()
+
+
+def partition_widgets(
+    names: List[str], widget_dirs: Dict[str, Path], jobs: int
+) -> List[List[str]]:
+    """
+    Split widgets into at most ``jobs`` balanced partitions.
+
+    Uses source size as a proxy for build cost and assigns the largest
+    widgets first to the least-loaded partition.
+    """
+    sizes = {
+        name: sum(path.stat().st_size for path in _widget_files(widget_dirs[name]))
+        for name in names
+    }
+    partitions: List[List[str]] = [[] for _ in range(min(jobs, len(names)))]
+    loads = [0] * len(partitions)
+    for name in sorted(names, key=lambda n: (-sizes[n], n)):
+        index = loads.index(min(loads))
+        partitions[index].append(name)
+        loads[index] += sizes[name]
+    return [sorted(partition) for partition in partitions if partition]
+
+
+class BuildCache:
+    """
+    Widget fingerprints from the last successful build.
+
+    Stored in .fastapps/build-cache.json so unchanged widgets can reuse
+    their previous outputs.
+    """
+
+    def __init__(self, project_root: Path):
+        self.path = project_root / BUILD_CACHE_PATH
+        self.fingerprints: Dict[str, str] = {}
+        self._load()
+
+    def _load(self):
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("version") == BUILD_CACHE_VERSION:
+            self.fingerprints = dict(data.get("widgets", {}))
+
+    def get(self, name: str) -> Optional[str]:
+        return self.fingerprints.get(name)
+
+    def save(self, fingerprints: Dict[str, str]):
+        """Replace the cache with the fingerprints of the current build."""
+        self.fingerprints = dict(fingerprints)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(
+            json.dumps(
+                {"version": BUILD_CACHE_VERSION, "widgets": self.fingerprints},
+                indent=2,
+                sort_keys=True,
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+
+    def clear(self):
+        self.fingerprints = {}
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,82 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional
+
+# Written to the assets directory by build-all.mts
+MANIFEST_NAME = "manifest.json"
+
+# Sent for content-hashed outputs listed in the manifest
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def read_manifest(assets_dir: Path) -> Optional[Dict[str, Any]]:
+    """
+    Read the build manifest from an assets directory.
+
+    Returns:
+        Parsed manifest, or None if missing or unreadable (older builds)
+    """
+    return read_manifest_file(assets_dir / MANIFEST_NAME)
+
+
+def read_manifest_file(manifest_path: Path) -> Optional[Dict[str, Any]]:
+    """Read a manifest (or parallel-build fragment) from an explicit path."""
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("widgets"), dict):
+        return None
+    return manifest
+
+
+def list_hashed_files(assets_dir: Path) -> List[str]:
+    """
+    Build outputs for the manifest "files" list.
+
+    Excludes the manifest, compressed variants and widget HTML, whose short
+    legacy-compatible names may be reused across builds (see build-all.mts).
+    """
+    return sorted(
+        path.name
+        for path in assets_dir.iterdir()
+        if path.name != MANIFEST_NAME and path.suffix not in (".gz", ".br", ".html")
+    )
+
+
+def write_manifest(assets_dir: Path, manifest: Dict[str, Any]):
+    """Write the build manifest in the same format as build-all.mts."""
+    (assets_dir / MANIFEST_NAME).write_text(
+        json.dumps(manifest, indent=2) + "\n", encoding="utf-8"
+    )
+
+
+class ManifestIndex:
+    """
+    Set of content-hashed files from the build manifest.
+
+    Re-reads the manifest whenever it changes on disk, so a running server
+    picks up rebuilt assets.
+    """
+
+    def __init__(self, assets_dir: Path):
+        self.assets_dir = assets_dir
+        self._version: Optional[tuple] = None
+        self._files: FrozenSet[str] = frozenset()
+
+    def hashed_files(self) -> FrozenSet[str]:
+        try:
+            stat = (self.assets_dir / MANIFEST_NAME).stat()
+            version = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            version = None
+
+        if version != self._version:
+            manifest = read_manifest(self.assets_dir) if version else None
+            self._files = frozenset((manifest or {}).get("files", ()))
+            self._version = version
+        return self._files
+
+    def is_hashed(self, name: str) -> bool:
+        """Whether a file name is a content-hashed build output."""
+        return name in self.hashed_files()
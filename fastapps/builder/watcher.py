@@ -0,0 +1,105 @@
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+from .fingerprint import IGNORED_DIRS
+
+# Seconds between polls, and quiet time required before reporting a change
+# (editors often write a file in several steps)
+DEFAULT_POLL_INTERVAL = 0.5
+DEFAULT_DEBOUNCE = 0.2
+
+FileState = Tuple[int, int]
+
+
+class SourceWatcher:
+    """
+    Polling file watcher for widget and tool sources.
+
+    Compares (mtime, size) snapshots of every file under the watched
+    directories, so it needs no platform-specific dependencies and behaves
+    the same on every OS and inside containers.
+    """
+
+    def __init__(
+        self,
+        paths: Iterable[Path],
+        interval: float = DEFAULT_POLL_INTERVAL,
+        debounce: float = DEFAULT_DEBOUNCE,
+    ):
+        self.paths = [Path(p) for p in paths]
+        self.interval = interval
+        self.debounce = debounce
+        self._state = self.snapshot()
+
+    def snapshot(self) -> Dict[Path, FileState]:
+        """Current (mtime_ns, size) of every watched file."""
+        state: Dict[Path, FileState] = {}
+        for root in self.paths:
+            files: Iterable[Path]
+            if root.is_file():
+                files = [root]
+            elif root.is_dir():
+                files = root.rglob("*")
+            else:
+                continue
+            for path in files:
+                if root.is_dir():
+                    parts = path.relative_to(root).parts
+                    if IGNORED_DIRS.intersection(parts) or any(
+                        part.startswith(".") for part in parts
+                    ):
+                        continue
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                if path.is_file():
+                    state[path] = (stat.st_mtime_ns, stat.st_size)
+        return state
+
+    def poll(self) -> Set[Path]:
+        """
+        Return files added, modified or removed since the last poll.
+
+        Waits until the tree has been quiet for ``debounce`` seconds before
+        reporting, so a burst of writes is returned as one change set.
+        """
+        current = self.snapshot()
+        changed = self._diff(self._state, current)
+        while changed and self.debounce:
+            time.sleep(self.debounce)
+            settled = self.snapshot()
+            if not self._diff(current, settled):
+                break
+            changed |= self._diff(current, settled)
+            current = settled
+        self._state = current
+        return changed
+
+    @staticmethod
+    def _diff(old: Dict[Path, FileState], new: Dict[Path, FileState]) -> Set[Path]:
+        return {
+            path for path in old.keys() | new.keys() if old.get(path) != new.get(path)
+        }
+
+    def watch(
+        self,
+        callback: Callable[[Set[Path]], None],
+        stop_event: Optional[threading.Event] = None,
+    ):
+        """
+        Call ``callback`` with each change set until ``stop_event`` is set.
+
+        Exceptions raised by the callback are printed and watching continues.
+        """
+        stop_event = stop_event or threading.Event()
+        while not stop_event.wait(self.interval):
+            changed = self.poll()
+            if not changed:
+                continue
+            try:
+                callback(changed)
+            except Exception as e:
+                print(f"Warning: reload failed: {e}")
@@ -1,57 +1,58 @@
 """Build command for FastApps."""
 
 import subprocess
-import sys
 from pathlib import Path
 
 from rich.console import Console
 
+from fastapps.builder.compiler import WidgetBuilder
+
 console = Console()
 
 
-def build_command():
+def build_command(force: bool = False, jobs: int = 1, shared_vendor: bool = False):
     """Build widgets for production.
 
     Compiles all widgets in the widgets/ directory to optimized HTML/JS bundles.
+    Unchanged widgets reuse their previous outputs unless force is set.
+
+    Args:
+        force: Ignore the build cache and rebuild every widget
+        jobs: Number of parallel build processes (0 uses the CPU count)
+        shared_vendor: Build React once as a shared vendor chunk (hosted mode)
     """
     project_root = Path.cwd()
 
-    # Check if package.json exists and has a build script
+    # Check if package.json exists
     package_json = project_root / "package.json"
     if not package_json.exists():
         console.print("[red]✗ package.json not found[/red]")
         console.print("[dim]Make sure you're in a FastApps project root[/dim]")
         return False
 
+    if not (project_root / "widgets").is_dir():
+        console.print("[red]✗ widgets/ directory not found[/red]")
+        console.print("[dim]Make sure you're in a FastApps project root[/dim]")
+        return False
+
     try:
         console.print("[cyan]Building widgets...[/cyan]")
 
-        # Use npm run build if available
-        result = subprocess.run(
-            ["npm", "run", "build"],
-            cwd=project_root,
-            capture_output=True,
-            text=True,
+        results = WidgetBuilder(project_root).build_all(
+            force=force, jobs=jobs, shared_vendor=shared_vendor
+        )
+
+        console.print(
+            f"[green]✓ Build completed successfully ({len(results)} widget(s))[/green]"
         )
+        return True
 
-        if result.returncode == 0:
-            console.print("[green]✓ Build completed successfully[/green]")
-            if result.stdout:
-                console.print(result.stdout)
-            return True
-        else:
-            console.print("[red]✗ Build failed[/red]")
-            if result.stderr:
-                console.print(f"[yellow]{result.stderr}[/yellow]")
-            return False
-
-    except ImportError:
-        console.print("[red]✗ FastApps package not found[/red]")
-        console.print("[dim]Make sure fastapps is installed[/dim]")
+    except subprocess.CalledProcessError:
+        console.print("[red]✗ Build failed[/red]")
         return False
-    except FileNotFoundError:
-        console.print("[red]✗ npx or tsx not found[/red]")
-        console.print("[dim]Make sure Node.js and tsx are installed[/dim]")
+    except FileNotFoundError as e:
+        console.print(f"[red]✗ {e}[/red]")
+        console.print("[dim]Make sure Node.js, tsx and fastapps are installed[/dim]")
         return False
     except Exception as e:
         console.print(f"[red]✗ Build error: {e}[/red]")
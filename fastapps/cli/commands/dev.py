@@ -1,6 +1,7 @@
 """Development server command with Cloudflare Tunnel integration."""
 
 import http.server
+import importlib
 import json
 import os
 import platform
@@ -16,6 +17,11 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 
+from fastapps.builder.compiler import WidgetBuilder
+from fastapps.builder.compress import COMPRESSIBLE_EXTENSIONS, select_precompressed
+from fastapps.builder.manifest import IMMUTABLE_CACHE_CONTROL, ManifestIndex
+from fastapps.builder.watcher import SourceWatcher
+
 console = Console()
 
 
@@ -118,21 +124,58 @@ def start_cloudflare_tunnel(port: int) -> tuple[subprocess.Popen, str]:
     return process, public_url
 
 
-def start_asset_server(assets_dir: Path, port: int = 4444):
+def make_asset_server(assets_dir: Path, port: int = 4444) -> socketserver.TCPServer:
     """
-    Start static file server for assets (hosted mode).
+    Create the static file server for assets (hosted mode).
 
     Serves files from the assets directory with CORS headers enabled.
+    Content-hashed files from the build manifest are marked immutable, and
+    precompressed .br/.gz siblings are served when the client (or the
+    /assets proxy on its behalf) accepts them.
     """
+    manifest = ManifestIndex(assets_dir)
+
     class CORSHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
         def __init__(self, *args, **kwargs):
+            # Requested file and chosen Content-Encoding for this request
+            self.source_path = None
+            self.content_encoding = None
             super().__init__(*args, directory=str(assets_dir), **kwargs)
 
+        def translate_path(self, path):
+            full_path = super().translate_path(path)
+            self.source_path, self.content_encoding = full_path, None
+            try:
+                source_mtime_ns = os.stat(full_path).st_mtime_ns
+            except OSError:
+                return full_path
+            encoding, variant, _ = select_precompressed(
+                Path(full_path), self.headers.get("Accept-Encoding"), source_mtime_ns
+            )
+            if encoding is None:
+                return full_path
+            self.content_encoding = encoding
+            return str(variant)
+
+        def guess_type(self, path):
+            # Content-Type of the requested file, not of its .gz/.br variant
+            return super().guess_type(
+                self.source_path if self.content_encoding else path
+            )
+
         def end_headers(self):
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Access-Control-Allow-Methods', 'GET, OPTIONS')
-            self.send_header('Access-Control-Allow-Headers', '*')
-            self.send_header('Cache-Control', 'no-cache')
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.send_header("Access-Control-Allow-Methods", "GET, OPTIONS")
+            self.send_header("Access-Control-Allow-Headers", "*")
+            name = self.path.split("?", 1)[0].lstrip("/")
+            if manifest.is_hashed(name):
+                self.send_header("Cache-Control", IMMUTABLE_CACHE_CONTROL)
+            else:
+                self.send_header("Cache-Control", "no-cache")
+            if Path(name).suffix in COMPRESSIBLE_EXTENSIONS:
+                self.send_header("Vary", "Accept-Encoding")
+            if self.content_encoding:
+                self.send_header("Content-Encoding", self.content_encoding)
             super().end_headers()
 
         def do_OPTIONS(self):
@@ -152,18 +195,143 @@ def start_asset_server(assets_dir: Path, port: int = 4444):
         # Set daemon threads so server shuts down cleanly
         daemon_threads = True
 
-    with ThreadedAssetServer(("", port), handler) as httpd:
+    return ThreadedAssetServer(("", port), handler)
+
+
+def start_asset_server(assets_dir: Path, port: int = 4444):
+    """Run the static file server for assets until the process exits."""
+    with make_asset_server(assets_dir, port) as httpd:
         console.print(f"[green]✓ Asset server running on http://localhost:{port}[/green]")
         httpd.serve_forever()
 
 
-def start_dev_server(port=8001, host="0.0.0.0", mode="hosted"):
+def start_legacy_asset_server(port: int = 4444):
+    """Start the port-4444 asset server for projects using the /assets proxy."""
+    assets_dir = Path.cwd() / "assets"
+    if not assets_dir.exists():
+        console.print("[yellow]Creating assets directory...[/yellow]")
+        assets_dir.mkdir(parents=True, exist_ok=True)
+
+    console.print(f"[cyan]Starting asset server on port {port}...[/cyan]")
+    asset_server_thread = threading.Thread(
+        target=start_asset_server, args=(assets_dir, port), daemon=True
+    )
+    asset_server_thread.start()
+    time.sleep(0.5)
+    console.print()
+    return asset_server_thread
+
+
+class DevReloader:
+    """
+    Apply source changes to a running project server.
+
+    Widget changes trigger an incremental build (only affected widgets are
+    rebuilt); changed tool modules under server/tools/ are reloaded. The
+    resulting widgets are swapped into the running WidgetMCPServer with
+    set_widgets(), so uvicorn and the tunnel keep running.
+    """
+
+    def __init__(self, project_main, project_root: Path, mode: str = "hosted"):
+        self.project_main = project_main
+        self.project_root = project_root
+        self.mode = mode
+        self.widgets_dir = project_root / "widgets"
+        self.tools_dir = project_root / "server" / "tools"
+        self.builder = WidgetBuilder(project_root)
+
+    def watch_paths(self):
+        return [self.widgets_dir, self.tools_dir]
+
+    def __call__(self, changed):
+        widget_changes = [p for p in changed if p.is_relative_to(self.widgets_dir)]
+        tool_changes = [
+            p for p in changed if p.is_relative_to(self.tools_dir) and p.suffix == ".py"
+        ]
+        if not widget_changes and not tool_changes:
+            return
+
+        if widget_changes:
+            console.print("[cyan]Widget sources changed, rebuilding...[/cyan]")
+            try:
+                build_results = self.builder.build_all(mode=self.mode)
+            except subprocess.CalledProcessError:
+                console.print("[red]✗ Build failed, keeping previous widgets[/red]")
+                return
+            except Exception as e:
+                # e.g. node missing or an unreadable build manifest; the
+                # watcher must keep running either way
+                console.print(
+                    f"[red]✗ Build failed, keeping previous widgets: {e}[/red]"
+                )
+                return
+        else:
+            build_results = self.builder.load_build_results()
+
+        self.reload_tool_modules(tool_changes)
+        try:
+            widgets = self.load_widgets(build_results)
+        except Exception as e:
+            console.print(f"[red]✗ Reload failed, keeping previous widgets: {e}[/red]")
+            return
+        self.project_main.server.set_widgets(widgets)
+        console.print(f"[green]✓ Reloaded {len(widgets)} widget(s)[/green]")
+
+    def reload_tool_modules(self, changed_files):
+        """Reload (or forget deleted) tool modules so classes are re-imported."""
+        for path in sorted(changed_files):
+            module_name = f"server.tools.{path.stem}"
+            module = sys.modules.get(module_name)
+            if module is None:
+                continue
+            if not path.exists():
+                del sys.modules[module_name]
+                continue
+            try:
+                importlib.reload(module)
+            except Exception as e:
+                console.print(f"[red]✗ Error reloading {path.name}: {e}[/red]")
+
+    def load_widgets(self, build_results):
+        """Instantiate tool classes against new build results."""
+        # Projects generated by `fastapps init` define auto_load_tools()
+        loader = getattr(self.project_main, "auto_load_tools", None)
+        if loader is not None:
+            return loader(build_results)
+
+        from fastapps.core.widget import BaseWidget
+
+        widgets = []
+        for tool_file in sorted(self.tools_dir.glob("*_tool.py")):
+            module = importlib.import_module(f"server.tools.{tool_file.stem}")
+            for obj in vars(module).values():
+                if (
+                    isinstance(obj, type)
+                    and issubclass(obj, BaseWidget)
+                    and obj is not BaseWidget
+                    and obj.identifier in build_results
+                ):
+                    widgets.append(obj(build_results[obj.identifier]))
+        return widgets
+
+
+def start_watcher(reloader: DevReloader) -> threading.Thread:
+    """Watch widget and tool sources in a daemon thread."""
+    watcher = SourceWatcher(reloader.watch_paths())
+    thread = threading.Thread(target=watcher.watch, args=(reloader,), daemon=True)
+    thread.start()
+    console.print("[dim]Watching widgets/ and server/tools/ for changes[/dim]")
+    return thread
+
+
+def start_dev_server(port=8001, host="0.0.0.0", mode="hosted", watch=True):
     """Start development server with Cloudflare Tunnel.
 
     Args:
         port: Port for MCP server (default: 8001)
         host: Host to bind server (default: "0.0.0.0")
         mode: Build mode - "hosted" (default) or "inline"
+        watch: Rebuild and reload widgets and tools when sources change
     """
 
     # Check if we're in a FastApps project
@@ -174,24 +342,6 @@ def start_dev_server(port=8001, host="0.0.0.0", mode="hosted"):
         )
         return False
 
-    # Start asset server if hosted mode
-    asset_server_thread = None
-    if mode == "hosted":
-        assets_dir = Path.cwd() / "assets"
-        if not assets_dir.exists():
-            console.print("[yellow]Creating assets directory...[/yellow]")
-            assets_dir.mkdir(parents=True, exist_ok=True)
-
-        console.print(f"[cyan]Starting asset server on port 4444...[/cyan]")
-        asset_server_thread = threading.Thread(
-            target=start_asset_server,
-            args=(assets_dir, 4444),
-            daemon=True
-        )
-        asset_server_thread.start()
-        time.sleep(0.5)
-        console.print()
-
     # Check if cloudflared is installed
     if not check_cloudflared_installed():
         console.print("[yellow]cloudflared not found[/yellow]")
@@ -222,7 +372,15 @@ def start_dev_server(port=8001, host="0.0.0.0", mode="hosted"):
         # Reset sys.argv to avoid argparse conflicts in server/main.py
         # Pass mode to server for builder
         sys.argv = ["server/main.py", "--build", f"--mode={mode}"]
-        from server.main import app
+        import server.main as project_main
+
+        app = project_main.app
+
+        # Projects serving /assets in-process (get_app(assets_dir=...)) need
+        # no separate asset server; older projects still proxy to port 4444
+        project_server = getattr(project_main, "server", None)
+        if mode == "hosted" and getattr(project_server, "assets", None) is None:
+            start_legacy_asset_server()
 
         # Create server config
         config = uvicorn.Config(app, host=host, port=port, log_level="info")
@@ -235,6 +393,9 @@ def start_dev_server(port=8001, host="0.0.0.0", mode="hosted"):
         server_thread = threading.Thread(target=run_server, daemon=True)
         server_thread.start()
 
+        if watch and project_server is not None:
+            start_watcher(DevReloader(project_main, Path.cwd(), mode))
+
         # Wait a moment for server to start and show logs
         time.sleep(1)
 
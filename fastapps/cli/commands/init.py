@@ -18,7 +18,6 @@ import sys
 import importlib
 import inspect
 import argparse
-import re
 from typing import Dict
 
 # Add parent directory to path
@@ -33,16 +32,8 @@ TOOLS_DIR = Path(__file__).parent / "tools"
 ASSETS_DIR = PROJECT_ROOT / "assets"
 
 def fetch_build_results() -> Dict[str, WidgetBuildResult]:
-    """Parse built widget HTML files from assets directory."""
-    results = {}
-    for html_file in ASSETS_DIR.glob("*-*.html"):
-        match = re.match(r"(.+)-([0-9a-f]{4})\\.html$", html_file.name)
-        if match:
-            name, hash_val = match.groups()
-            results[name] = WidgetBuildResult(
-                name=name, hash=hash_val, html=html_file.read_text()
-            )
-    return results
+    """Load built widgets from assets/manifest.json; HTML is read on first use."""
+    return WidgetBuilder(PROJECT_ROOT).load_build_results()
 
 def auto_load_tools(build_results):
     """Automatically discover and load all widget tools."""
@@ -126,11 +117,14 @@ server = WidgetMCPServer(
 #     auth_issuer_url="https://your-tenant.us.auth0.com",
 #     auth_resource_server_url="https://yourdomain.com/mcp",
 #     auth_required_scopes=["user"],
+#     # Cache issuer discovery + signing keys so restarts don't wait on the issuer
+#     auth_cache_dir=PROJECT_ROOT / ".fastapps" / "auth",
 # )
 #
 # See docs: https://fastapps.org/docs/auth
 
-app = server.get_app()
+# Serve built assets in-process at /assets
+app = server.get_app(assets_dir=ASSETS_DIR)
 
 if __name__ == "__main__":
     print(f"\\n[START] Starting server with {len(tools)} tools")
@@ -287,6 +281,9 @@ dist/
 assets/
 build-all.mts
 
+# Build and auth caches
+.fastapps/
+
 # IDEs
 .vscode/
 .idea/
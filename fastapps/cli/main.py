@@ -113,7 +113,12 @@ def create(widget_name, auth, public, optional_auth, scopes, template):
     default='hosted',
     help="Widget build mode: 'hosted' (default, external JS/CSS on port 4444) or 'inline' (self-contained HTML)"
 )
-def dev(port, host, mode):
+@click.option(
+    "--watch/--no-watch",
+    default=True,
+    help="Rebuild widgets and reload tools when sources change (default: on)",
+)
+def dev(port, host, mode, watch):
     """Start development server with Cloudflare Tunnel.
 
     This command will:
@@ -122,6 +127,7 @@ def dev(port, host, mode):
     3. Start a public Cloudflare Tunnel
     4. Launch the FastApps development server
     5. Display public and local URLs
+    6. Watch widgets/ and server/tools/, rebuilding and reloading on change
 
     Build modes:
       --mode=hosted   : Widgets reference external JS/CSS from localhost:4444 (default, faster dev, ChatGPT compatible)
@@ -131,16 +137,43 @@ def dev(port, host, mode):
         fastapps dev                    # Hosted mode (default)
         fastapps dev --mode=inline      # Inline mode (self-contained)
         fastapps dev --port 8080        # Custom port
+        fastapps dev --no-watch         # Build once, no hot reload
 
     Note: Uses Cloudflare Tunnel (free, unlimited, no sign-up required)
     """
-    start_dev_server(port=port, host=host, mode=mode)
+    start_dev_server(port=port, host=host, mode=mode, watch=watch)
 
 
 @cli.command()
-def build():
-    """Build widgets for production."""
-    build_command()
+@click.option(
+    "--force",
+    is_flag=True,
+    help="Ignore the build cache and rebuild every widget",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    default=1,
+    type=click.IntRange(min=0),
+    help="Widgets to build in parallel (0 = number of CPUs)",
+)
+@click.option(
+    "--shared-vendor",
+    is_flag=True,
+    help="Load React from one shared, cached vendor chunk instead of bundling it per widget",
+)
+def build(force, jobs, shared_vendor):
+    """Build widgets for production.
+
+    Only widgets whose sources changed since the last build are rebuilt.
+
+    Examples:
+        fastapps build            # Incremental build
+        fastapps build --force    # Clean rebuild of all widgets
+        fastapps build --jobs 4   # Build up to 4 widgets in parallel
+        fastapps build --shared-vendor  # Share one React chunk across widgets
+    """
+    build_command(force=force, jobs=jobs, shared_vendor=shared_vendor)
 
 
 # Register cloud command group
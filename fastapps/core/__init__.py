@@ -1,6 +1,27 @@
 """Core Flick framework modules."""
 
+from .assets import StaticAssets
+from .cache import CacheBackend, MemoryCacheBackend, SQLiteCacheBackend
 from .server import WidgetMCPServer
+from .tracing import (
+    BatchSpanExporter,
+    FileSpanExporter,
+    OTLPHTTPSpanExporter,
+    SpanExporter,
+    ToolCallTrace,
+)
 from .widget import BaseWidget
 
-__all__ = ["BaseWidget", "WidgetMCPServer"]
+__all__ = [
+    "BaseWidget",
+    "WidgetMCPServer",
+    "CacheBackend",
+    "MemoryCacheBackend",
+    "SQLiteCacheBackend",
+    "StaticAssets",
+    "ToolCallTrace",
+    "SpanExporter",
+    "BatchSpanExporter",
+    "FileSpanExporter",
+    "OTLPHTTPSpanExporter",
+]
@@ -0,0 +1,236 @@
+import asyncio
+import hashlib
+import mimetypes
+import os
+import stat
+from collections import OrderedDict
+from dataclasses import dataclass
+from email.utils import formatdate
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from starlette.requests import Request
+from starlette.responses import FileResponse, Response
+
+from fastapps.builder.compress import COMPRESSIBLE_EXTENSIONS, select_precompressed
+from fastapps.builder.manifest import IMMUTABLE_CACHE_CONTROL, ManifestIndex
+
+# Files up to this size are held in memory; larger ones are sent from disk
+MAX_CACHED_FILE_SIZE = 1024 * 1024
+# Upper bound on the in-memory asset cache
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+CORS_HEADERS = {
+    "access-control-allow-origin": "*",
+    "access-control-allow-methods": "GET, OPTIONS",
+    "access-control-allow-headers": "*",
+}
+
+
+@dataclass(frozen=True)
+class CachedAsset:
+    """An asset file held in memory with its precomputed headers."""
+
+    body: bytes
+    etag: str
+    headers: Dict[str, str]
+    # (mtime_ns, size) of the file the body was read from
+    version: tuple
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in tags
+
+
+class StaticAssets:
+    """
+    Serve a built assets directory directly from the ASGI app.
+
+    Replaces the /assets proxy hop to the port-4444 asset server. Small files
+    are cached in memory with a content-hash ETag and prebuilt headers; each
+    request only stats the file so rebuilt assets are picked up immediately.
+    Larger files are sent with FileResponse (Range support, and zero-copy
+    sendfile on servers implementing the ASGI pathsend extension).
+
+    Content-hashed outputs listed in the build manifest are sent with
+    immutable cache headers; everything else uses ``cache_control``.
+
+    Precompressed ``.br``/``.gz`` siblings written at build time are served
+    with Content-Encoding when the client accepts them, so responses are
+    compressed without per-request CPU.
+
+    Example:
+        app = server.get_app(assets_dir=PROJECT_ROOT / "assets")
+    """
+
+    def __init__(
+        self,
+        directory: Path | str,
+        max_cached_file_size: int = MAX_CACHED_FILE_SIZE,
+        max_cache_bytes: int = MAX_CACHE_BYTES,
+        cache_control: str = "no-cache",
+    ):
+        """
+        Args:
+            directory: Directory containing built assets
+            max_cached_file_size: Largest file (bytes) kept in memory
+            max_cache_bytes: Total memory budget for cached files (LRU)
+            cache_control: Cache-Control header for assets that are not
+                content-hashed
+        """
+        self.directory = Path(directory).resolve()
+        self.max_cached_file_size = max_cached_file_size
+        self.max_cache_bytes = max_cache_bytes
+        self.cache_control = cache_control
+        self.manifest = ManifestIndex(self.directory)
+        self._cache: "OrderedDict[str, CachedAsset]" = OrderedDict()
+        self._cache_bytes = 0
+
+    def resolve(self, path: str) -> Optional[Path]:
+        """Map a request path to a file inside the directory (None if outside)."""
+        full_path = (self.directory / path).resolve()
+        if full_path == self.directory or self.directory not in full_path.parents:
+            return None
+        return full_path
+
+    def _base_headers(self, path: Path, encoding: Optional[str]) -> Dict[str, str]:
+        content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        immutable = path.parent == self.directory and self.manifest.is_hashed(path.name)
+        headers = {
+            "content-type": content_type,
+            "cache-control": (
+                IMMUTABLE_CACHE_CONTROL if immutable else self.cache_control
+            ),
+            **CORS_HEADERS,
+        }
+        if path.suffix in COMPRESSIBLE_EXTENSIONS:
+            headers["vary"] = "Accept-Encoding"
+        if encoding is not None:
+            headers["content-encoding"] = encoding
+        return headers
+
+    def _select_variant(
+        self, request: Request, path: Path, file_stat: os.stat_result
+    ) -> Tuple[Optional[str], Path, os.stat_result]:
+        """Pick a precompressed sibling the client accepts, if one is current."""
+        encoding, variant, variant_stat = select_precompressed(
+            path, request.headers.get("accept-encoding"), file_stat.st_mtime_ns
+        )
+        if encoding is None or variant_stat is None:
+            return None, path, file_stat
+        return encoding, variant, variant_stat
+
+    def _store(self, key: str, asset: CachedAsset):
+        previous = self._cache.pop(key, None)
+        if previous is not None:
+            self._cache_bytes -= len(previous.body)
+        self._cache[key] = asset
+        self._cache_bytes += len(asset.body)
+        while self._cache_bytes > self.max_cache_bytes and self._cache:
+            _, evicted = self._cache.popitem(last=False)
+            self._cache_bytes -= len(evicted.body)
+
+    async def _load(
+        self,
+        path: Path,
+        served_path: Path,
+        file_stat: os.stat_result,
+        encoding: Optional[str],
+    ) -> CachedAsset:
+        body = await asyncio.to_thread(served_path.read_bytes)
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        headers = self._base_headers(path, encoding)
+        headers.update(
+            {
+                "etag": etag,
+                "last-modified": formatdate(file_stat.st_mtime, usegmt=True),
+                "content-length": str(len(body)),
+            }
+        )
+        asset = CachedAsset(
+            body=body,
+            etag=etag,
+            headers=headers,
+            version=(file_stat.st_mtime_ns, file_stat.st_size),
+        )
+        self._store(str(served_path), asset)
+        return asset
+
+    async def get_response(self, request: Request, path: str) -> Response:
+        """Build the response for an asset path relative to the directory."""
+        full_path = self.resolve(path)
+        try:
+            file_stat = os.stat(full_path) if full_path is not None else None
+        except OSError:
+            file_stat = None
+        if (
+            full_path is None
+            or file_stat is None
+            or not stat.S_ISREG(file_stat.st_mode)
+        ):
+            return Response(
+                content=b"Not Found",
+                status_code=404,
+                headers={"content-type": "text/plain", **CORS_HEADERS},
+            )
+
+        if_none_match = request.headers.get("if-none-match")
+        encoding, served_path, served_stat = self._select_variant(
+            request, full_path, file_stat
+        )
+
+        if served_stat.st_size > self.max_cached_file_size:
+            etag_base = f"{served_stat.st_mtime_ns:x}-{served_stat.st_size:x}"
+            etag = f'"{hashlib.md5(etag_base.encode(), usedforsecurity=False).hexdigest()}"'
+            headers = self._base_headers(full_path, encoding)
+            headers["etag"] = etag
+            if if_none_match and _etag_matches(if_none_match, etag):
+                return Response(status_code=304, headers=_not_modified(headers))
+            return FileResponse(
+                served_path,
+                headers=headers,
+                media_type=headers["content-type"],
+                stat_result=served_stat,
+            )
+
+        key = str(served_path)
+        asset = self._cache.get(key)
+        if asset is None or asset.version != (
+            served_stat.st_mtime_ns,
+            served_stat.st_size,
+        ):
+            asset = await self._load(full_path, served_path, served_stat, encoding)
+        else:
+            self._cache.move_to_end(key)
+
+        if if_none_match and _etag_matches(if_none_match, asset.etag):
+            return Response(status_code=304, headers=_not_modified(asset.headers))
+        return Response(content=asset.body, headers=asset.headers)
+
+    def stats(self) -> Dict[str, int]:
+        """Number of cached files and bytes held in memory."""
+        return {"files": len(self._cache), "bytes": self._cache_bytes}
+
+    def clear(self):
+        """Drop all cached files."""
+        self._cache.clear()
+        self._cache_bytes = 0
+
+    async def __call__(self, scope, receive, send):
+        request = Request(scope, receive)
+        path = scope["path"]
+        root_path = scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path) :]
+        response = await self.get_response(request, path.lstrip("/"))
+        await response(scope, receive, send)
+
+
+def _not_modified(headers: Dict[str, str]) -> Dict[str, str]:
+    """Headers for a 304 response (no body headers)."""
+    return {
+        k: v for k, v in headers.items() if k not in ("content-length", "content-type")
+    }
@@ -0,0 +1,426 @@
+import asyncio
+import copy
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+# Minimum seconds between repeated backend failure warnings per cache
+BACKEND_WARNING_INTERVAL = 60.0
+
+
+class CacheBackend(ABC):
+    """
+    Storage interface for widget result caches.
+
+    Keys are strings namespaced per widget by ResultCache; values are the
+    JSON-serializable dictionaries returned from BaseWidget.execute(). get()
+    must return a value the caller owns: callers and after_execute hooks may
+    mutate it. Implement this to plug in shared storage (e.g., Redis) for multi-worker
+    deployments.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Look up a value.
+
+        Returns:
+            (found, value) tuple; expired entries are reported missing
+        """
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: float):
+        """Store a value that expires after ttl seconds."""
+
+    @abstractmethod
+    async def delete(self, key: str):
+        """Remove a value if present."""
+
+    @abstractmethod
+    async def clear(self):
+        """Remove all values."""
+
+    def stats(self) -> Dict[str, Any]:
+        """Backend counters (size, evictions, ...)."""
+        return {}
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    In-process TTL + LRU backend.
+
+    Fastest option, but each worker process holds its own copy. Values are
+    stored as JSON, like SQLiteCacheBackend, so every hit decodes a fresh
+    copy and mutating a returned result cannot change the cached one.
+    """
+
+    def __init__(self, max_entries: int = 128):
+        """
+        Args:
+            max_entries: Maximum number of values kept (least recently used
+                entries are evicted first)
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.evictions = 0
+
+    async def get(self, key: str) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+
+        expires_at, encoded = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return False, None
+
+        self._entries.move_to_end(key)
+        return True, json.loads(encoded)
+
+    async def set(self, key: str, value: Any, ttl: float):
+        encoded = json.dumps(value)
+        self._entries[key] = (time.monotonic() + ttl, encoded)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, key: str):
+        self._entries.pop(key, None)
+
+    async def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"size": len(self._entries), "evictions": self.evictions}
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    On-disk backend shared by every process on one host.
+
+    Uses a SQLite database in WAL mode so multiple uvicorn workers read and
+    write the same cache. Values are stored as JSON; queries run in a worker
+    thread to keep the event loop free. Cache hits only read: LRU access
+    times are buffered and written in batches, so reads from many workers
+    do not contend for the database write lock.
+
+    Example:
+        server = WidgetMCPServer(
+            name="my-widgets",
+            widgets=tools,
+            cache_backend=SQLiteCacheBackend("/tmp/fastapps-cache.db"),
+        )
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        max_entries: int = 10_000,
+        touch_batch_size: int = 256,
+        touch_interval: float = 5.0,
+    ):
+        """
+        Args:
+            path: Database file path (created if missing)
+            max_entries: Maximum number of values kept across all processes
+                (least recently used entries are evicted first)
+            touch_batch_size: Buffered access-time updates that trigger a write
+            touch_interval: Maximum seconds access-time updates stay buffered
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.evictions = 0
+        self.touch_batch_size = touch_batch_size
+        self.touch_interval = touch_interval
+        self._lock = threading.Lock()
+        # key -> last access time, not yet written to the database
+        self._touched: Dict[str, float] = {}
+        self._touched_since = 0.0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS results_accessed_at ON results (accessed_at)"
+        )
+
+    def _get(self, key: str) -> Tuple[bool, Any]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return False, None
+            if row[1] <= now:
+                self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                return False, None
+            if not self._touched:
+                self._touched_since = now
+            self._touched[key] = now
+            if (
+                len(self._touched) >= self.touch_batch_size
+                or now - self._touched_since >= self.touch_interval
+            ):
+                self._flush_touched()
+        return True, json.loads(row[0])
+
+    def _flush_touched(self):
+        """Write buffered access times (caller holds the lock)."""
+        if not self._touched:
+            return
+        touched = [(accessed_at, key) for key, accessed_at in self._touched.items()]
+        self._touched = {}
+        # One transaction (a single write lock) for the whole batch
+        self._conn.execute("BEGIN")
+        try:
+            self._conn.executemany(
+                "UPDATE results SET accessed_at = MAX(accessed_at, ?) WHERE key = ?",
+                touched,
+            )
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def _set(self, key: str, value: Any, ttl: float):
+        now = time.time()
+        encoded = json.dumps(value)
+        with self._lock:
+            # Eviction below orders by access time, so apply pending touches
+            self._flush_touched()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, encoded, now + ttl, now),
+            )
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()
+            overflow = count - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM results WHERE key IN ("
+                    "SELECT key FROM results ORDER BY accessed_at LIMIT ?)",
+                    (overflow,),
+                )
+                self.evictions += overflow
+
+    def _execute(self, sql: str, params: tuple = ()):
+        with self._lock:
+            self._conn.execute(sql, params)
+
+    async def get(self, key: str) -> Tuple[bool, Any]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: Any, ttl: float):
+        await asyncio.to_thread(self._set, key, value, ttl)
+
+    async def delete(self, key: str):
+        await asyncio.to_thread(
+            self._execute, "DELETE FROM results WHERE key = ?", (key,)
+        )
+
+    async def clear(self):
+        await asyncio.to_thread(self._execute, "DELETE FROM results")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()
+        return {"size": count, "evictions": self.evictions}
+
+    def close(self):
+        """Write buffered access times and close the database connection."""
+        with self._lock:
+            self._flush_touched()
+            self._conn.close()
+
+
+class ResultCache:
+    """
+    TTL result cache for one widget's execute() results.
+
+    Storage is delegated to a CacheBackend (in-memory by default). Concurrent
+    lookups for the same missing key within a process share a single
+    computation (single-flight), so a burst of identical tool calls runs
+    execute() once. The computation runs in its own task, so cancelling
+    the call that started it (e.g., a client disconnect) does not cancel
+    the other callers waiting on it. Every caller gets its own copy of the
+    result, so callers sharing a computation or a cache entry never see each
+    other's mutations.
+
+    Backend failures (an unreachable or locked store, a result the backend
+    cannot serialize) never fail the call: they are reported as warnings
+    and the widget runs uncached.
+
+    Example:
+        cache = ResultCache(ttl=60, max_entries=256)
+        result = await cache.get_or_compute(key, lambda: widget.execute(data))
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int = 128,
+        backend: Optional[CacheBackend] = None,
+        namespace: str = "",
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds a cached result stays valid
+            max_entries: Maximum number of results kept by the default
+                in-memory backend (ignored when backend is given)
+            backend: Shared storage backend (optional)
+            namespace: Key prefix separating widgets in a shared backend
+        """
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+
+        self.ttl = ttl
+        self.namespace = namespace
+        self.backend = backend or MemoryCacheBackend(max_entries=max_entries)
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.errors = 0
+        self._warned_at: Optional[float] = None
+
+    def _storage_key(self, key: Hashable) -> str:
+        """Map a widget cache key to a stable, process-independent string."""
+        encoded = json.dumps(key, default=str, sort_keys=True).encode()
+        return f"{self.namespace}:{hashlib.sha256(encoded).hexdigest()}"
+
+    async def get_or_compute(
+        self, key: Hashable, compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Return the cached result for key, computing it at most once if missing.
+
+        Args:
+            key: Cache key (tuples of strings/None are stable across processes)
+            compute: Zero-argument coroutine factory producing the result
+
+        Returns:
+            Cached or freshly computed result, owned by the caller.
+            Exceptions from compute are propagated to every waiter and never
+            cached.
+        """
+        storage_key = self._storage_key(key)
+
+        inflight = self._inflight.get(storage_key)
+        if inflight is not None:
+            self.coalesced += 1
+            return copy.deepcopy(await asyncio.shield(inflight))
+
+        try:
+            found, value = await self.backend.get(storage_key)
+        except Exception as e:
+            self._backend_error("read", e)
+            found, value = False, None
+        if found:
+            self.hits += 1
+            return value
+
+        # Re-check: another call may have started computing while we awaited
+        inflight = self._inflight.get(storage_key)
+        if inflight is not None:
+            self.coalesced += 1
+            return copy.deepcopy(await asyncio.shield(inflight))
+
+        self.misses += 1
+        task = asyncio.ensure_future(self._compute(storage_key, compute))
+        self._inflight[storage_key] = task
+        # The task's result is shared by every waiter; hand out copies only
+        return copy.deepcopy(await asyncio.shield(task))
+
+    async def _compute(
+        self, storage_key: str, compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Compute and store a missing result (owned by no single caller)."""
+        try:
+            value = await compute()
+            try:
+                await self.backend.set(storage_key, value, self.ttl)
+            except Exception as e:
+                self._backend_error("write", e)
+            return value
+        finally:
+            self._inflight.pop(storage_key, None)
+
+    def _backend_error(self, action: str, error: Exception):
+        """Count a backend failure, warning at most once per interval."""
+        self.errors += 1
+        now = time.monotonic()
+        if self._warned_at is None or now - self._warned_at >= BACKEND_WARNING_INTERVAL:
+            self._warned_at = now
+            print(
+                f"Warning: result cache {action} failed for '{self.namespace}' "
+                f"({type(error).__name__}: {error}); running uncached"
+            )
+
+    async def invalidate(self, key: Hashable):
+        """Drop the cached result for key."""
+        await self.backend.delete(self._storage_key(key))
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters plus backend statistics (size is backend-wide)."""
+        lookups = self.hits + self.misses + self.coalesced
+        try:
+            backend_stats = self.backend.stats()
+        except Exception as e:
+            self._backend_error("stats", e)
+            backend_stats = {}
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+            **backend_stats,
+        }
+
+
+def make_result_cache(
+    widget: Any, backend: Optional[CacheBackend] = None
+) -> Optional[ResultCache]:
+    """
+    Create a ResultCache from a widget's class-level cache declaration.
+
+    Args:
+        widget: Widget instance
+        backend: Shared backend (optional, defaults to a per-widget memory cache)
+
+    Returns:
+        ResultCache if widget.cache_ttl is set, None otherwise
+    """
+    if not widget.cache_ttl:
+        return None
+    return ResultCache(
+        ttl=widget.cache_ttl,
+        max_entries=widget.cache_max_entries,
+        backend=backend,
+        namespace=widget.identifier,
+    )
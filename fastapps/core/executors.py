@@ -0,0 +1,134 @@
+import asyncio
+import contextlib
+import copy
+import inspect
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from fastapps.builder.compiler import WidgetBuildResult
+
+# Supported values for BaseWidget.execution_mode
+EXECUTION_MODES = ("async", "thread", "process")
+
+
+async def _await(awaitable: Any) -> Any:
+    return await awaitable
+
+
+def run_execute_blocking(widget: Any, input_data: Any, context: Any, user: Any) -> Any:
+    """
+    Run widget.execute() to completion in the current thread or process.
+
+    Used as the worker entry point for thread and process execution modes.
+    Coroutine results are driven on a private event loop, so widgets written
+    as ``async def execute`` with blocking code inside work unchanged.
+    """
+    result = widget.execute(input_data, context, user)
+    if inspect.isawaitable(result):
+        return asyncio.run(_await(result))
+    return result
+
+
+def _process_payload(widget: Any) -> Any:
+    """
+    Shallow copy of a widget that is cheap to send to a worker process.
+
+    The build result (the widget HTML, megabytes for inline bundles) and the
+    locale memo are not needed by execute(), so they are replaced with empty
+    stand-ins instead of being pickled on every call.
+    """
+    payload = copy.copy(widget)
+    build_result = widget.build_result
+    payload.build_result = WidgetBuildResult(
+        name=build_result.name, hash=build_result.hash, html=""
+    )
+    payload._negotiated_locales = {}
+    return payload
+
+
+class WidgetExecutors:
+    """
+    Shared executors that run widgets off the main event loop.
+
+    Widgets declare ``execution_mode = "thread"`` (blocking I/O) or
+    ``execution_mode = "process"`` (CPU-bound work) so heavy code can't stall
+    tools/list or other widgets. Pools are created lazily on first use.
+    Process-mode widgets, their input models and results must be picklable;
+    the widget HTML is not sent to worker processes.
+    """
+
+    def __init__(
+        self,
+        thread_workers: Optional[int] = None,
+        process_workers: Optional[int] = None,
+    ):
+        """
+        Args:
+            thread_workers: Thread pool size (None uses the executor default)
+            process_workers: Process pool size (None uses the CPU count)
+        """
+        self.thread_workers = thread_workers
+        self.process_workers = process_workers
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_pool(self, mode: str) -> Executor:
+        if mode == "thread":
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(
+                    max_workers=self.thread_workers,
+                    thread_name_prefix="fastapps-widget",
+                )
+            return self._thread_pool
+
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=self.process_workers)
+        return self._process_pool
+
+    async def run(self, widget: Any, input_data: Any, context: Any, user: Any) -> Any:
+        """
+        Run widget.execute() according to the widget's execution_mode.
+
+        Returns:
+            Result of execute()
+
+        If cancelled while execute() is already running in a worker, this
+        waits for the worker to return before re-raising CancelledError:
+        threads and processes cannot be interrupted, and callers holding a
+        concurrency slot (ExecutionLimiter) must not release it early.
+        """
+        mode = widget.execution_mode
+        if mode == "async":
+            return await widget.execute(input_data, context, user)
+
+        if mode == "process":
+            widget = _process_payload(widget)
+        future = self._get_pool(mode).submit(
+            run_execute_blocking, widget, input_data, context, user
+        )
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # cancel() only succeeds for calls that haven't started yet
+            if not future.cancel():
+                with contextlib.suppress(Exception):
+                    await asyncio.wrap_future(future)
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        """Which pools are running and their configured sizes."""
+        return {
+            "thread_pool": self._thread_pool is not None,
+            "thread_workers": self.thread_workers,
+            "process_pool": self._process_pool is not None,
+            "process_workers": self.process_workers,
+        }
+
+    def shutdown(self, wait: bool = True):
+        """Shut down any pools that were started."""
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=wait)
+            self._thread_pool = None
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=wait)
+            self._process_pool = None
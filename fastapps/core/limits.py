@@ -0,0 +1,149 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class WidgetSaturatedError(Exception):
+    """Raised when a widget is at max_concurrency and its queue is full."""
+
+
+class WidgetTimeoutError(Exception):
+    """Raised when a widget's execute() exceeds its timeout."""
+
+
+class ExecutionLimiter:
+    """
+    Concurrency, queue-length and timeout limits for one widget.
+
+    Calls beyond max_concurrency wait in a queue; once max_queue calls are
+    waiting, further calls are rejected immediately with WidgetSaturatedError
+    so a slow backend can't pile up unbounded coroutines.
+
+    A slot is held until the underlying work has actually finished, not just
+    until the caller stops waiting: when a call times out (or its caller is
+    cancelled) the work is cancelled, and work that cannot be interrupted
+    (thread/process execution) keeps its slot until it returns.
+
+    Example:
+        limiter = ExecutionLimiter(max_concurrency=4, max_queue=16, timeout=10)
+        result = await limiter.run(lambda: widget.execute(data, context, user))
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        """
+        Args:
+            max_concurrency: Maximum concurrent executions (None for unlimited)
+            max_queue: Maximum calls waiting for a slot (None for unlimited,
+                0 to reject as soon as all slots are busy)
+            timeout: Seconds an execution may run before WidgetTimeoutError
+        """
+        if max_concurrency is not None and max_concurrency <= 0:
+            raise ValueError("max_concurrency must be positive")
+        if max_queue is not None and max_queue < 0:
+            raise ValueError("max_queue must not be negative")
+        if timeout is not None and timeout <= 0:
+            raise ValueError("timeout must be positive")
+
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._semaphore = (
+            asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        )
+
+        self.active = 0
+        self.queued = 0
+        self.max_queue_depth = 0
+        self.completed = 0
+        self.rejections = 0
+        self.timeouts = 0
+
+    async def run(self, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run call within the configured limits.
+
+        Args:
+            call: Zero-argument coroutine factory (e.g., a bound execute())
+
+        Returns:
+            Result of the call
+
+        Raises:
+            WidgetSaturatedError: If all slots are busy and the queue is full
+            WidgetTimeoutError: If the call exceeds the timeout
+        """
+        if self._semaphore is not None:
+            await self._acquire()
+
+        self.active += 1
+        work = asyncio.ensure_future(call())
+        work.add_done_callback(self._finished)
+        try:
+            return await asyncio.wait_for(asyncio.shield(work), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            work.cancel()
+            raise WidgetTimeoutError(
+                f"Execution exceeded timeout of {self.timeout}s"
+            ) from None
+        except asyncio.CancelledError:
+            work.cancel()
+            raise
+
+    async def _acquire(self):
+        if self._semaphore.locked() and (
+            self.max_queue is not None and self.queued >= self.max_queue
+        ):
+            self.rejections += 1
+            raise WidgetSaturatedError(
+                f"Too many concurrent calls (max_concurrency={self.max_concurrency}, "
+                f"max_queue={self.max_queue})"
+            )
+
+        self.queued += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queued)
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+
+    def _finished(self, work: asyncio.Future):
+        """Release the slot once the work is done (possibly after its caller)."""
+        self.active -= 1
+        self.completed += 1
+        if self._semaphore is not None:
+            self._semaphore.release()
+        # Mark retrieved: a timed-out caller no longer awaits the outcome
+        if not work.cancelled():
+            work.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """Current queue depth and counters."""
+        return {
+            "active": self.active,
+            "queued": self.queued,
+            "max_queue_depth": self.max_queue_depth,
+            "completed": self.completed,
+            "rejections": self.rejections,
+            "timeouts": self.timeouts,
+        }
+
+
+def make_execution_limiter(widget: Any) -> Optional[ExecutionLimiter]:
+    """
+    Create an ExecutionLimiter from a widget's class-level limits.
+
+    Returns:
+        ExecutionLimiter if the widget declares any limit, None otherwise
+    """
+    if widget.max_concurrency is None and widget.timeout is None:
+        return None
+    return ExecutionLimiter(
+        max_concurrency=widget.max_concurrency,
+        max_queue=widget.max_queue,
+        timeout=widget.timeout,
+    )
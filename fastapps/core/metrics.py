@@ -0,0 +1,357 @@
+import bisect
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Seconds; covers sub-millisecond handlers up to slow upstream calls
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+# Bytes; hosted-mode responses are a few hundred bytes, inline bundles megabytes
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{n}="{_escape(str(v))}"' for n, v in zip(names, values, strict=True)
+    )
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1.0):
+        key = tuple(label_values)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(tuple(label_values), 0.0)
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} counter",
+        ]
+        for key, value in sorted(self._values.items()):
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}{labels} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[Tuple[str, ...], List[Any]] = {}
+
+    def observe(self, value: float, *label_values: str):
+        key = tuple(label_values)
+        series = self._series.get(key)
+        if series is None:
+            series = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            self._series[key] = series
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def count(self, *label_values: str) -> int:
+        series = self._series.get(tuple(label_values))
+        return series[2] if series else 0
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        bucket_names = self.label_names + ("le",)
+        bounds = self.buckets + (float("inf"),)
+        for key, (counts, total, count) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(bounds, counts, strict=True):
+                cumulative += bucket_count
+                labels = _format_labels(bucket_names, key + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Gauge:
+    """Gauge whose samples are collected from a callback at render time."""
+
+    metric_type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str],
+        collect: Callable[[], Iterable[Tuple[Sequence[str], float]]],
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._collect = collect
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+        ]
+        for label_values, value in self._collect():
+            labels = _format_labels(self.label_names, label_values)
+            lines.append(f"{self.name}{labels} {_format_value(value)}")
+        return lines
+
+
+class CollectedCounter(Gauge):
+    """
+    Counter whose samples are collected from a callback at render time.
+
+    For monotonic totals kept elsewhere (cache and limiter stats); exported
+    with the counter type so rate() and increase() work on them.
+    """
+
+    metric_type = "counter"
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: List[Any] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class ServerMetrics:
+    """
+    Instruments recorded by WidgetMCPServer when metrics are enabled.
+
+    Served at /metrics by WidgetMCPServer.get_app().
+    """
+
+    def __init__(self, server: Any = None):
+        """
+        Args:
+            server: WidgetMCPServer whose cache and limiter stats are exported
+                as gauges (optional)
+        """
+        self.registry = MetricsRegistry()
+        register = self.registry.register
+
+        self.tool_calls = register(
+            Counter("fastapps_tool_calls_total", "Tool calls per widget.", ["widget"])
+        )
+        self.tool_errors = register(
+            Counter(
+                "fastapps_tool_errors_total",
+                "Failed tool calls per widget and error code.",
+                ["widget", "code"],
+            )
+        )
+        self.tool_phase_seconds = register(
+            Histogram(
+                "fastapps_tool_phase_seconds",
+                "Tool call latency by phase (validate, execute, build_result).",
+                ["widget", "phase"],
+            )
+        )
+        self.tool_response_bytes = register(
+            Histogram(
+                "fastapps_tool_response_bytes",
+                "Estimated serialized tools/call response size.",
+                ["widget"],
+                buckets=SIZE_BUCKETS,
+            )
+        )
+        self.auth_verify_seconds = register(
+            Histogram(
+                "fastapps_auth_verify_seconds",
+                "Bearer token verification latency.",
+                ["result"],
+            )
+        )
+        self.asset_proxy_seconds = register(
+            Histogram(
+                "fastapps_asset_proxy_seconds",
+                "/assets request latency.",
+                ["status"],
+            )
+        )
+
+        if server is not None:
+            self._register_server_gauges(server)
+
+    def _register_server_gauges(self, server: Any):
+        def cache_samples(field: str):
+            def collect():
+                for widget, stats in sorted(server.get_cache_stats().items()):
+                    yield (widget,), stats[field]
+
+            return collect
+
+        def limiter_samples(field: str):
+            def collect():
+                for widget, stats in sorted(server.get_execution_stats().items()):
+                    yield (widget,), stats[field]
+
+            return collect
+
+        def token_cache_samples(field: str):
+            def collect():
+                stats = server.get_token_cache_stats()
+                if field in stats:
+                    yield (), stats[field]
+
+            return collect
+
+        register = self.registry.register
+        for metric, field, name, documentation in (
+            (
+                CollectedCounter,
+                "hits",
+                "hits_total",
+                "Bearer tokens served from the verified-token cache.",
+            ),
+            (
+                CollectedCounter,
+                "misses",
+                "misses_total",
+                "Bearer tokens that needed full verification.",
+            ),
+            (Gauge, "hit_rate", "hit_rate", "Verified-token cache hit rate."),
+            (
+                CollectedCounter,
+                "saved_seconds",
+                "cpu_saved_seconds_total",
+                "Verification CPU time skipped by verified-token cache hits.",
+            ),
+        ):
+            register(
+                metric(
+                    f"fastapps_auth_token_cache_{name}",
+                    documentation,
+                    [],
+                    token_cache_samples(field),
+                )
+            )
+        for field, documentation in (
+            ("hits", "Result cache hits."),
+            ("misses", "Result cache misses."),
+            ("coalesced", "Calls that joined an in-flight identical execution."),
+            ("errors", "Result cache backend failures (calls ran uncached)."),
+        ):
+            register(
+                CollectedCounter(
+                    f"fastapps_cache_{field}_total",
+                    documentation,
+                    ["widget"],
+                    cache_samples(field),
+                )
+            )
+        for metric, field, name, documentation in (
+            (Gauge, "active", "active", "Executions currently running."),
+            (Gauge, "queued", "queued", "Calls waiting for an execution slot."),
+            (
+                CollectedCounter,
+                "rejections",
+                "rejections_total",
+                "Calls rejected because the queue was full.",
+            ),
+            (
+                CollectedCounter,
+                "timeouts",
+                "timeouts_total",
+                "Executions that exceeded the widget timeout.",
+            ),
+        ):
+            register(
+                metric(
+                    f"fastapps_execution_{name}",
+                    documentation,
+                    ["widget"],
+                    limiter_samples(field),
+                )
+            )
+
+    def render(self) -> str:
+        return self.registry.render()
+
+
+class TimedTokenVerifier:
+    """Token verifier wrapper that records verification latency."""
+
+    def __init__(self, verifier: Any, metrics: ServerMetrics):
+        self.verifier = verifier
+        self.metrics = metrics
+
+    async def verify_token(self, token: str) -> Optional[Any]:
+        start = time.perf_counter()
+        result = "error"
+        try:
+            access_token = await self.verifier.verify_token(token)
+            result = "valid" if access_token is not None else "invalid"
+            return access_token
+        finally:
+            self.metrics.auth_verify_seconds.observe(
+                time.perf_counter() - start, result
+            )
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.verifier, name)
@@ -1,14 +1,131 @@
-from typing import Any, Dict, List, Optional
+import asyncio
+import inspect
+import json
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from fastmcp import FastMCP
 from mcp import types
 
 from fastapps.core.utils import get_cli_version
 
+from ..auth.policy import AuthPolicy
+from .assets import StaticAssets
+from .cache import CacheBackend, ResultCache, make_result_cache
+from .executors import EXECUTION_MODES, WidgetExecutors
+from .limits import (
+    ExecutionLimiter,
+    WidgetSaturatedError,
+    WidgetTimeoutError,
+    make_execution_limiter,
+)
+from .metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from .metrics import ServerMetrics, TimedTokenVerifier
+from .snapshot import (
+    ResourceSnapshot,
+    build_resource_descriptors,
+    build_resource_snapshot,
+)
+from .tracing import HOOK_EVENTS, SpanExporter, ToolCallTrace, UntracedCall
 from .widget import BaseWidget, ClientContext, UserContext
 
+# How tools/call responses reference the widget template
+WIDGET_RESPONSE_MODES = ("embed", "reference")
+
+# Local asset server the /assets route proxies to (see `fastapps dev`)
+DEFAULT_ASSET_UPSTREAM = "http://127.0.0.1:4444"
+
+# Headers passed through the /assets proxy in each direction
+ASSET_REQUEST_HEADERS = frozenset(
+    {"range", "if-range", "if-none-match", "if-modified-since", "accept-encoding"}
+)
+ASSET_RESPONSE_HEADERS = frozenset(
+    {
+        "content-type",
+        "content-length",
+        "content-encoding",
+        "content-range",
+        "accept-ranges",
+        "cache-control",
+        "etag",
+        "last-modified",
+        "vary",
+    }
+)
+
+# Upper bound on cached listing variants (one per distinct requested locale)
+MAX_CACHED_LISTINGS = 64
+
+
+def _request_meta(params: Any) -> Dict[str, Any]:
+    """Return request _meta as a plain dict, including client extensions."""
+    meta = getattr(params, "meta", None)
+    if meta is None:
+        return {}
+    return meta.model_dump(exclude_none=True)
+
+
+def _requested_locale(meta: Dict[str, Any]) -> Optional[str]:
+    """Extract the client's requested locale from request _meta."""
+    return meta.get("openai/locale") or meta.get("webplus/i18n")
+
+
+@dataclass
+class _ServedWidgets:
+    """
+    The widgets being served and everything derived from them.
+
+    set_widgets() (which `fastapps dev` calls from its watcher thread) builds
+    a complete replacement and publishes it with a single assignment.
+    Handlers read WidgetMCPServer._served once per request, so a request
+    never pairs widgets from one reload with policies, limiters or caches
+    from another, and entries it builds lazily land in that same generation.
+    """
+
+    widgets_by_id: Dict[str, BaseWidget]
+    widgets_by_uri: Dict[str, BaseWidget]
+    auth_policies: Dict[str, AuthPolicy]
+    # Opt-in per-widget result caches (see BaseWidget.cache_ttl)
+    result_caches: Dict[str, ResultCache]
+    # Per-widget concurrency/queue/timeout limits (see BaseWidget.max_concurrency)
+    limiters: Dict[str, ExecutionLimiter]
+
+    # Locale-aware caches. Locale is resolved per request and never written
+    # back to the shared widget instances, so every variant is safe to reuse
+    # across concurrent clients. Entries are rebuilt only when widgets change.
+    # (identifier, resolved locale) -> Tool
+    tools: Dict[Tuple[str, str], types.Tool] = field(default_factory=dict)
+    # (template URI, resolved locale) -> ResourceSnapshot
+    resource_snapshots: Dict[Tuple[str, str], ResourceSnapshot] = field(
+        default_factory=dict
+    )
+    # (template URI, resolved locale) -> list entries, built without HTML
+    resource_descriptors: Dict[
+        Tuple[str, str], Tuple[types.Resource, types.ResourceTemplate]
+    ] = field(default_factory=dict)
+    # (listing kind, requested locale) -> precomputed list response
+    listings: Dict[Tuple[str, Optional[str]], types.ServerResult] = field(
+        default_factory=dict
+    )
+    input_schemas: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    def without_cached_entries(self) -> "_ServedWidgets":
+        """Same widgets, policies, result caches and limiters; empty caches."""
+        return _ServedWidgets(
+            widgets_by_id=self.widgets_by_id,
+            widgets_by_uri=self.widgets_by_uri,
+            auth_policies=self.auth_policies,
+            result_caches=self.result_caches,
+            limiters=self.limiters,
+        )
+
+
 # Auth imports (optional, graceful degradation if not available)
 try:
+    from mcp.server.auth.middleware.auth_context import get_access_token
     from mcp.server.auth.provider import TokenVerifier
     from mcp.server.auth.settings import AuthSettings
 
@@ -18,6 +135,9 @@ except ImportError:
     AuthSettings = None
     TokenVerifier = None
 
+    def get_access_token():
+        return None
+
 
 class WidgetMCPServer:
     """
@@ -36,10 +156,22 @@ class WidgetMCPServer:
         auth_resource_server_url: Optional[str] = None,
         auth_required_scopes: Optional[List[str]] = None,
         auth_audience: Optional[str] = None,
+        auth_cache_dir: Optional[Path | str] = None,
         token_verifier: Optional["TokenVerifier"] = None,
         # Global CSP configuration for all widgets (optional)
         global_resource_domains: Optional[List[str]] = None,
         global_connect_domains: Optional[List[str]] = None,
+        # How tools/call responses carry the widget template
+        widget_response_mode: str = "embed",
+        # Shared storage for widget result caches (optional)
+        cache_backend: Optional[CacheBackend] = None,
+        # Pool sizes for thread/process execution modes (optional)
+        thread_pool_size: Optional[int] = None,
+        process_pool_size: Optional[int] = None,
+        # Prometheus-style /metrics endpoint (optional)
+        enable_metrics: bool = False,
+        # Per-call span export (optional)
+        span_exporter: Optional[SpanExporter] = None,
     ):
         """
         Initialize MCP server with optional OAuth authentication and global CSP.
@@ -51,9 +183,26 @@ class WidgetMCPServer:
             auth_resource_server_url: Your MCP server URL (e.g., https://example.com/mcp)
             auth_required_scopes: Required OAuth scopes (e.g., ["user", "read:data"])
             auth_audience: JWT audience claim (optional)
+            auth_cache_dir: Directory caching the issuer's discovery document
+                and JWKS for the built-in verifier, so restarts do not wait
+                on the issuer (optional)
             token_verifier: Custom TokenVerifier (optional, uses JWTVerifier if not provided)
             global_resource_domains: Domains to allow for all widgets (scripts, styles, images)
             global_connect_domains: Domains to allow for API calls (fetch, XHR)
+            widget_response_mode: "embed" (default) attaches the cached embedded
+                widget resource to every tools/call result; "reference" only sets
+                openai/outputTemplate so clients fetch the template via
+                resources/read, keeping responses small for large inline bundles
+            cache_backend: Storage shared by all widget result caches (e.g.,
+                SQLiteCacheBackend for multiple workers on one host). Defaults
+                to a per-widget in-memory cache.
+            thread_pool_size: Workers shared by widgets with execution_mode="thread"
+            process_pool_size: Workers shared by widgets with execution_mode="process"
+            enable_metrics: Record per-widget call counts, errors, phase latency,
+                response sizes, auth and /assets latency, served at /metrics
+            span_exporter: Receives a ToolCallTrace per tools/call with
+                validate/execute/build_result phase timings (e.g.,
+                FileSpanExporter or OTLPHTTPSpanExporter)
 
         Example (Simple):
             server = WidgetMCPServer(
@@ -86,9 +235,35 @@ class WidgetMCPServer:
                 token_verifier=MyCustomVerifier(),
             )
         """
-        self.widgets_by_id = {w.identifier: w for w in widgets}
-        self.widgets_by_uri = {w.template_uri: w for w in widgets}
-        self.client_locale: Optional[str] = None
+        if widget_response_mode not in WIDGET_RESPONSE_MODES:
+            raise ValueError(
+                f"Invalid widget_response_mode '{widget_response_mode}'. "
+                f"Expected one of: {', '.join(WIDGET_RESPONSE_MODES)}"
+            )
+
+        self.widget_response_mode = widget_response_mode
+
+        # Shared storage for opt-in per-widget result caches
+        self.cache_backend = cache_backend
+
+        # Shared pools for widgets that run off the event loop
+        self.executors = WidgetExecutors(
+            thread_workers=thread_pool_size, process_workers=process_pool_size
+        )
+
+        # Instrumentation (None when metrics are disabled)
+        self.metrics: Optional[ServerMetrics] = (
+            ServerMetrics(self) if enable_metrics else None
+        )
+
+        # tools/call hooks (see add_hook) and span export
+        self._hooks: Dict[str, List[Callable[[ToolCallTrace], Any]]] = {
+            event: [] for event in HOOK_EVENTS
+        }
+        self.span_exporter = span_exporter
+
+        # In-process /assets handler, set by get_app(assets_dir=...)
+        self.assets: Optional[StaticAssets] = None
 
         # Store global CSP configuration
         self.global_resource_domains = global_resource_domains or []
@@ -101,6 +276,7 @@ class WidgetMCPServer:
         self.server_requires_auth = bool(auth_issuer_url and auth_resource_server_url)
         self.server_auth_scopes = auth_required_scopes or []
         self.token_verifier_instance = None
+        self._publish(self._build_served(widgets))
 
         # Configure authentication if provided
         auth_settings = None
@@ -121,6 +297,7 @@ class WidgetMCPServer:
                     issuer_url=auth_issuer_url,
                     audience=auth_audience,
                     required_scopes=auth_required_scopes or [],
+                    cache_dir=auth_cache_dir,
                 )
 
             # Create AuthSettings for FastMCP
@@ -133,6 +310,10 @@ class WidgetMCPServer:
             # Store verifier for per-widget validation
             self.token_verifier_instance = verifier
 
+            # Record verification latency when metrics are enabled
+            if self.metrics is not None:
+                verifier = TimedTokenVerifier(verifier, self.metrics)
+
         # Initialize FastMCP with or without auth
         fastmcp_kwargs: Dict[str, Any] = {"name": name, "stateless_http": True}
         if auth_settings:
@@ -141,19 +322,419 @@ class WidgetMCPServer:
 
         self._register_handlers()
 
+    @property
+    def widgets_by_id(self) -> Dict[str, BaseWidget]:
+        """Served widgets keyed by tool identifier."""
+        return self._served.widgets_by_id
+
+    @property
+    def widgets_by_uri(self) -> Dict[str, BaseWidget]:
+        """Served widgets keyed by template URI."""
+        return self._served.widgets_by_uri
+
+    def set_widgets(self, widgets: List[BaseWidget]):
+        """
+        Replace the served widgets and rebuild cached listings.
+
+        Safe to call from another thread: requests already in flight finish
+        against the widgets they started with.
+
+        Args:
+            widgets: New list of widget instances
+        """
+        self._configure_widget_csp(widgets)
+        self._publish(self._build_served(widgets))
+
+    def _build_served(self, widgets: List[BaseWidget]) -> _ServedWidgets:
+        """
+        Compile auth policies and create the result caches and execution
+        limiters declared by widgets.
+        """
+        for widget in widgets:
+            if widget.execution_mode not in EXECUTION_MODES:
+                raise ValueError(
+                    f"Invalid execution_mode '{widget.execution_mode}' for widget "
+                    f"'{widget.identifier}'. Expected one of: {', '.join(EXECUTION_MODES)}"
+                )
+
+        # Resolve each widget's auth decorators and server inheritance once
+        auth_policies = {
+            widget.identifier: AuthPolicy.compile(
+                widget, self.server_requires_auth, self.server_auth_scopes
+            )
+            for widget in widgets
+        }
+        result_caches: Dict[str, ResultCache] = {}
+        limiters: Dict[str, ExecutionLimiter] = {}
+        for widget in widgets:
+            cache = make_result_cache(widget, self.cache_backend)
+            if cache is not None:
+                result_caches[widget.identifier] = cache
+            limiter = make_execution_limiter(widget)
+            if limiter is not None:
+                limiters[widget.identifier] = limiter
+
+        return _ServedWidgets(
+            widgets_by_id={w.identifier: w for w in widgets},
+            widgets_by_uri={w.template_uri: w for w in widgets},
+            auth_policies=auth_policies,
+            result_caches=result_caches,
+            limiters=limiters,
+        )
+
+    def _publish(self, served: _ServedWidgets):
+        """Prebuild the default-locale listings, then serve ``served``."""
+        for kind in ("tools", "resources", "resource_templates"):
+            self._get_listing(served, kind, None)
+        self._served = served
+
+    def get_auth_policy(self, identifier: str) -> Optional[AuthPolicy]:
+        """Compiled AuthPolicy for a widget identifier (None if unknown)."""
+        return self._served.auth_policies.get(identifier)
+
+    def get_token_cache_stats(self) -> Dict[str, Any]:
+        """
+        Report the auth verifier's verified-token cache counters.
+
+        Returns:
+            VerifiedTokenCache.stats(), or an empty dict when auth is off or
+            the verifier has no token cache
+        """
+        get_stats = getattr(self.token_verifier_instance, "get_token_cache_stats", None)
+        return get_stats() if get_stats is not None else {}
+
+    def get_cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Report result cache counters for widgets with caching enabled.
+
+        Returns:
+            Dictionary mapping widget identifier to ResultCache.stats()
+        """
+        return {
+            identifier: cache.stats()
+            for identifier, cache in self._served.result_caches.items()
+        }
+
+    def invalidate_caches(self):
+        """Drop cached listings and snapshots, then prebuild the default locale."""
+        self._publish(self._served.without_cached_entries())
+
+    def get_resource_snapshot(
+        self, uri: str, locale: Optional[str] = None
+    ) -> Optional[ResourceSnapshot]:
+        """
+        Get the precomputed resource snapshot for a widget template URI.
+
+        Args:
+            uri: Widget template URI (e.g., ui://widget/my_widget.html)
+            locale: Requested locale (optional, negotiated against the widget)
+
+        Returns:
+            ResourceSnapshot if the URI belongs to a widget, None otherwise
+        """
+        served = self._served
+        widget = served.widgets_by_uri.get(uri)
+        if widget is None:
+            return None
+        return self._get_snapshot(served, widget, widget.negotiate_locale(locale))
+
+    def resource_memory_usage(self) -> Dict[str, Dict[str, int]]:
+        """
+        Report approximate memory held by resource snapshots.
+
+        Returns:
+            Dictionary mapping template URI to the "html" byte count (see
+            ResourceSnapshot.memory_usage) and the number of cached locale
+            "variants" sharing it
+        """
+        usage: Dict[str, Dict[str, int]] = {}
+        for (uri, _), snapshot in self._served.resource_snapshots.items():
+            entry = usage.setdefault(uri, {"html": 0, "variants": 0})
+            # HTML is shared by every locale variant of a widget
+            entry["html"] = snapshot.memory_usage()["html"]
+            entry["variants"] += 1
+        return usage
+
+    def close(self):
+        """Release server resources (execution and token verification pools)."""
+        self.executors.shutdown()
+        if self.token_verifier_instance is not None:
+            from ..auth.verifier import JWTVerifier
+
+            if isinstance(self.token_verifier_instance, JWTVerifier):
+                self.token_verifier_instance.close()
+
+    def get_execution_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Report queue depth, rejections and timeouts for limited widgets.
+
+        Returns:
+            Dictionary mapping widget identifier to ExecutionLimiter.stats()
+        """
+        return {
+            identifier: limiter.stats()
+            for identifier, limiter in self._served.limiters.items()
+        }
+
+    async def _execute_widget(
+        self,
+        served: _ServedWidgets,
+        widget: BaseWidget,
+        input_data: Any,
+        context: ClientContext,
+        user: UserContext,
+    ) -> Dict[str, Any]:
+        """Run widget.execute() through its result cache, limits and executor."""
+        limiter = served.limiters.get(widget.identifier)
+
+        def dispatch():
+            return self.executors.run(widget, input_data, context, user)
+
+        def run():
+            if limiter is None:
+                return dispatch()
+            return limiter.run(dispatch)
+
+        cache = served.result_caches.get(widget.identifier)
+        if cache is None:
+            return await run()
+        return await cache.get_or_compute(
+            widget.get_cache_key(input_data, context, user), run
+        )
+
+    def _get_snapshot(
+        self, served: _ServedWidgets, widget: BaseWidget, locale: str
+    ) -> ResourceSnapshot:
+        """Get (or build) the resource snapshot for a widget and resolved locale."""
+        key = (widget.template_uri, locale)
+        snapshot = served.resource_snapshots.get(key)
+        if snapshot is None:
+            snapshot = build_resource_snapshot(widget, locale)
+            served.resource_snapshots[key] = snapshot
+        return snapshot
+
+    def _get_descriptors(
+        self, served: _ServedWidgets, widget: BaseWidget, locale: str
+    ) -> Tuple[types.Resource, types.ResourceTemplate]:
+        """Get (or build) a widget's list entries without loading its HTML."""
+        key = (widget.template_uri, locale)
+        snapshot = served.resource_snapshots.get(key)
+        if snapshot is not None:
+            return snapshot.resource, snapshot.template
+        descriptors = served.resource_descriptors.get(key)
+        if descriptors is None:
+            descriptors = build_resource_descriptors(widget, locale)
+            served.resource_descriptors[key] = descriptors
+        return descriptors
+
+    def _get_tool(
+        self, served: _ServedWidgets, widget: BaseWidget, locale: str
+    ) -> types.Tool:
+        """Get (or build) the Tool definition for a widget and resolved locale."""
+        key = (widget.identifier, locale)
+        tool = served.tools.get(key)
+        if tool is not None:
+            return tool
+
+        tool_meta = widget.get_tool_meta(locale)
+
+        # securitySchemes come from the compiled policy, which already applies
+        # the MCP "missing field: inherit server default policy" rule
+        policy = served.auth_policies[widget.identifier]
+        if policy.security_schemes is not None:
+            tool_meta["securitySchemes"] = list(policy.security_schemes)
+
+        input_schema = served.input_schemas.get(widget.identifier)
+        if input_schema is None:
+            input_schema = widget.get_input_schema()
+            served.input_schemas[widget.identifier] = input_schema
+
+        tool = types.Tool(
+            name=widget.identifier,
+            title=widget.title,
+            description=widget.description or widget.title,
+            inputSchema=input_schema,
+            _meta=tool_meta,
+        )
+        served.tools[key] = tool
+        return tool
+
+    def _get_listing(
+        self, served: _ServedWidgets, kind: str, requested_locale: Optional[str]
+    ) -> types.ServerResult:
+        """
+        Get (or build) a list response for the requested locale.
+
+        Args:
+            kind: "tools", "resources" or "resource_templates"
+            requested_locale: Locale requested by the client (None for defaults)
+        """
+        key = (kind, requested_locale)
+        result = served.listings.get(key)
+        if result is not None:
+            return result
+
+        widgets = served.widgets_by_id.values()
+        if kind == "tools":
+            result = types.ServerResult(
+                types.ListToolsResult(
+                    tools=[
+                        self._get_tool(served, w, w.negotiate_locale(requested_locale))
+                        for w in widgets
+                    ]
+                )
+            )
+        else:
+            # Descriptors only: widget HTML is loaded on first read/call
+            descriptors = [
+                self._get_descriptors(served, w, w.negotiate_locale(requested_locale))
+                for w in widgets
+            ]
+            if kind == "resources":
+                result = types.ServerResult(
+                    types.ListResourcesResult(resources=[d[0] for d in descriptors])
+                )
+            else:
+                result = types.ServerResult(
+                    types.ListResourceTemplatesResult(
+                        resourceTemplates=[d[1] for d in descriptors]
+                    )
+                )
+
+        # Bound the number of cached variants; arbitrary client locales beyond
+        # the limit are still served, just rebuilt from the per-widget caches
+        if len(served.listings) < MAX_CACHED_LISTINGS:
+            served.listings[key] = result
+        return result
+
+    def _record_call_metrics(
+        self, name: str, result: types.ServerResult, trace: ToolCallTrace
+    ):
+        """
+        Record call count, errors, phase latency and response size.
+
+        The response size is estimated from the snapshot's precomputed
+        embedded resource size plus the structured content and text, so
+        the (possibly multi-megabyte) response is not serialized twice.
+        """
+        metrics = self.metrics
+        if metrics is None:
+            return
+        # Avoid unbounded label cardinality from unknown tool names
+        widget = name if name in self.widgets_by_id else "_unknown"
+
+        call_result = result.root
+        if not isinstance(call_result, types.CallToolResult):
+            return
+        size = trace.attributes.get("mcp.embedded_bytes", 0)
+        for content in call_result.content:
+            size += len(getattr(content, "text", ""))
+        if call_result.structuredContent is not None:
+            size += len(json.dumps(call_result.structuredContent, default=str))
+        trace.attributes["mcp.response_bytes"] = size
+
+        metrics.tool_calls.inc(widget)
+        if call_result.isError:
+            error = (call_result.structuredContent or {}).get("error") or {}
+            metrics.tool_errors.inc(widget, error.get("code", "error"))
+        for phase, seconds in trace.phases.items():
+            metrics.tool_phase_seconds.observe(seconds, widget, phase)
+        metrics.tool_response_bytes.observe(size, widget)
+
+    def add_hook(self, event: str, hook: Callable[[ToolCallTrace], Any]):
+        """
+        Register a tools/call hook.
+
+        Args:
+            event: One of "before_validate", "after_execute", "on_error",
+                "on_response"
+            hook: Sync or async callable receiving the call's ToolCallTrace.
+                Exceptions raised by hooks are reported and never fail the call.
+        """
+        if event not in HOOK_EVENTS:
+            raise ValueError(
+                f"Unknown hook event '{event}'. Expected one of: {', '.join(HOOK_EVENTS)}"
+            )
+        self._hooks[event].append(hook)
+
+    def hook(self, event: str):
+        """
+        Decorator form of add_hook().
+
+        Example:
+            @server.hook("on_response")
+            async def record(trace):
+                print(trace.tool, trace.phases)
+        """
+
+        def decorator(fn):
+            self.add_hook(event, fn)
+            return fn
+
+        return decorator
+
+    async def _run_hooks(self, event: str, trace: ToolCallTrace):
+        """Run the hooks registered for an event, isolating their failures."""
+        for hook in self._hooks[event]:
+            try:
+                result = hook(trace)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                print(f"Warning: {event} hook {hook!r} failed: {e}")
+
+    @staticmethod
+    def _error_result(code: str, message: str, retryable: bool) -> types.ServerResult:
+        """Build a structured tool error result."""
+        return types.ServerResult(
+            types.CallToolResult(
+                content=[types.TextContent(type="text", text=f"Error: {message}")],
+                structuredContent={
+                    "error": {"code": code, "message": message, "retryable": retryable}
+                },
+                isError=True,
+            )
+        )
+
+    def _resolve_requested_locale(self, request_meta: Dict[str, Any]) -> Optional[str]:
+        """
+        Determine the locale requested for the current request.
+
+        Uses the request's own _meta first, then falls back to the _meta the
+        client sent with initialize on the current session (if any).
+        """
+        requested_locale = _requested_locale(request_meta)
+        if requested_locale:
+            return requested_locale
+
+        try:
+            session = self.mcp._mcp_server.request_context.session
+        except LookupError:
+            return None
+        client_params = getattr(session, "client_params", None)
+        if client_params is None:
+            return None
+        return _requested_locale(_request_meta(client_params))
+
     def _configure_widget_csp(self, widgets: List[BaseWidget]):
         """
         Auto-configure widget CSP based on:
         1. PUBLIC_URL environment variable
         2. Global CSP domains (global_resource_domains, global_connect_domains)
         3. Widget-specific CSP (widget.widget_csp)
+        4. Origins of shared build assets the widget loads (vendor chunk)
         """
         import os
+        from urllib.parse import urlsplit
 
         public_url = os.environ.get("PUBLIC_URL", "").strip()
 
         # Configure CSP for all widgets
         for widget in widgets:
+            # Hosted builds reference assets under PUBLIC_URL (see WidgetBuilder)
+            if public_url:
+                widget.asset_base_url = f"{public_url}/assets"
+
             # Initialize CSP if not present
             if widget.widget_csp is None:
                 widget.widget_csp = {
@@ -174,6 +755,13 @@ class WidgetMCPServer:
                 if domain not in resource_domains:
                     resource_domains.append(domain)
 
+            # Merge origins of shared chunks (relative URLs are same-origin)
+            for url in widget.get_dependency_urls():
+                parts = urlsplit(url)
+                origin = f"{parts.scheme}://{parts.netloc}"
+                if parts.netloc and origin not in resource_domains:
+                    resource_domains.append(origin)
+
             # Merge global connect domains
             for domain in self.global_connect_domains:
                 if domain not in connect_domains:
@@ -187,23 +775,13 @@ class WidgetMCPServer:
         """Register all MCP handlers for widget support."""
         server = self.mcp._mcp_server
 
-        # Handle MCP initialization to negotiate locale
+        # Handle MCP initialization. Locale is negotiated per request (see
+        # _resolve_requested_locale), so nothing is stored on shared state here.
         original_initialize = server.request_handlers.get(types.InitializeRequest)
 
         async def initialize_handler(
             req: types.InitializeRequest,
         ) -> types.ServerResult:
-            # Extract requested locale from _meta
-            meta = req.params._meta if hasattr(req.params, "_meta") else {}
-            requested_locale = meta.get("openai/locale") or meta.get("webplus/i18n")
-
-            # Negotiate locale with each widget
-            if requested_locale:
-                self.client_locale = requested_locale
-                for widget in self.widgets_by_id.values():
-                    resolved = widget.negotiate_locale(requested_locale)
-                    widget.resolved_locale = resolved
-
             # Call original handler if it exists
             if original_initialize:
                 return await original_initialize(req)
@@ -221,65 +799,29 @@ class WidgetMCPServer:
 
         server.request_handlers[types.InitializeRequest] = initialize_handler
 
-        @server.list_tools()
-        async def list_tools_handler() -> List[types.Tool]:
-            tools_list = []
-            for w in self.widgets_by_id.values():
-                tool_meta = w.get_tool_meta()
-
-                # Per MCP spec: "Missing field: inherit server default policy"
-                # If widget doesn't have explicit securitySchemes and server has auth,
-                # inherit server's auth requirement
-                if "securitySchemes" not in tool_meta and self.server_requires_auth:
-                    tool_meta["securitySchemes"] = [
-                        {"type": "oauth2", "scopes": self.server_auth_scopes}
-                    ]
+        async def list_tools_handler(
+            req: types.ListToolsRequest,
+        ) -> types.ServerResult:
+            locale = self._resolve_requested_locale(_request_meta(req.params))
+            return self._get_listing(self._served, "tools", locale)
 
-                tools_list.append(
-                    types.Tool(
-                        name=w.identifier,
-                        title=w.title,
-                        description=w.description or w.title,
-                        inputSchema=w.get_input_schema(),
-                        _meta=tool_meta,
-                    )
-                )
-            return tools_list
-
-        @server.list_resources()
-        async def list_resources_handler() -> List[types.Resource]:
-            resources = []
-            for w in self.widgets_by_id.values():
-                meta = w.get_resource_meta()
-                resource = types.Resource(
-                    name=w.title,
-                    title=w.title,
-                    uri=w.template_uri,
-                    description=f"{w.title} widget markup",
-                    mimeType="text/html+skybridge",
-                    _meta=meta,
-                )
-                resources.append(resource)
-            return resources
-
-        @server.list_resource_templates()
-        async def list_resource_templates_handler() -> List[types.ResourceTemplate]:
-            return [
-                types.ResourceTemplate(
-                    name=w.title,
-                    title=w.title,
-                    uriTemplate=w.template_uri,
-                    description=f"{w.title} widget markup",
-                    mimeType="text/html+skybridge",
-                    _meta=w.get_resource_meta(),
-                )
-                for w in self.widgets_by_id.values()
-            ]
+        async def list_resources_handler(
+            req: types.ListResourcesRequest,
+        ) -> types.ServerResult:
+            locale = self._resolve_requested_locale(_request_meta(req.params))
+            return self._get_listing(self._served, "resources", locale)
+
+        async def list_resource_templates_handler(
+            req: types.ListResourceTemplatesRequest,
+        ) -> types.ServerResult:
+            locale = self._resolve_requested_locale(_request_meta(req.params))
+            return self._get_listing(self._served, "resource_templates", locale)
 
         async def read_resource_handler(
             req: types.ReadResourceRequest,
         ) -> types.ServerResult:
-            widget = self.widgets_by_uri.get(str(req.params.uri))
+            served = self._served
+            widget = served.widgets_by_uri.get(str(req.params.uri))
             if not widget:
                 return types.ServerResult(
                     types.ReadResourceResult(
@@ -288,18 +830,42 @@ class WidgetMCPServer:
                     )
                 )
 
-            contents = [
-                types.TextResourceContents(
-                    uri=widget.template_uri,
-                    mimeType="text/html+skybridge",
-                    text=widget.build_result.html,
-                    _meta=widget.get_resource_meta(),
-                )
-            ]
-            return types.ServerResult(types.ReadResourceResult(contents=contents))
+            requested_locale = self._resolve_requested_locale(_request_meta(req.params))
+            snapshot = self._get_snapshot(
+                served, widget, widget.negotiate_locale(requested_locale)
+            )
+            return snapshot.read_result
 
         async def call_tool_handler(req: types.CallToolRequest) -> types.ServerResult:
-            widget = self.widgets_by_id.get(req.params.name)
+            # Nothing observes the call: skip building a full trace
+            if (
+                self.metrics is None
+                and self.span_exporter is None
+                and not any(self._hooks.values())
+            ):
+                untraced = UntracedCall(req.params.name, req.params.arguments or {})
+                return await handle_call_tool(req, untraced)
+
+            trace = ToolCallTrace(req.params.name, dict(req.params.arguments or {}))
+            result = await handle_call_tool(req, trace)
+            if self.metrics is not None:
+                self._record_call_metrics(trace.tool, result, trace)
+            trace.finish(result)
+            if trace.is_error:
+                await self._run_hooks("on_error", trace)
+            await self._run_hooks("on_response", trace)
+            if self.span_exporter is not None:
+                try:
+                    await self.span_exporter.export(trace)
+                except Exception as e:
+                    print(f"Warning: Could not export span for '{trace.tool}': {e}")
+            return result
+
+        async def handle_call_tool(
+            req: types.CallToolRequest, trace: ToolCallTrace
+        ) -> types.ServerResult:
+            served = self._served
+            widget = served.widgets_by_id.get(req.params.name)
             if not widget:
                 return types.ServerResult(
                     types.CallToolResult(
@@ -313,26 +879,15 @@ class WidgetMCPServer:
                 )
 
             try:
-                # Extract verified access token
-                # FastMCP verifies token before this handler if auth is enabled
-                access_token = None
-                if hasattr(req, "context") and hasattr(req.context, "access_token"):
-                    access_token = req.context.access_token
-                elif hasattr(req.params, "_meta"):
-                    # Fallback: check _meta for token info
-                    meta_token = req.params._meta.get("access_token")
-                    if meta_token:
-                        access_token = meta_token
-
-                # Determine if auth is required for this widget
-                widget_requires_auth = getattr(widget, "_auth_required", None)
-
-                # Per MCP spec: Inheritance - widget without decorator inherits server policy
-                if widget_requires_auth is None and self.server_requires_auth:
-                    widget_requires_auth = True
+                # Token verified by the MCP bearer auth middleware for this
+                # HTTP request (None when auth is off or no token was sent)
+                access_token = get_access_token()
+
+                # Precompiled auth requirements (decorators + server inheritance)
+                policy = served.auth_policies[widget.identifier]
 
                 # Per MCP spec: "Servers must enforce regardless of client hints"
-                if widget_requires_auth is True and not access_token:
+                if policy.requires_auth and not access_token:
                     return types.ServerResult(
                         types.CallToolResult(
                             content=[
@@ -346,13 +901,10 @@ class WidgetMCPServer:
                     )
 
                 # Enforce widget-specific scope requirements
-                if (
-                    access_token
-                    and hasattr(widget, "_auth_scopes")
-                    and widget._auth_scopes
-                ):
-                    user_scopes = getattr(access_token, "scopes", [])
-                    missing_scopes = set(widget._auth_scopes) - set(user_scopes)
+                if access_token and policy.scopes:
+                    missing_scopes = policy.missing_scopes(
+                        getattr(access_token, "scopes", [])
+                    )
 
                     if missing_scopes:
                         return types.ServerResult(
@@ -367,25 +919,40 @@ class WidgetMCPServer:
                             )
                         )
 
-                # Validate input
-                arguments = req.params.arguments or {}
-                input_data = widget.input_schema.model_validate(arguments)
+                # Validate input (hooks may rewrite the arguments first)
+                await self._run_hooks("before_validate", trace)
+                with trace.phase("validate"):
+                    input_data = widget.input_schema.model_validate(trace.arguments)
+                trace.input_data = input_data
 
                 # Extract client context from request metadata
-                meta = req.params._meta if hasattr(req.params, "_meta") else {}
+                request_meta = _request_meta(req.params)
 
-                # Re-negotiate locale if provided in this request
-                requested_locale = meta.get("openai/locale") or meta.get("webplus/i18n")
-                if requested_locale:
-                    widget.resolved_locale = widget.negotiate_locale(requested_locale)
+                # Negotiate locale for this request only (never stored on the widget)
+                requested_locale = self._resolve_requested_locale(request_meta)
+                resolved_locale = widget.negotiate_locale(requested_locale)
+                if resolved_locale:
+                    trace.attributes["mcp.locale"] = resolved_locale
 
                 # Create contexts
-                context = ClientContext(meta)
+                context = ClientContext(request_meta, resolved_locale=resolved_locale)
                 user = UserContext(access_token)
 
-                # Call execute with user context
-                result_data = await widget.execute(input_data, context, user)
+                # Call execute with user context (cache and limits applied)
+                with trace.phase("execute"):
+                    trace.result_data = await self._execute_widget(
+                        served, widget, input_data, context, user
+                    )
+                await self._run_hooks("after_execute", trace)
+                result_data = trace.result_data
+            except WidgetSaturatedError as exc:
+                trace.error = exc
+                return self._error_result("overloaded", str(exc), retryable=True)
+            except WidgetTimeoutError as exc:
+                trace.error = exc
+                return self._error_result("timeout", str(exc), retryable=True)
             except Exception as exc:
+                trace.error = exc
                 return types.ServerResult(
                     types.CallToolResult(
                         content=[
@@ -395,34 +962,67 @@ class WidgetMCPServer:
                     )
                 )
 
-            widget_resource = widget.get_embedded_resource()
-            meta: Dict[str, Any] = {
-                "openai.com/widget": widget_resource.model_dump(mode="json"),
-                "openai/outputTemplate": widget.template_uri,
-                "openai/toolInvocation/invoking": widget.invoking,
-                "openai/toolInvocation/invoked": widget.invoked,
-                "openai/widgetAccessible": widget.widget_accessible,
-                "openai/resultCanProduceWidget": True,
-            }
+            # Builds the CallToolResult model (meta plus the pre-dumped embedded
+            # resource); JSON encoding happens later, in the MCP transport
+            with trace.phase("build_result"):
+                meta: Dict[str, Any] = {
+                    "openai/outputTemplate": widget.template_uri,
+                    "openai/toolInvocation/invoking": widget.invoking,
+                    "openai/toolInvocation/invoked": widget.invoked,
+                    "openai/widgetAccessible": widget.widget_accessible,
+                    "openai/resultCanProduceWidget": True,
+                }
 
-            # Add resolved locale to response
-            if widget.resolved_locale:
-                meta["openai/locale"] = widget.resolved_locale
+                # Embed the pre-dumped widget resource unless only referencing it
+                if self.widget_response_mode == "embed":
+                    snapshot = self._get_snapshot(served, widget, resolved_locale)
+                    meta["openai.com/widget"] = snapshot.embedded
+                    trace.attributes["mcp.embedded_bytes"] = snapshot.embedded_bytes
 
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[types.TextContent(type="text", text=widget.invoked)],
-                    structuredContent=result_data,
-                    _meta=meta,
+                # Add resolved locale to response
+                if resolved_locale:
+                    meta["openai/locale"] = resolved_locale
+
+                return types.ServerResult(
+                    types.CallToolResult(
+                        content=[types.TextContent(type="text", text=widget.invoked)],
+                        structuredContent=result_data,
+                        _meta=meta,
+                    )
                 )
-            )
 
+        server.request_handlers[types.ListToolsRequest] = list_tools_handler
+        server.request_handlers[types.ListResourcesRequest] = list_resources_handler
+        server.request_handlers[types.ListResourceTemplatesRequest] = (
+            list_resource_templates_handler
+        )
         server.request_handlers[types.ReadResourceRequest] = read_resource_handler
         server.request_handlers[types.CallToolRequest] = call_tool_handler
 
-    def get_app(self):
-        """Get FastAPI app with CORS enabled and /assets proxy."""
+    def get_app(
+        self,
+        asset_upstream_url: str = DEFAULT_ASSET_UPSTREAM,
+        asset_proxy_limits: Optional[Any] = None,
+        assets_dir: Optional[Path | str] = None,
+    ):
+        """
+        Get FastAPI app with CORS enabled and /assets route.
+
+        With assets_dir, /assets is served in-process from that directory
+        (see StaticAssets). Otherwise /assets proxies to a local asset server,
+        sharing one pooled keep-alive HTTP client for the
+        lifetime of the app. It is opened on startup and closed (along with the
+        server's execution pools and span exporter) on shutdown.
+
+        Args:
+            asset_upstream_url: Local asset server the /assets route forwards to
+            asset_proxy_limits: httpx.Limits for the proxy's connection pool
+                (defaults to 100 connections, 20 kept alive)
+            assets_dir: Built assets directory to serve directly, removing the
+                hop to the port-4444 asset server
+        """
         app = self.mcp.http_app()
+        self.assets = StaticAssets(assets_dir) if assets_dir is not None else None
 
         try:
             from starlette.middleware.cors import CORSMiddleware
@@ -441,44 +1041,103 @@ class WidgetMCPServer:
         # This eliminates CORS/PNA/mixed content issues by serving assets from the same origin
         try:
             import httpx
-            from starlette.responses import Response
+            from starlette.responses import Response, StreamingResponse
             from starlette.routing import Route
 
+            limits = asset_proxy_limits or httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=20,
+                keepalive_expiry=30.0,
+            )
+            proxy: Dict[str, Optional[httpx.AsyncClient]] = {"client": None}
+
+            def get_client() -> httpx.AsyncClient:
+                # Created on startup; lazily here if the app was mounted
+                # without running its lifespan
+                client = proxy["client"]
+                if client is None:
+                    client = proxy["client"] = httpx.AsyncClient(
+                        base_url=asset_upstream_url, limits=limits, timeout=30.0
+                    )
+                return client
+
+            original_lifespan = app.router.lifespan_context
+
+            @asynccontextmanager
+            async def lifespan(lifespan_app):
+                if self.assets is None:
+                    get_client()
+                # Discover the issuer and load signing keys without delaying
+                # startup; verification waits for them only if still pending
+                verifier_start = None
+                if self.token_verifier_instance is not None:
+                    from ..auth.verifier import JWTVerifier
+
+                    if isinstance(self.token_verifier_instance, JWTVerifier):
+                        verifier_start = asyncio.create_task(
+                            self.token_verifier_instance.start()
+                        )
+                try:
+                    async with original_lifespan(lifespan_app) as state:
+                        yield state
+                finally:
+                    if verifier_start is not None and not verifier_start.done():
+                        verifier_start.cancel()
+                    client, proxy["client"] = proxy["client"], None
+                    if client is not None:
+                        await client.aclose()
+                    if self.span_exporter is not None:
+                        await self.span_exporter.shutdown()
+                    self.close()
+
+            app.router.lifespan_context = lifespan
+
             async def proxy_assets(request):
-                """Proxy asset requests to local asset server (port 4444)."""
+                """Serve assets in-process or proxy to the local asset server."""
+                metrics = self.metrics
+                if metrics is None:
+                    return await forward_asset(request)
+
+                started = time.perf_counter()
+
+                def observe(status_code: int):
+                    metrics.asset_proxy_seconds.observe(
+                        time.perf_counter() - started, str(status_code)
+                    )
+
+                response = await forward_asset(request, on_complete=observe)
+                # Proxied bodies are observed once they finish streaming
+                if not isinstance(response, StreamingResponse):
+                    observe(response.status_code)
+                return response
+
+            async def forward_asset(
+                request, on_complete: Optional[Callable[[int], None]] = None
+            ):
                 # Extract path from request
                 path = request.path_params.get('path', '')
-                upstream_url = f"http://127.0.0.1:4444/{path}"
+
+                if self.assets is not None:
+                    return await self.assets.get_response(request, path)
+
+                # Forward conditional/partial request headers so the asset
+                # server can answer 304 and 206 itself
+                forward_headers = {
+                    k: v
+                    for k, v in request.headers.items()
+                    if k.lower() in ASSET_REQUEST_HEADERS
+                }
+                # The body is relayed undecoded, so the upstream may only use
+                # encodings the client accepts (not httpx's default list)
+                forward_headers.setdefault("accept-encoding", "identity")
 
                 try:
-                    async with httpx.AsyncClient(timeout=30.0) as client:
-                        # Forward the request to the asset server
-                        upstream_response = await client.get(upstream_url)
-
-                        # Filter headers to only include content-related ones
-                        allowed_headers = {
-                            "content-type", "cache-control", "etag",
-                            "last-modified", "content-length"
-                        }
-                        response_headers = {
-                            k: v for k, v in upstream_response.headers.items()
-                            if k.lower() in allowed_headers
-                        }
-
-                        # Ensure content-type is set
-                        if "content-type" not in response_headers:
-                            response_headers["content-type"] = "application/octet-stream"
-
-                        # Add CORS headers for cross-origin access
-                        response_headers["access-control-allow-origin"] = "*"
-                        response_headers["access-control-allow-methods"] = "GET, OPTIONS"
-                        response_headers["access-control-allow-headers"] = "*"
-
-                        return Response(
-                            content=upstream_response.content,
-                            status_code=upstream_response.status_code,
-                            headers=response_headers
-                        )
+                    # Stream the upstream body instead of buffering it
+                    client = get_client()
+                    upstream_request = client.build_request(
+                        "GET", f"/{path}", headers=forward_headers
+                    )
+                    upstream_response = await client.send(upstream_request, stream=True)
                 except httpx.RequestError:
                     return Response(
                         content=b"Asset server unavailable",
@@ -486,6 +1145,40 @@ class WidgetMCPServer:
                         headers={"content-type": "text/plain"}
                     )
 
+                # Filter headers to only include content-related ones
+                response_headers = {
+                    k: v
+                    for k, v in upstream_response.headers.items()
+                    if k.lower() in ASSET_RESPONSE_HEADERS
+                }
+
+                # Ensure content-type is set
+                if "content-type" not in response_headers:
+                    response_headers["content-type"] = "application/octet-stream"
+
+                # Add CORS headers for cross-origin access
+                response_headers["access-control-allow-origin"] = "*"
+                response_headers["access-control-allow-methods"] = "GET, OPTIONS"
+                response_headers["access-control-allow-headers"] = "*"
+
+                async def relay_body():
+                    # Return the connection to the shared pool even when the
+                    # client disconnects mid-stream (background tasks only run
+                    # after a completed response)
+                    try:
+                        async for chunk in upstream_response.aiter_raw():
+                            yield chunk
+                    finally:
+                        await upstream_response.aclose()
+                        if on_complete is not None:
+                            on_complete(upstream_response.status_code)
+
+                return StreamingResponse(
+                    relay_body(),
+                    status_code=upstream_response.status_code,
+                    headers=response_headers,
+                )
+
             # Add route to Starlette app
             app.routes.append(
                 Route("/assets/{path:path}", proxy_assets, methods=["GET"])
@@ -495,4 +1188,17 @@ class WidgetMCPServer:
             print(f"Warning: Could not register /assets proxy route: {e}")
             pass
 
+        # Expose Prometheus-style metrics if enabled
+        if self.metrics is not None:
+            from starlette.responses import Response
+            from starlette.routing import Route
+
+            async def metrics_endpoint(request):
+                return Response(
+                    content=self.metrics.render(),
+                    headers={"content-type": METRICS_CONTENT_TYPE},
+                )
+
+            app.routes.append(Route("/metrics", metrics_endpoint, methods=["GET"]))
+
         return app
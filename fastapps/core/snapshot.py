@@ -0,0 +1,128 @@
+import hashlib
+import json
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from mcp import types
+
+from .widget import BaseWidget
+
+RESOURCE_MIME_TYPE = "text/html+skybridge"
+
+
+@dataclass(frozen=True)
+class ResourceSnapshot:
+    """
+    Immutable, precomputed resource payloads for a single widget.
+
+    Built once per widget so resources/list, resources/templates/list and
+    resources/read are served as dictionary lookups instead of rebuilding
+    models (and copying the widget HTML) on every request. ``embedded`` is the
+    pre-dumped embedded resource attached to tools/call responses.
+
+    Every model references the build result's HTML string rather than a
+    copy, so locale variants only add their (small) metadata.
+    """
+
+    uri: str
+    resource: types.Resource
+    template: types.ResourceTemplate
+    contents: types.TextResourceContents
+    read_result: types.ServerResult
+    etag: str
+    embedded: Dict[str, Any]
+    # Serialized size of ``embedded``, for response size metrics
+    embedded_bytes: int
+
+    def memory_usage(self) -> Dict[str, int]:
+        """
+        Approximate memory held by this snapshot, in bytes.
+
+        Returns:
+            Dictionary with "html" (shared with the build result and every
+            locale variant)
+        """
+        return {"html": sys.getsizeof(self.contents.text)}
+
+
+def _json_size(value: Any) -> int:
+    """Byte length of value as compact UTF-8 JSON (as sent on the wire)."""
+    return len(
+        json.dumps(
+            value, separators=(",", ":"), ensure_ascii=False, default=str
+        ).encode()
+    )
+
+
+def build_resource_descriptors(
+    widget: BaseWidget,
+    locale: Optional[str] = None,
+    meta: Optional[Dict[str, Any]] = None,
+) -> Tuple[types.Resource, types.ResourceTemplate]:
+    """
+    Build the resources/list and resources/templates/list entries for a widget.
+
+    Unlike build_resource_snapshot this does not touch the widget HTML, so
+    listings never force lazily loaded build results from disk.
+    """
+    if meta is None:
+        meta = widget.get_resource_meta(locale)
+    description = f"{widget.title} widget markup"
+
+    resource = types.Resource(
+        name=widget.title,
+        title=widget.title,
+        uri=widget.template_uri,
+        description=description,
+        mimeType=RESOURCE_MIME_TYPE,
+        _meta=meta,
+    )
+    template = types.ResourceTemplate(
+        name=widget.title,
+        title=widget.title,
+        uriTemplate=widget.template_uri,
+        description=description,
+        mimeType=RESOURCE_MIME_TYPE,
+        _meta=meta,
+    )
+    return resource, template
+
+
+def build_resource_snapshot(
+    widget: BaseWidget, locale: Optional[str] = None
+) -> ResourceSnapshot:
+    """
+    Build the resource snapshot for a widget from its current state.
+
+    Args:
+        widget: Widget instance with a build result
+        locale: Resolved locale for the snapshot (defaults to widget.resolved_locale)
+
+    Returns:
+        ResourceSnapshot holding models and a content ETag
+    """
+    meta = widget.get_resource_meta(locale)
+    resource, template = build_resource_descriptors(widget, locale, meta)
+    contents = types.TextResourceContents(
+        uri=widget.template_uri,
+        mimeType=RESOURCE_MIME_TYPE,
+        text=widget.build_result.html,
+        _meta=meta,
+    )
+    read_result = types.ReadResourceResult(contents=[contents])
+
+    digest = hashlib.sha256(widget.build_result.html.encode())
+    digest.update(json.dumps(meta, sort_keys=True, default=str).encode())
+    embedded = widget.get_embedded_resource(locale).model_dump(mode="json")
+
+    return ResourceSnapshot(
+        uri=widget.template_uri,
+        resource=resource,
+        template=template,
+        contents=contents,
+        read_result=types.ServerResult(read_result),
+        etag=f'"{digest.hexdigest()[:32]}"',
+        embedded=embedded,
+        embedded_bytes=_json_size(embedded),
+    )
@@ -0,0 +1,367 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import contextmanager, nullcontext, suppress
+from pathlib import Path
+from typing import Any, ContextManager, Deque, Dict, Iterator, List, Optional, Tuple
+
+# Hook events fired around each tools/call, in order
+HOOK_EVENTS = ("before_validate", "after_execute", "on_error", "on_response")
+
+# OTLP span kind / status codes
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+
+class ToolCallTrace:
+    """
+    Per-call record passed to hooks and span exporters.
+
+    Hooks may read any field and may replace ``arguments`` (before_validate)
+    or ``result_data`` (after_execute) to change what the call uses next.
+    Phase timings come from the monotonic perf counter; wall-clock start time
+    is kept only to place spans on a timeline.
+
+    Example:
+        @server.hook("on_response")
+        def log_slow_calls(trace):
+            if trace.duration > 1.0:
+                print(trace.tool, trace.phases)
+    """
+
+    def __init__(self, tool: str, arguments: Dict[str, Any]):
+        self.tool = tool
+        self.arguments = arguments
+        self.input_data: Any = None
+        self.result_data: Any = None
+        self.error: Optional[BaseException] = None
+        self.result: Any = None
+        self.attributes: Dict[str, Any] = {}
+
+        self.trace_id = os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.start_time_ns = time.time_ns()
+        self._start_perf_ns = time.perf_counter_ns()
+        self._end_perf_ns: Optional[int] = None
+        # phase name -> (start offset ns, duration ns)
+        self.phase_spans: Dict[str, Tuple[int, int]] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a phase of the call (validate, execute, build_result, ...)."""
+        started = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            ended = time.perf_counter_ns()
+            offset = started - self._start_perf_ns
+            previous = self.phase_spans.get(name)
+            if previous is not None:
+                offset, duration = previous[0], previous[1] + (ended - started)
+            else:
+                duration = ended - started
+            self.phase_spans[name] = (offset, duration)
+
+    @property
+    def phases(self) -> Dict[str, float]:
+        """Phase durations in seconds."""
+        return {name: span[1] / 1e9 for name, span in self.phase_spans.items()}
+
+    @property
+    def is_error(self) -> bool:
+        if self.error is not None:
+            return True
+        return bool(getattr(getattr(self.result, "root", None), "isError", False))
+
+    def finish(self, result: Any):
+        """Record the final result and end time."""
+        self.result = result
+        self._end_perf_ns = time.perf_counter_ns()
+
+    @property
+    def duration(self) -> float:
+        """Total call duration in seconds (up to now if not finished)."""
+        end = self._end_perf_ns or time.perf_counter_ns()
+        return (end - self._start_perf_ns) / 1e9
+
+    def to_otlp_spans(self) -> List[Dict[str, Any]]:
+        """Render the call and its phases as OTLP/JSON span dictionaries."""
+        end_offset = (self._end_perf_ns or time.perf_counter_ns()) - self._start_perf_ns
+        attributes = {"mcp.tool": self.tool, **self.attributes}
+        if self.error is not None:
+            attributes["exception.type"] = type(self.error).__name__
+            attributes["exception.message"] = str(self.error)
+
+        spans = [
+            {
+                "traceId": self.trace_id,
+                "spanId": self.span_id,
+                "name": f"tools/call {self.tool}",
+                "kind": SPAN_KIND_SERVER,
+                "startTimeUnixNano": str(self.start_time_ns),
+                "endTimeUnixNano": str(self.start_time_ns + end_offset),
+                "attributes": _otlp_attributes(attributes),
+                "status": {"code": STATUS_ERROR if self.is_error else STATUS_OK},
+            }
+        ]
+        for name, (offset, duration) in self.phase_spans.items():
+            start = self.start_time_ns + offset
+            spans.append(
+                {
+                    "traceId": self.trace_id,
+                    "spanId": os.urandom(8).hex(),
+                    "parentSpanId": self.span_id,
+                    "name": name,
+                    "kind": SPAN_KIND_INTERNAL,
+                    "startTimeUnixNano": str(start),
+                    "endTimeUnixNano": str(start + duration),
+                    "attributes": [],
+                    "status": {"code": STATUS_OK},
+                }
+            )
+        return spans
+
+
+class _DiscardedAttributes(dict):
+    """Attribute mapping that drops writes (nothing will read them)."""
+
+    def __setitem__(self, key: str, value: Any):
+        pass
+
+
+class UntracedCall(ToolCallTrace):
+    """
+    Stand-in for ToolCallTrace when no hook, metrics or span exporter is set.
+
+    Carries only what the call itself uses, skipping the ids, clock reads
+    and per-call dictionaries of a full trace.
+    """
+
+    attributes: Dict[str, Any] = _DiscardedAttributes()
+    _no_phase = nullcontext()
+
+    def __init__(self, tool: str, arguments: Dict[str, Any]):
+        self.tool = tool
+        self.arguments = arguments
+        self.input_data = None
+        self.result_data = None
+        self.error = None
+
+    def phase(self, name: str) -> ContextManager[None]:  # type: ignore[override]
+        return self._no_phase
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    rendered = []
+    for key, value in attributes.items():
+        typed: Dict[str, Any]
+        if isinstance(value, bool):
+            typed = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        rendered.append({"key": key, "value": typed})
+    return rendered
+
+
+def otlp_payload(
+    traces: List[ToolCallTrace], service_name: str = "fastapps"
+) -> Dict[str, Any]:
+    """Wrap traces in an OTLP/JSON ExportTraceServiceRequest body."""
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": _otlp_attributes({"service.name": service_name})
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": "fastapps"},
+                        "spans": [
+                            span for trace in traces for span in trace.to_otlp_spans()
+                        ],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+class SpanExporter(ABC):
+    """Receives a finished ToolCallTrace for every tools/call."""
+
+    @abstractmethod
+    async def export(self, trace: ToolCallTrace):
+        """Export one finished call."""
+
+    async def shutdown(self):  # noqa: B027 - optional hook, no-op by default
+        """Flush and release resources."""
+        return None
+
+
+class BatchSpanExporter(SpanExporter):
+    """
+    Base for exporters that write spans in batches from a background task.
+
+    export() only appends the trace to a bounded in-memory queue, so a
+    tools/call never waits on file or network I/O. A background task
+    flushes the queue every flush_interval seconds, or as soon as
+    batch_size traces are waiting. When max_queue traces are already
+    waiting, new ones are dropped and counted in ``dropped``.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+        max_queue: int = 4096,
+    ):
+        """
+        Args:
+            batch_size: Maximum traces per _export_batch() call
+            flush_interval: Seconds between background flushes
+            max_queue: Maximum traces waiting to be exported
+        """
+        if batch_size <= 0 or max_queue <= 0:
+            raise ValueError("batch_size and max_queue must be positive")
+
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.dropped = 0
+        self._queue: Deque[ToolCallTrace] = deque()
+        self._worker: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    @abstractmethod
+    async def _export_batch(self, traces: List[ToolCallTrace]):
+        """Write one batch of finished calls."""
+
+    async def export(self, trace: ToolCallTrace):
+        if len(self._queue) >= self.max_queue:
+            self.dropped += 1
+            return
+        self._queue.append(trace)
+        wakeup = self._ensure_worker()
+        if len(self._queue) >= self.batch_size:
+            wakeup.set()
+
+    def _ensure_worker(self) -> asyncio.Event:
+        """Start the flush task on the running loop if it isn't running there."""
+        worker = self._worker
+        if (
+            worker is None
+            or worker.done()
+            or worker.get_loop() is not asyncio.get_running_loop()
+            or self._wakeup is None
+        ):
+            self._wakeup = asyncio.Event()
+            self._worker = asyncio.create_task(self._run())
+        return self._wakeup
+
+    async def _run(self):
+        wakeup = self._wakeup
+        try:
+            while True:
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(wakeup.wait(), self.flush_interval)
+                wakeup.clear()
+                await self.flush()
+        except asyncio.CancelledError:
+            # Loop shutting down: write what is still queued
+            await self.flush()
+            raise
+
+    async def flush(self):
+        """Export every queued trace now."""
+        while self._queue:
+            batch = [
+                self._queue.popleft()
+                for _ in range(min(self.batch_size, len(self._queue)))
+            ]
+            try:
+                await self._export_batch(batch)
+            except Exception as e:
+                print(f"Warning: Could not export {len(batch)} tool call spans: {e}")
+
+    async def shutdown(self):
+        worker, self._worker = self._worker, None
+        if worker is not None and not worker.done():
+            if worker.get_loop() is asyncio.get_running_loop():
+                worker.cancel()
+                with suppress(asyncio.CancelledError):
+                    await worker
+        await self.flush()
+
+
+class FileSpanExporter(BatchSpanExporter):
+    """
+    Append one OTLP/JSON ExportTraceServiceRequest per batch to a local file.
+
+    The file is JSON Lines, readable by the OpenTelemetry Collector's
+    ``otlpjsonfile`` receiver or plain ``jq``.
+    """
+
+    def __init__(
+        self, path: Path | str, service_name: str = "fastapps", **batch_options: Any
+    ):
+        super().__init__(**batch_options)
+        self.path = Path(path)
+        self.service_name = service_name
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _write(self, line: str):
+        with self._lock, self.path.open("a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    async def _export_batch(self, traces: List[ToolCallTrace]):
+        line = json.dumps(otlp_payload(traces, self.service_name))
+        await asyncio.to_thread(self._write, line)
+
+
+class OTLPHTTPSpanExporter(BatchSpanExporter):
+    """
+    POST spans as OTLP/JSON to a collector (e.g., http://localhost:4318/v1/traces).
+
+    Calls are queued and sent in batches (one request per batch) from a
+    background task, so exports never delay responses.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        service_name: str = "fastapps",
+        timeout: float = 5.0,
+        **batch_options: Any,
+    ):
+        super().__init__(**batch_options)
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.timeout = timeout
+        self._client: Optional[Any] = None
+
+    async def _export_batch(self, traces: List[ToolCallTrace]):
+        import httpx
+
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+        response = await self._client.post(
+            self.endpoint, json=otlp_payload(traces, self.service_name)
+        )
+        response.raise_for_status()
+
+    async def shutdown(self):
+        await super().shutdown()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -1,11 +1,15 @@
+import hashlib
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Hashable, List, Optional
 
 import mcp.types as types
 from pydantic import BaseModel
 
 from fastapps.builder.compiler import WidgetBuildResult
 
+# Upper bound on memoized locale negotiations per widget
+MAX_NEGOTIATED_LOCALES = 256
+
 
 class UserContext:
     """
@@ -36,7 +40,7 @@ class UserContext:
     @property
     def subject(self) -> Optional[str]:
         """User identifier (sub claim from JWT)"""
-        return self._access_token.subject if self._access_token else None
+        return getattr(self._access_token, "subject", None)
 
     @property
     def client_id(self) -> Optional[str]:
@@ -51,7 +55,7 @@ class UserContext:
     @property
     def claims(self) -> Dict[str, Any]:
         """Full JWT claims"""
-        return self._access_token.claims if self._access_token else {}
+        return getattr(self._access_token, "claims", None) or {}
 
     def has_scope(self, scope: str) -> bool:
         """
@@ -65,6 +69,20 @@ class UserContext:
         """
         return scope in self.scopes
 
+    def _cache_identity(self) -> Optional[str]:
+        """
+        Stable per-user value for result cache keys.
+
+        The subject when the verifier provides one, otherwise a digest of
+        the bearer token, so distinct callers never share an entry.
+        """
+        if self._access_token is None:
+            return None
+        if self.subject:
+            return self.subject
+        token = getattr(self._access_token, "token", None) or ""
+        return "token:" + hashlib.sha256(token.encode()).hexdigest()
+
 
 class ClientContext:
     """
@@ -72,8 +90,9 @@ class ClientContext:
     Contains metadata about the client environment and user.
     """
 
-    def __init__(self, meta: Dict[str, Any]):
+    def __init__(self, meta: Dict[str, Any], resolved_locale: Optional[str] = None):
         self._meta = meta
+        self._resolved_locale = resolved_locale
 
     @property
     def user_agent(self) -> Optional[str]:
@@ -97,6 +116,14 @@ class ClientContext:
         """
         return self._meta.get("openai/locale") or self._meta.get("webplus/i18n")
 
+    @property
+    def resolved_locale(self) -> Optional[str]:
+        """
+        Locale negotiated for this request against the widget's supported_locales.
+        Use this (not widget.resolved_locale) when localizing execute() output.
+        """
+        return self._resolved_locale
+
     @property
     def raw_meta(self) -> Dict[str, Any]:
         """Access to raw _meta dictionary"""
@@ -130,10 +157,38 @@ class BaseWidget(ABC):
     )
     default_locale: str = "en"
 
+    # Result caching (opt-in). When cache_ttl is set, execute() results are
+    # cached per validated input (see get_cache_key) with LRU eviction.
+    cache_ttl: Optional[float] = None  # seconds
+    cache_max_entries: int = 128
+    # Include the caller's identity in the cache key. None (default) varies
+    # by user whenever the call is authenticated, which covers every call to
+    # an @auth_required tool; set False to share results across users.
+    cache_vary_by_user: Optional[bool] = None
+    cache_vary_by_locale: bool = False  # include the resolved locale in the key
+
+    # Execution limits enforced by WidgetMCPServer (None means unlimited).
+    # A timed-out call returns an error immediately; in thread/process mode
+    # the worker can't be interrupted and keeps its concurrency slot until
+    # execute() returns.
+    max_concurrency: Optional[int] = None  # concurrent execute() calls
+    max_queue: Optional[int] = None  # calls waiting for a slot before rejecting
+    timeout: Optional[float] = None  # seconds per execute() call
+
+    # Where execute() runs: "async" (event loop), "thread" (shared thread pool,
+    # for blocking I/O) or "process" (shared process pool, for CPU-bound work;
+    # the widget, input model and result must be picklable)
+    execution_mode: str = "async"
+
     def __init__(self, build_result: WidgetBuildResult):
         self.build_result = build_result
         self.template_uri = f"ui://widget/{self.identifier}.html"
+        # Where the hosted build serves assets (set by WidgetMCPServer from
+        # PUBLIC_URL, matching the BASE_URL the build script used)
+        self.asset_base_url = "/assets"
         self.resolved_locale = self.default_locale
+        # Memoized negotiate_locale results: requested locale -> resolved locale
+        self._negotiated_locales: Dict[Optional[str], str] = {}
 
     @abstractmethod
     async def execute(
@@ -171,6 +226,18 @@ class BaseWidget(ABC):
         Returns:
             Best matching supported locale or default locale
         """
+        try:
+            return self._negotiated_locales[requested_locale]
+        except KeyError:
+            pass
+
+        resolved = self._lookup_locale(requested_locale)
+        if len(self._negotiated_locales) < MAX_NEGOTIATED_LOCALES:
+            self._negotiated_locales[requested_locale] = resolved
+        return resolved
+
+    def _lookup_locale(self, requested_locale: Optional[str]) -> str:
+        """Uncached RFC 4647 lookup used by negotiate_locale."""
         if not requested_locale or not self.supported_locales:
             return self.default_locale
 
@@ -190,12 +257,53 @@ class BaseWidget(ABC):
 
         return self.default_locale
 
+    def get_cache_key(
+        self,
+        input_data: BaseModel,
+        context: Optional[ClientContext] = None,
+        user: Optional[UserContext] = None,
+    ) -> Hashable:
+        """
+        Build the result cache key for a call.
+
+        Override to customize which parts of a call make results distinct.
+
+        Args:
+            input_data: Validated input parameters
+            context: Client context for the call
+            user: User context for the call
+
+        Returns:
+            Hashable key derived from the input and, if declared, user/locale
+        """
+        key: List[Any] = [input_data.model_dump_json()]
+        vary_by_user = self.cache_vary_by_user
+        if vary_by_user is None:
+            vary_by_user = user is not None and user.is_authenticated
+        if vary_by_user:
+            key.append(user._cache_identity() if user else None)
+        if self.cache_vary_by_locale:
+            key.append(context.resolved_locale if context else None)
+        return tuple(key)
+
     def get_input_schema(self) -> Dict[str, Any]:
         """Convert Pydantic model to JSON Schema."""
         return self.input_schema.model_json_schema()
 
-    def get_tool_meta(self) -> Dict[str, Any]:
-        """Tool metadata following MCP specification."""
+    def get_dependency_urls(self) -> List[str]:
+        """URLs of shared assets (e.g. the vendor chunk) the widget HTML loads."""
+        return [
+            f"{self.asset_base_url}/{file}" for file in self.build_result.dependencies
+        ]
+
+    def get_tool_meta(self, locale: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Tool metadata following MCP specification.
+
+        Args:
+            locale: Resolved locale to advertise (defaults to resolved_locale)
+        """
+        locale = locale or self.resolved_locale
         meta = {
             "openai/outputTemplate": self.template_uri,
             "openai/toolInvocation/invoking": self.invoking,
@@ -208,14 +316,25 @@ class BaseWidget(ABC):
         if hasattr(self, "_security_schemes"):
             meta["securitySchemes"] = self._security_schemes
 
+        # Shared chunks the widget loads, so clients can fetch and cache them once
+        dependencies = self.get_dependency_urls()
+        if dependencies:
+            meta["fastapps/dependencies"] = dependencies
+
         # Add locale if widget supports localization
-        if self.resolved_locale:
-            meta["openai/locale"] = self.resolved_locale
+        if locale:
+            meta["openai/locale"] = locale
 
         return meta
 
-    def get_resource_meta(self) -> Dict[str, Any]:
-        """Resource metadata (CSP, border settings, domain, locale)."""
+    def get_resource_meta(self, locale: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Resource metadata (CSP, border settings, domain, locale).
+
+        Args:
+            locale: Resolved locale to advertise (defaults to resolved_locale)
+        """
+        locale = locale or self.resolved_locale
         meta = {}
         if self.widget_csp:
             meta["openai/widgetCSP"] = self.widget_csp
@@ -225,12 +344,22 @@ class BaseWidget(ABC):
             meta["openai/widgetDescription"] = self.widget_description
         if self.widget_domain:
             meta["openai/widgetDomain"] = self.widget_domain
-        if self.resolved_locale:
-            meta["openai/locale"] = self.resolved_locale
+        dependencies = self.get_dependency_urls()
+        if dependencies:
+            meta["fastapps/dependencies"] = dependencies
+        if locale:
+            meta["openai/locale"] = locale
         return meta
 
-    def get_embedded_resource(self) -> types.EmbeddedResource:
-        """Build embedded resource for tool response."""
+    def get_embedded_resource(
+        self, locale: Optional[str] = None
+    ) -> types.EmbeddedResource:
+        """
+        Build embedded resource for tool response.
+
+        Args:
+            locale: Resolved locale to advertise (defaults to resolved_locale)
+        """
         return types.EmbeddedResource(
             type="resource",
             resource=types.TextResourceContents(
@@ -238,6 +367,6 @@ class BaseWidget(ABC):
                 mimeType="text/html+skybridge",
                 text=self.build_result.html,
                 title=self.title,
-                _meta=self.get_resource_meta(),
+                _meta=self.get_resource_meta(locale),
             ),
         )
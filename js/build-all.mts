@@ -5,10 +5,6 @@ import path from "path";
 import fs from "fs";
 import crypto from "crypto";
 
-// Read package.json from current working directory (project root)
-const pkgPath = path.join(process.cwd(), "package.json");
-const pkg = JSON.parse(fs.readFileSync(pkgPath, "utf-8"));
-
 // Auto-detect and import Tailwind CSS if available
 let tailwindcss: any = null;
 try {
@@ -78,12 +74,197 @@ function wrapEntryPlugin(
   };
 }
 
-fs.rmSync(outDir, { recursive: true, force: true });
+// Incremental builds (driven by WidgetBuilder):
+//   WIDGETS=a,b      only build these widgets, keep other outputs
+//   CLEAN=0          keep assets/ instead of wiping it first
+//   MANIFEST_PATH=.. where to write the manifest (default assets/manifest.json)
+const MANIFEST_FILE = "manifest.json";
+const defaultManifestPath = path.join(outDir, MANIFEST_FILE);
+const manifestPath = process.env.MANIFEST_PATH?.trim() || defaultManifestPath;
+const onlyWidgets = (process.env.WIDGETS ?? "")
+  .split(",")
+  .map((w) => w.trim())
+  .filter(Boolean);
+const CLEAN = onlyWidgets.length === 0 && (process.env.CLEAN ?? "1") !== "0";
+
+// Shared vendor chunk (opt-in, hosted mode only):
+//   VENDOR=1           build React (and VENDOR_PACKAGES) once as content-hashed
+//                      ES modules; widgets import them through an import map
+//   VENDOR_PACKAGES=.. extra comma-separated packages to share
+//   VENDOR_ONLY=1      build the vendor chunk and manifest, but no widgets
+const VENDOR = MODE === "hosted" && process.env.VENDOR === "1";
+const VENDOR_ONLY = VENDOR && process.env.VENDOR_ONLY === "1";
+const DEFAULT_VENDOR_PACKAGES = [
+  "react",
+  "react-dom",
+  "react-dom/client",
+  "react/jsx-runtime",
+];
+const vendorPackages = VENDOR
+  ? [
+      ...new Set([
+        ...DEFAULT_VENDOR_PACKAGES,
+        ...(process.env.VENDOR_PACKAGES ?? "")
+          .split(",")
+          .map((p) => p.trim())
+          .filter(Boolean),
+      ]),
+    ]
+  : [];
+
+const widgetNameOf = (file: string) => path.basename(path.dirname(file));
+const allNames = new Set(entries.map(widgetNameOf));
+const buildEntries = VENDOR_ONLY
+  ? []
+  : onlyWidgets.length
+    ? entries.filter((file) => onlyWidgets.includes(widgetNameOf(file)))
+    : entries;
+const rebuilding = new Set(buildEntries.map(widgetNameOf));
+
+type VendorManifest = {
+  packages: string[];
+  imports: Record<string, string>;
+  files: string[];
+};
+type PreviousManifest = {
+  widgets?: Record<string, { html?: string; js?: string; css?: string }>;
+  vendor?: VendorManifest;
+};
+let previousManifest: PreviousManifest = {};
+if (!CLEAN && fs.existsSync(defaultManifestPath)) {
+  try {
+    previousManifest = JSON.parse(fs.readFileSync(defaultManifestPath, "utf-8"));
+  } catch (e) {
+    previousManifest = {};
+  }
+}
+
+if (CLEAN) {
+  fs.rmSync(outDir, { recursive: true, force: true });
+}
 fs.mkdirSync(outDir, { recursive: true });
 
+// Drop previous outputs of widgets being rebuilt or no longer present
+for (const [name, entry] of Object.entries(previousManifest.widgets ?? {})) {
+  if (allNames.has(name) && !rebuilding.has(name)) continue;
+  for (const file of [entry.html, entry.js, entry.css]) {
+    if (!file) continue;
+    for (const suffix of ["", ".gz", ".br"]) {
+      fs.rmSync(path.join(outDir, file + suffix), { force: true });
+    }
+  }
+}
+
+const IDENTIFIER = /^[A-Za-z_$][\w$]*$/;
+
+// Re-export a package's named exports explicitly so CommonJS packages
+// (React) keep their names when bundled as a standalone ES module
+async function vendorEntrySource(pkgName: string): Promise<string> {
+  const mod = await import(pkgName);
+  const fromDefault =
+    mod.default && typeof mod.default === "object" ? Object.keys(mod.default) : [];
+  const names = [...new Set([...Object.keys(mod), ...fromDefault])].filter(
+    (key) => key !== "default" && IDENTIFIER.test(key)
+  );
+  return [
+    `import * as ns from ${JSON.stringify(pkgName)};`,
+    "const m = Object.assign({}, ns, ns.default && typeof ns.default === \"object\" ? ns.default : {});",
+    "export default ns.default ?? ns;",
+    ...names.map((name) => `export const ${name} = m[${JSON.stringify(name)}];`),
+  ].join("\n");
+}
+
+function vendorIsCurrent(vendor?: VendorManifest): vendor is VendorManifest {
+  return (
+    !!vendor &&
+    JSON.stringify(vendor.packages) === JSON.stringify(vendorPackages) &&
+    vendor.files.every((file) => fs.existsSync(path.join(outDir, file)))
+  );
+}
+
+async function buildVendor(): Promise<VendorManifest> {
+  const chunkNameOf = (pkgName: string) => pkgName.replace(/[^A-Za-z0-9]+/g, "-");
+  const packageByChunk = Object.fromEntries(
+    vendorPackages.map((pkgName) => [chunkNameOf(pkgName), pkgName])
+  );
+  const sources = Object.fromEntries(
+    await Promise.all(
+      vendorPackages.map(async (pkgName) => [
+        `\0vendor:${pkgName}`,
+        await vendorEntrySource(pkgName),
+      ])
+    )
+  );
+
+  console.group(`Building shared vendor chunk (${vendorPackages.join(", ")})`);
+  const result = await build({
+    plugins: [
+      {
+        name: "vendor-entries",
+        resolveId(id) {
+          if (id in sources) return id;
+        },
+        load(id) {
+          return sources[id] ?? null;
+        },
+      },
+    ],
+    build: {
+      target: "es2022",
+      outDir,
+      emptyOutDir: false,
+      minify: "esbuild",
+      rollupOptions: {
+        input: Object.fromEntries(
+          vendorPackages.map((pkgName) => [
+            chunkNameOf(pkgName),
+            `\0vendor:${pkgName}`,
+          ])
+        ),
+        output: {
+          format: "es",
+          entryFileNames: "vendor-[name]-[hash].js",
+          chunkFileNames: "vendor-[name]-[hash].js",
+        },
+        preserveEntrySignatures: "strict",
+      },
+    },
+  });
+  console.groupEnd();
+
+  const vendor: VendorManifest = { packages: vendorPackages, imports: {}, files: [] };
+  for (const output of Array.isArray(result) ? result : [result]) {
+    if (!("output" in output)) continue;
+    for (const chunk of output.output) {
+      if (chunk.type !== "chunk") continue;
+      vendor.files.push(chunk.fileName);
+      if (chunk.isEntry) vendor.imports[packageByChunk[chunk.name]] = chunk.fileName;
+    }
+  }
+  vendor.files.sort();
+  return vendor;
+}
+
+let vendorManifest: VendorManifest | undefined;
+if (VENDOR) {
+  vendorManifest = vendorIsCurrent(previousManifest.vendor)
+    ? previousManifest.vendor
+    : await buildVendor();
+}
+// Drop a superseded vendor chunk (package set or versions changed, which
+// also invalidates every widget that referenced it)
+for (const file of previousManifest.vendor?.files ?? []) {
+  if (vendorManifest?.files.includes(file)) continue;
+  for (const suffix of ["", ".gz", ".br"]) {
+    fs.rmSync(path.join(outDir, file + suffix), { force: true });
+  }
+}
+
 const builtNames: string[] = [];
+// Wall-clock Vite build time per widget (ms), recorded in the manifest
+const buildTimes: Record<string, number> = {};
 
-for (const file of entries) {
+for (const file of buildEntries) {
   const name = path.basename(path.dirname(file));
 
   const entryAbs = path.resolve(file);
@@ -148,15 +329,19 @@ for (const file of entries) {
         },
         preserveEntrySignatures: "allow-extension",
         treeshake: true,
+        // Shared packages resolve through the HTML import map
+        external: VENDOR ? (id) => vendorPackages.includes(id) : undefined,
       },
     },
   });
 
   console.group(`Building ${name} (react)`);
+  const buildStarted = performance.now();
   await build(createConfig());
+  buildTimes[name] = Math.round(performance.now() - buildStarted);
   console.groupEnd();
   builtNames.push(name);
-  console.log(`Built ${name}`);
+  console.log(`Built ${name} in ${buildTimes[name]}ms`);
 
   // Ensure CSS file exists (create empty one if not generated)
   const cssFile = path.join(outDir, `${name}.css`);
@@ -166,46 +351,81 @@ for (const file of entries) {
   }
 }
 
-const outputs = fs
-  .readdirSync("assets")
-  .filter((f) => f.endsWith(".js") || f.endsWith(".css"))
-  .map((f) => path.join("assets", f))
-  .filter((p) => fs.existsSync(p));
-
-const renamed = [];
+// Content hash of a file or string (per-file, so unchanged bundles keep
+// their names across builds and can be cached as immutable)
+const HASH_LENGTH = 8;
+// Widget HTML keeps the `<name>-<4 hex>.html` names of earlier builds:
+// server/main.py files generated before the manifest existed find widgets
+// with `(.+)-([0-9a-f]{4})\.html$`. Such short names may repeat across
+// builds, so HTML is left out of the immutable "files" list below.
+const LEGACY_HTML_HASH_LENGTH = 4;
+function contentHash(data: string | Buffer): string {
+  return crypto
+    .createHash("sha256")
+    .update(data)
+    .digest("hex")
+    .slice(0, HASH_LENGTH);
+}
 
-const h = crypto
-  .createHash("sha256")
-  .update(pkg.version, "utf8")
-  .digest("hex")
-  .slice(0, 4);
+type WidgetManifestEntry = {
+  hash: string;
+  html: string;
+  js: string;
+  css: string;
+  buildMs: number;
+  dependencies: string[];
+  // Byte sizes of the html/js/css outputs, so loaders need not stat them
+  sizes: Record<string, number>;
+};
+const widgetManifest: Record<string, WidgetManifestEntry> = {};
 
 console.group("Hashing outputs");
-for (const out of outputs) {
-  const dir = path.dirname(out);
-  const ext = path.extname(out);
-  const base = path.basename(out, ext);
-  const newName = path.join(dir, `${base}-${h}${ext}`);
-
-  fs.renameSync(out, newName);
-  renamed.push({ old: out, neu: newName });
-  console.log(`${out} -> ${newName}`);
+const hashedNames: Record<string, { js: string; css: string }> = {};
+for (const name of builtNames) {
+  const hashed = { js: "", css: "" };
+  for (const ext of ["js", "css"] as const) {
+    const out = path.join(outDir, `${name}.${ext}`);
+    if (!fs.existsSync(out)) continue;
+    const newName = `${name}-${contentHash(fs.readFileSync(out))}.${ext}`;
+    fs.renameSync(out, path.join(outDir, newName));
+    hashed[ext] = newName;
+    console.log(`${out} -> ${path.join(outDir, newName)}`);
+  }
+  hashedNames[name] = hashed;
 }
 console.groupEnd();
 
-console.log("new hash: ", h);
+function writeWidgetHtml(name: string, html: string) {
+  const hash = contentHash(html);
+  const htmlName = `${name}-${hash.slice(0, LEGACY_HTML_HASH_LENGTH)}.html`;
+  const htmlPath = path.join(outDir, htmlName);
+  fs.writeFileSync(htmlPath, html, { encoding: "utf8" });
+  const outputs = { html: htmlName, ...hashedNames[name] };
+  widgetManifest[name] = {
+    hash,
+    ...outputs,
+    buildMs: buildTimes[name] ?? 0,
+    dependencies: vendorManifest?.files ?? [],
+    sizes: Object.fromEntries(
+      Object.entries(outputs)
+        .filter(([, file]) => file && fs.existsSync(path.join(outDir, file)))
+        .map(([key, file]) => [key, fs.statSync(path.join(outDir, file)).size])
+    ),
+  };
+  return htmlPath;
+}
 
 if (MODE === "inline") {
   for (const name of builtNames) {
     const dir = outDir;
-    const htmlPath = path.join(dir, `${name}-${h}.html`);
-    const cssPath = path.join(dir, `${name}-${h}.css`);
-    const jsPath = path.join(dir, `${name}-${h}.js`);
+    const { js: jsName, css: cssName } = hashedNames[name];
+    const cssPath = cssName ? path.join(dir, cssName) : "";
+    const jsPath = jsName ? path.join(dir, jsName) : "";
 
-    const css = fs.existsSync(cssPath)
+    const css = cssPath && fs.existsSync(cssPath)
       ? fs.readFileSync(cssPath, { encoding: "utf8" })
       : "";
-    const js = fs.existsSync(jsPath)
+    const js = jsPath && fs.existsSync(jsPath)
       ? fs.readFileSync(jsPath, { encoding: "utf8" })
       : "";
 
@@ -221,7 +441,7 @@ if (MODE === "inline") {
       "</body>",
       "</html>",
     ].join("\n");
-    fs.writeFileSync(htmlPath, html, { encoding: "utf8" });
+    const htmlPath = writeWidgetHtml(name, html);
     console.log(`${htmlPath} (generated inline)`);
   }
 } else {
@@ -232,21 +452,65 @@ if (MODE === "inline") {
   const baseUrlRaw = baseUrlCandidate || defaultBaseUrl;
   const normalizedBaseUrl = baseUrlRaw.replace(/\/+$/, "");
   console.log(`Using BASE_URL: ${normalizedBaseUrl}`);
+  // Import map + preloads for the shared vendor chunk (VENDOR=1)
+  let vendorHead = "";
+  if (vendorManifest) {
+    const imports = Object.fromEntries(
+      Object.entries(vendorManifest.imports).map(([pkgName, file]) => [
+        pkgName,
+        `${normalizedBaseUrl}/${file}`,
+      ])
+    );
+    vendorHead =
+      `  <script type="importmap">${JSON.stringify({ imports })}</script>\n` +
+      vendorManifest.files
+        .map((file) => `  <link rel="modulepreload" href="${normalizedBaseUrl}/${file}">\n`)
+        .join("");
+  }
   for (const name of builtNames) {
-    const dir = outDir;
-    const htmlPath = path.join(dir, `${name}-${h}.html`);
+    const { js: jsName, css: cssName } = hashedNames[name];
     const html = `<!doctype html>
 <html>
 <head>
-  <script type="module" src="${normalizedBaseUrl}/${name}-${h}.js"></script>
-  <link rel="stylesheet" href="${normalizedBaseUrl}/${name}-${h}.css">
+${vendorHead}  <script type="module" src="${normalizedBaseUrl}/${jsName}"></script>
+  <link rel="stylesheet" href="${normalizedBaseUrl}/${cssName}">
 </head>
 <body>
   <div id="${name}-root"></div>
 </body>
 </html>
 `;
-    fs.writeFileSync(htmlPath, html, { encoding: "utf8" });
+    const htmlPath = writeWidgetHtml(name, html);
     console.log(`${htmlPath} (generated)`);
   }
 }
+
+// Manifest: widget -> hashed files, plus every content-hashed js/css output
+// (safe to serve with immutable cache headers). Widgets that were not
+// rebuilt keep their previous entries.
+const keptWidgets = Object.fromEntries(
+  Object.entries(previousManifest.widgets ?? {}).filter(
+    ([name]) => allNames.has(name) && !rebuilding.has(name)
+  )
+);
+const manifest = {
+  version: 1,
+  mode: MODE,
+  widgets: { ...keptWidgets, ...widgetManifest },
+  ...(vendorManifest ? { vendor: vendorManifest } : {}),
+  files: fs
+    .readdirSync(outDir)
+    .filter(
+      (f) =>
+        f !== MANIFEST_FILE &&
+        !f.endsWith(".gz") &&
+        !f.endsWith(".br") &&
+        !f.endsWith(".html")
+    )
+    .sort(),
+};
+fs.mkdirSync(path.dirname(manifestPath), { recursive: true });
+fs.writeFileSync(manifestPath, JSON.stringify(manifest, null, 2) + "\n", {
+  encoding: "utf8",
+});
+console.log(`${manifestPath} (written)`);
@@ -0,0 +1,360 @@
+"""Tests for the /assets route."""
+
+import asyncio
+import gc
+import json
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+import pytest
+from starlette.requests import ClientDisconnect
+from starlette.testclient import TestClient
+
+from fastapps import WidgetMCPServer
+from fastapps.builder.compress import precompress_assets
+
+from .test_server import make_widget
+
+
+class CountingServer(ThreadingHTTPServer):
+    """Asset server that counts accepted connections."""
+
+    connections = 0
+
+    def process_request(self, request, client_address):
+        self.connections += 1
+        super().process_request(request, client_address)
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        # Minimal single-range support ("bytes=start-end")
+        byte_range = self.headers.get("Range")
+        if not byte_range:
+            return super().do_GET()
+        path = Path(self.translate_path(self.path))
+        content = path.read_bytes()
+        start, end = (int(x) for x in byte_range.split("=")[1].split("-"))
+        body = content[start : end + 1]
+        self.send_response(206)
+        self.send_header("Content-Type", "text/javascript")
+        self.send_header("Content-Range", f"bytes {start}-{end}/{len(content)}")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def upstream(tmp_path):
+    (tmp_path / "app-abcd.js").write_text("console.log('hi');")
+    server = CountingServer(
+        ("127.0.0.1", 0), partial(QuietHandler, directory=str(tmp_path))
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_asset_proxy_reuses_pooled_connection(upstream):
+    """Sequential asset requests share one keep-alive upstream connection."""
+    server = WidgetMCPServer("test", [make_widget("alpha")])
+    host, port = upstream.server_address
+    app = server.get_app(asset_upstream_url=f"http://{host}:{port}")
+
+    with TestClient(app) as client:
+        responses = [client.get("/assets/app-abcd.js") for _ in range(3)]
+
+    assert [r.status_code for r in responses] == [200, 200, 200]
+    assert responses[0].text == "console.log('hi');"
+    assert upstream.connections == 1
+
+
+def test_asset_proxy_streams_large_bodies(upstream, tmp_path):
+    """Bodies larger than a single chunk arrive intact."""
+    content = b"x" * (1024 * 1024 + 7)
+    (tmp_path / "big.js").write_bytes(content)
+    server = WidgetMCPServer("test", [make_widget("alpha")])
+    host, port = upstream.server_address
+    app = server.get_app(asset_upstream_url=f"http://{host}:{port}")
+
+    with TestClient(app) as client:
+        response = client.get("/assets/big.js")
+
+    assert response.status_code == 200
+    assert response.content == content
+    assert response.headers["content-length"] == str(len(content))
+
+
+def http_scope(path: str) -> dict:
+    """ASGI scope for a plain GET request (ASGI spec 2.4)."""
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"testserver")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("testserver", 80),
+    }
+
+
+def test_asset_proxy_releases_upstream_on_client_disconnect(
+    upstream, tmp_path, monkeypatch
+):
+    """A client that disconnects mid-body still closes the upstream response."""
+    (tmp_path / "big.js").write_bytes(b"x" * (1024 * 1024))
+    server = WidgetMCPServer("test", [make_widget("alpha")])
+    host, port = upstream.server_address
+    app = server.get_app(asset_upstream_url=f"http://{host}:{port}")
+
+    closed = []
+    original_aclose = httpx.Response.aclose
+
+    async def aclose(self):
+        closed.append(self.url.path)
+        await original_aclose(self)
+
+    monkeypatch.setattr(httpx.Response, "aclose", aclose)
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            raise OSError("client went away")
+
+    async def request():
+        with pytest.raises(ClientDisconnect):
+            await app(http_scope("/assets/big.js"), receive, send)
+        for _ in range(3):
+            gc.collect()
+            await asyncio.sleep(0)
+        return list(closed)
+
+    assert asyncio.run(request()) == ["/big.js"]
+
+
+def test_asset_proxy_latency_covers_the_streamed_body(upstream):
+    """Proxy latency is recorded when the body finishes, not at headers."""
+    server = WidgetMCPServer("test", [make_widget("alpha")], enable_metrics=True)
+    host, port = upstream.server_address
+    app = server.get_app(asset_upstream_url=f"http://{host}:{port}")
+    histogram = server.metrics.asset_proxy_seconds
+    counts_at = {}
+
+    async def receive():
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            counts_at["start"] = histogram.count("200")
+
+    async def request():
+        await app(http_scope("/assets/app-abcd.js"), receive, send)
+
+    asyncio.run(request())
+
+    assert counts_at["start"] == 0
+    assert histogram.count("200") == 1
+
+
+def test_asset_proxy_passes_through_304_and_206(upstream):
+    """Conditional and range requests are forwarded and answered upstream."""
+    server = WidgetMCPServer("test", [make_widget("alpha")])
+    host, port = upstream.server_address
+    app = server.get_app(asset_upstream_url=f"http://{host}:{port}")
+
+    with TestClient(app) as client:
+        first = client.get("/assets/app-abcd.js")
+        not_modified = client.get(
+            "/assets/app-abcd.js",
+            headers={"If-Modified-Since": first.headers["last-modified"]},
+        )
+        partial_content = client.get(
+            "/assets/app-abcd.js", headers={"Range": "bytes=0-6"}
+        )
+
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert partial_content.status_code == 206
+    assert partial_content.content == b"console"
+    assert partial_content.headers["content-range"] == "bytes 0-6/18"
+
+
+def test_asset_proxy_reports_unavailable_upstream():
+    """A missing asset server yields 502 rather than an exception."""
+    server = WidgetMCPServer("test", [make_widget("alpha")])
+    app = server.get_app(asset_upstream_url="http://127.0.0.1:9")
+
+    with TestClient(app) as client:
+        response = client.get("/assets/app-abcd.js")
+
+    assert response.status_code == 502
+
+
+def test_in_process_assets_with_etags(tmp_path):
+    """assets_dir serves files from memory with ETag revalidation."""
+    (tmp_path / "app-abcd.js").write_text("console.log('hi');")
+    server = WidgetMCPServer("test", [make_widget("alpha")])
+    app = server.get_app(assets_dir=tmp_path)
+
+    with TestClient(app) as client:
+        first = client.get("/assets/app-abcd.js")
+        revalidated = client.get(
+            "/assets/app-abcd.js", headers={"If-None-Match": first.headers["etag"]}
+        )
+        (tmp_path / "app-abcd.js").write_text("console.log('rebuilt');")
+        rebuilt = client.get(
+            "/assets/app-abcd.js", headers={"If-None-Match": first.headers["etag"]}
+        )
+        missing = client.get("/assets/missing.js")
+        escaped = client.get("/assets/..%2Fsecret.txt")
+
+    assert first.status_code == 200
+    assert first.text == "console.log('hi');"
+    assert first.headers["content-type"].startswith("text/javascript")
+    assert first.headers["access-control-allow-origin"] == "*"
+    assert revalidated.status_code == 304
+    assert rebuilt.status_code == 200
+    assert rebuilt.text == "console.log('rebuilt');"
+    assert rebuilt.headers["etag"] != first.headers["etag"]
+    assert missing.status_code == 404
+    assert escaped.status_code == 404
+    assert server.assets.stats()["files"] == 1
+
+
+def test_in_process_assets_large_files_use_file_response(tmp_path):
+    """Files above the memory threshold are streamed from disk with ranges."""
+    content = b"x" * 2048
+    (tmp_path / "big.bin").write_bytes(content)
+    server = WidgetMCPServer("test", [make_widget("alpha")])
+    app = server.get_app(assets_dir=tmp_path)
+    server.assets.max_cached_file_size = 1024
+
+    with TestClient(app) as client:
+        full = client.get("/assets/big.bin")
+        ranged = client.get("/assets/big.bin", headers={"Range": "bytes=0-9"})
+        revalidated = client.get(
+            "/assets/big.bin", headers={"If-None-Match": full.headers["etag"]}
+        )
+
+    assert full.content == content
+    assert ranged.status_code == 206
+    assert ranged.content == b"x" * 10
+    assert revalidated.status_code == 304
+    assert server.assets.stats()["files"] == 0
+
+
+def test_in_process_assets_negotiate_precompressed_variants(tmp_path):
+    """Accept-Encoding selects the precompressed sibling written at build time."""
+    bundle = b"console.log('widget');\n" * 200
+    (tmp_path / "app-abcd.js").write_bytes(bundle)
+    precompress_assets(tmp_path)
+    server = WidgetMCPServer("test", [make_widget("alpha")])
+    app = server.get_app(assets_dir=tmp_path)
+
+    with TestClient(app) as client:
+        compressed = client.get(
+            "/assets/app-abcd.js", headers={"Accept-Encoding": "gzip"}
+        )
+        identity = client.get(
+            "/assets/app-abcd.js", headers={"Accept-Encoding": "identity"}
+        )
+
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["vary"] == "Accept-Encoding"
+    assert compressed.headers["content-type"].startswith("text/javascript")
+    assert int(compressed.headers["content-length"]) < len(bundle)
+    assert compressed.content == bundle  # decoded by the client
+    assert "content-encoding" not in identity.headers
+    assert identity.content == bundle
+
+
+def test_explicit_zero_quality_wins_over_wildcard(tmp_path):
+    """A coding refused with q=0 is not served because "*" accepts the rest."""
+    bundle = b"console.log('widget');\n" * 200
+    (tmp_path / "app-abcd.js").write_bytes(bundle)
+    precompress_assets(tmp_path)
+    server = WidgetMCPServer("test", [make_widget("alpha")])
+    app = server.get_app(assets_dir=tmp_path)
+
+    with TestClient(app) as client:
+        no_brotli = client.get(
+            "/assets/app-abcd.js", headers={"Accept-Encoding": "*, br;q=0"}
+        )
+        refused = client.get(
+            "/assets/app-abcd.js",
+            headers={"Accept-Encoding": "br;q=0, gzip;q=0, *"},
+        )
+
+    assert no_brotli.headers["content-encoding"] == "gzip"
+    assert no_brotli.content == bundle
+    assert "content-encoding" not in refused.headers
+    assert refused.content == bundle
+
+
+def test_in_process_assets_immutable_for_hashed_files(tmp_path):
+    """Files listed in the build manifest get long-lived immutable caching."""
+    (tmp_path / "app-0f0f0f0f.js").write_text("console.log('hi');")
+    (tmp_path / "notes.txt").write_text("not hashed")
+    (tmp_path / "manifest.json").write_text(
+        json.dumps({"version": 1, "widgets": {}, "files": ["app-0f0f0f0f.js"]})
+    )
+    server = WidgetMCPServer("test", [make_widget("alpha")])
+    app = server.get_app(assets_dir=tmp_path)
+
+    with TestClient(app) as client:
+        hashed = client.get("/assets/app-0f0f0f0f.js")
+        unhashed = client.get("/assets/notes.txt")
+
+    assert hashed.headers["cache-control"] == "public, max-age=31536000, immutable"
+    assert unhashed.headers["cache-control"] == "no-cache"
+
+
+def test_asset_proxy_serves_precompressed_variants(tmp_path):
+    """The default proxy path negotiates .gz siblings with the asset server."""
+    from fastapps.cli.commands.dev import make_asset_server
+
+    source = "console.log('compressible');\n" * 50
+    (tmp_path / "app-abcd.js").write_text(source)
+    precompress_assets(tmp_path)
+    asset_server = make_asset_server(tmp_path, port=0)
+    threading.Thread(target=asset_server.serve_forever, daemon=True).start()
+
+    try:
+        server = WidgetMCPServer("test", [make_widget("alpha")])
+        host, port = asset_server.server_address[:2]
+        app = server.get_app(asset_upstream_url=f"http://127.0.0.1:{port}")
+        with TestClient(app) as client:
+            compressed = client.get(
+                "/assets/app-abcd.js", headers={"Accept-Encoding": "gzip"}
+            )
+            plain = client.get(
+                "/assets/app-abcd.js", headers={"Accept-Encoding": "identity"}
+            )
+    finally:
+        asset_server.shutdown()
+        asset_server.server_close()
+
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["content-type"].startswith("text/javascript")
+    assert compressed.headers["vary"] == "Accept-Encoding"
+    assert int(compressed.headers["content-length"]) < len(source)
+    assert compressed.text == source
+    assert "content-encoding" not in plain.headers
+    assert plain.text == source
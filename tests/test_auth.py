@@ -0,0 +1,270 @@
+"""Tests for JWT verification against a local stub issuer."""
+
+import asyncio
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from jwt.algorithms import ECAlgorithm, RSAAlgorithm
+
+from fastapps import JWTVerifier
+from fastapps.auth.jwks import JWKSCache, JWKSError
+
+
+def make_rsa_key(kid: str):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = RSAAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+    jwk.update({"kid": kid, "use": "sig", "alg": "RS256"})
+    return private_key, jwk
+
+
+class StubIssuer(ThreadingHTTPServer):
+    """OpenID provider serving discovery and JWKS documents."""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubIssuerHandler)
+        self.url = f"http://127.0.0.1:{self.server_address[1]}"
+        self.hits = Counter()
+        self.jwks = {"keys": []}
+        self.fail = False
+
+    def sign(self, private_key, kid, algorithm="RS256", **claims):
+        payload = {
+            "iss": self.url,
+            "sub": "user-1",
+            "iat": int(time.time()),
+            "exp": int(time.time()) + 3600,
+            "azp": "client-1",
+            "scope": "user",
+            **claims,
+        }
+        return jwt.encode(
+            payload, private_key, algorithm=algorithm, headers={"kid": kid}
+        )
+
+
+class StubIssuerHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        issuer = self.server
+        issuer.hits[self.path] += 1
+        if issuer.fail:
+            self.send_error(503)
+            return
+        if self.path == "/.well-known/openid-configuration":
+            body = {"issuer": issuer.url, "jwks_uri": f"{issuer.url}/jwks.json"}
+        elif self.path == "/jwks.json":
+            body = issuer.jwks
+        else:
+            self.send_error(404)
+            return
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def issuer():
+    server = StubIssuer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_verifier_caches_jwks_across_tokens(issuer):
+    """Signing keys are fetched once and reused for every token."""
+    private_key, jwk = make_rsa_key("k1")
+    issuer.jwks = {"keys": [jwk]}
+    verifier = JWTVerifier(issuer_url=issuer.url, required_scopes=["user"])
+
+    async def verify_all():
+        tokens = [issuer.sign(private_key, "k1", azp=f"client-{i}") for i in range(5)]
+        return [await verifier.verify_token(token) for token in tokens]
+
+    results = asyncio.run(verify_all())
+
+    assert [r.client_id for r in results] == [f"client-{i}" for i in range(5)]
+    assert results[0].scopes == ["user"]
+    assert issuer.hits["/jwks.json"] == 1
+
+
+def test_unknown_kid_refetch_is_rate_limited(issuer):
+    """Key rotation is picked up, but unknown kids refetch at most once per interval."""
+    old_key, old_jwk = make_rsa_key("old")
+    new_key, new_jwk = make_rsa_key("new")
+    issuer.jwks = {"keys": [old_jwk]}
+    cache = JWKSCache(f"{issuer.url}/jwks.json", refetch_interval=60)
+
+    async def scenario():
+        await cache.get_signing_key("old")
+        # Rotation: the new kid triggers one refetch
+        issuer.jwks = {"keys": [old_jwk, new_jwk]}
+        await cache.get_signing_key("new")
+        # Forged kids do not reach the issuer again within the interval
+        for _ in range(3):
+            with pytest.raises(JWKSError):
+                await cache.get_signing_key("forged")
+
+    asyncio.run(scenario())
+    assert issuer.hits["/jwks.json"] == 2
+
+
+def test_cold_start_fetch_failures_are_not_repeated(issuer):
+    """Concurrent requests against a failing JWKS endpoint make one fetch."""
+    issuer.fail = True
+    cache = JWKSCache(f"{issuer.url}/jwks.json", refetch_interval=60)
+
+    async def scenario():
+        results = await asyncio.gather(
+            *(cache.get_signing_key("k1") for _ in range(5)),
+            return_exceptions=True,
+        )
+        # Later requests within the interval fail fast as well
+        with pytest.raises(JWKSError, match="recently failed"):
+            await cache.get_signing_key("k1")
+        return results
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, JWKSError) for result in results)
+    assert issuer.hits["/jwks.json"] == 1
+
+
+def test_stale_keys_served_while_refreshing(issuer):
+    """Expired keys are served immediately and refreshed in the background."""
+    _, jwk = make_rsa_key("k1")
+    issuer.jwks = {"keys": [jwk]}
+    cache = JWKSCache(f"{issuer.url}/jwks.json", ttl=0)
+
+    async def scenario():
+        await cache.get_signing_key("k1")
+        issuer.fail = True
+        # Stale and the issuer is down: the cached key is still returned
+        key = await cache.get_signing_key("k1")
+        await cache._refresh_task
+        return key
+
+    key = asyncio.run(scenario())
+    assert key.key_id == "k1"
+    assert issuer.hits["/jwks.json"] == 2
+
+
+def test_verified_tokens_are_cached_until_exp(issuer, monkeypatch):
+    """Repeat tokens skip signature verification; expired entries are dropped."""
+    private_key, jwk = make_rsa_key("k1")
+    issuer.jwks = {"keys": [jwk]}
+    verifier = JWTVerifier(issuer_url=issuer.url)
+    decodes = []
+    decode = verifier._decode
+    monkeypatch.setattr(
+        verifier, "_decode", lambda *args: decodes.append(1) or decode(*args)
+    )
+    token = issuer.sign(private_key, "k1")
+    short_lived = issuer.sign(private_key, "k1", exp=int(time.time()) + 1)
+
+    async def verify(t):
+        return await verifier.verify_token(t)
+
+    first = asyncio.run(verify(token))
+    assert asyncio.run(verify(token)) is first
+    assert len(decodes) == 1
+
+    asyncio.run(verify(short_lived))
+    exp = jwt.decode(short_lived, options={"verify_signature": False})["exp"]
+    monkeypatch.setattr(time, "time", lambda: exp + 1)
+    assert verifier.token_cache.get(short_lived) is None
+
+    stats = verifier.get_token_cache_stats()
+    assert stats["hits"] == 1
+    assert stats["saved_seconds"] >= 0
+    assert 0 < stats["hit_rate"] < 1
+
+
+def test_token_cache_metrics(issuer):
+    """Token cache counters are exported when metrics are enabled."""
+    from fastapps import WidgetMCPServer
+
+    server = WidgetMCPServer("test", [], enable_metrics=True)
+    assert server.get_token_cache_stats() == {}
+    server.token_verifier_instance = JWTVerifier(issuer_url=issuer.url)
+
+    assert server.get_token_cache_stats()["size"] == 0
+    assert "fastapps_auth_token_cache_hits_total 0" in server.metrics.render()
+
+
+def test_offloaded_es256_verification(issuer, monkeypatch):
+    """ES256 tokens verify in the bounded verification pool when enabled."""
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    jwk = ECAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+    jwk.update({"kid": "ec1", "use": "sig", "alg": "ES256"})
+    issuer.jwks = {"keys": [jwk]}
+    verifier = JWTVerifier(
+        issuer_url=issuer.url, algorithms=["ES256"], verify_workers=2
+    )
+    threads = []
+    decode = verifier._decode
+    monkeypatch.setattr(
+        verifier,
+        "_decode",
+        lambda *args: threads.append(threading.current_thread().name) or decode(*args),
+    )
+
+    token = issuer.sign(private_key, "ec1", algorithm="ES256")
+    assert asyncio.run(verifier.verify_token(token)) is not None
+    assert threads[0].startswith("fastapps-jwt")
+
+    # RS256 is no longer accepted once the algorithm list is restricted
+    rsa_key, rsa_jwk = make_rsa_key("k1")
+    issuer.jwks = {"keys": [jwk, rsa_jwk]}
+    assert asyncio.run(verifier.verify_token(issuer.sign(rsa_key, "k1"))) is None
+    verifier.close()
+
+    with pytest.raises(ValueError):
+        JWTVerifier(issuer_url=issuer.url, algorithms=["none"])
+
+
+def test_discovery_is_lazy(issuer):
+    """Creating a verifier does not contact the issuer; start() warms it."""
+    private_key, jwk = make_rsa_key("k1")
+    issuer.jwks = {"keys": [jwk]}
+
+    verifier = JWTVerifier(issuer_url=issuer.url)
+    assert sum(issuer.hits.values()) == 0
+
+    asyncio.run(verifier.start())
+    assert issuer.hits["/.well-known/openid-configuration"] == 1
+    assert issuer.hits["/jwks.json"] == 1
+
+    # An unreachable issuer fails verification instead of construction
+    unreachable = JWTVerifier(issuer_url="http://127.0.0.1:9", jwks_refetch_interval=60)
+    token = issuer.sign(private_key, "k1")
+    assert asyncio.run(unreachable.verify_token(token)) is None
+    assert unreachable._discovery_failed_at is not None
+
+
+def test_restart_uses_disk_cache(issuer, tmp_path):
+    """A restarted verifier reuses cached discovery and keys while the issuer is down."""
+    private_key, jwk = make_rsa_key("k1")
+    issuer.jwks = {"keys": [jwk]}
+    token = issuer.sign(private_key, "k1")
+
+    first = JWTVerifier(issuer_url=issuer.url, cache_dir=tmp_path)
+    assert asyncio.run(first.verify_token(token)) is not None
+    assert len(list(tmp_path.glob("*.json"))) == 2
+
+    issuer.fail = True
+    hits = sum(issuer.hits.values())
+    restarted = JWTVerifier(issuer_url=issuer.url, cache_dir=tmp_path)
+    assert asyncio.run(restarted.verify_token(token)) is not None
+    assert sum(issuer.hits.values()) == hits
@@ -0,0 +1,287 @@
+"""Tests for build output post-processing."""
+
+import gzip
+import json
+import re
+from pathlib import Path
+
+from fastapps import WidgetBuilder, WidgetBuildResult
+from fastapps.builder import compiler
+from fastapps.builder.compress import BROTLI_AVAILABLE, precompress_assets
+from fastapps.builder.manifest import read_manifest
+
+
+def test_precompress_assets_writes_smaller_siblings(tmp_path):
+    """Text outputs get .gz (and .br) siblings; tiny and binary files don't."""
+    bundle = b"console.log('widget');\n" * 200
+    (tmp_path / "app-abcd.js").write_bytes(bundle)
+    (tmp_path / "tiny.css").write_bytes(b"a{}")
+    (tmp_path / "logo.png").write_bytes(b"\x89PNG" + b"\x00" * 1000)
+
+    written = precompress_assets(tmp_path)
+
+    expected = ["app-abcd.js.gz"] + (["app-abcd.js.br"] if BROTLI_AVAILABLE else [])
+    assert written == {"app-abcd.js": expected}
+    assert gzip.decompress((tmp_path / "app-abcd.js.gz").read_bytes()) == bundle
+    assert not (tmp_path / "tiny.css.gz").exists()
+    assert not (tmp_path / "logo.png.gz").exists()
+
+
+def test_precompress_assets_skips_current_variants(tmp_path):
+    """Variants newer than their source are left untouched."""
+    (tmp_path / "app-abcd.js").write_bytes(b"x" * 1000)
+    precompress_assets(tmp_path)
+    variant = tmp_path / "app-abcd.js.gz"
+    mtime = variant.stat().st_mtime_ns
+
+    precompress_assets(tmp_path)
+
+    assert variant.stat().st_mtime_ns == mtime
+
+
+def write_manifest(assets_dir, widgets, files):
+    (assets_dir / "manifest.json").write_text(
+        json.dumps({"version": 1, "mode": "hosted", "widgets": widgets, "files": files})
+    )
+
+
+def test_parse_build_results_reads_manifest(tmp_path):
+    """Widgets come from manifest.json when present."""
+    assets_dir = tmp_path / "assets"
+    assets_dir.mkdir()
+    (assets_dir / "alpha-1234abcd.html").write_text("<div>alpha</div>")
+    # Stray HTML not in the manifest is ignored
+    (assets_dir / "stale-abcd.html").write_text("<div>stale</div>")
+    write_manifest(
+        assets_dir,
+        {
+            "alpha": {
+                "hash": "1234abcd",
+                "html": "alpha-1234abcd.html",
+                "js": "alpha-0f0f0f0f.js",
+                "css": "alpha-a0a0a0a0.css",
+                "sizes": {"html": 16},
+            }
+        },
+        ["alpha-0f0f0f0f.js", "alpha-1234abcd.html", "alpha-a0a0a0a0.css"],
+    )
+
+    results = WidgetBuilder(tmp_path).load_build_results()
+
+    assert list(results) == ["alpha"]
+    assert results["alpha"].hash == "1234abcd"
+    assert results["alpha"].sizes == {"html": 16}
+    # HTML is read on first access only
+    assert not results["alpha"].loaded
+    assert results["alpha"].html == "<div>alpha</div>"
+    assert results["alpha"].loaded
+
+
+def test_parse_build_results_without_manifest(tmp_path):
+    """Older builds fall back to parsing HTML file names."""
+    assets_dir = tmp_path / "assets"
+    assets_dir.mkdir()
+    (assets_dir / "alpha-abcd.html").write_text("<div>alpha</div>")
+
+    results = WidgetBuilder(tmp_path).load_build_results()
+
+    assert results["alpha"].hash == "abcd"
+
+
+def make_project(root):
+    """Minimal project with two widgets and a build script stub."""
+    (root / "package.json").write_text("{}")
+    (root / "build-all.mts").write_text("// build script")
+    for name in ("alpha", "beta"):
+        widget_dir = root / "widgets" / name
+        widget_dir.mkdir(parents=True)
+        (widget_dir / "index.jsx").write_text(f"export default () => '{name}';")
+    return root
+
+
+def fake_build_script(calls):
+    """Stand-in for `npx tsx build-all.mts` honouring its environment."""
+
+    def run(cmd, cwd, check, env):
+        call = {"widgets": env.get("WIDGETS"), "clean": env.get("CLEAN")}
+        calls.append(call)
+        tag = f"{len(calls):08x}"
+        assets_dir = Path(cwd) / "assets"
+        assets_dir.mkdir(exist_ok=True)
+        manifest = read_manifest(assets_dir) or {"version": 1, "widgets": {}}
+        widgets_dir = Path(cwd) / "widgets"
+        names = (
+            env["WIDGETS"].split(",")
+            if env.get("WIDGETS")
+            else sorted(p.name for p in widgets_dir.iterdir() if p.is_dir())
+        )
+        dependencies = []
+        if env.get("VENDOR") == "1":
+            call["vendor_only"] = env.get("VENDOR_ONLY") == "1"
+            (assets_dir / "vendor-react-0000abcd.js").write_text("export {}")
+            dependencies = ["vendor-react-0000abcd.js"]
+            manifest["vendor"] = {
+                "packages": ["react"],
+                "imports": {"react": dependencies[0]},
+                "files": dependencies,
+            }
+            if env.get("VENDOR_ONLY") == "1":
+                names = []
+        for name in names:
+            source = (Path(cwd) / "widgets" / name / "index.jsx").read_text()
+            previous = manifest["widgets"].get(name)
+            if previous:
+                (assets_dir / previous["html"]).unlink(missing_ok=True)
+            # Like build-all.mts: legacy 4-hex HTML names, 8-hex js/css
+            html_name = f"{name}-{tag[-4:]}.html"
+            (assets_dir / html_name).write_text(source)
+            (assets_dir / f"{name}-{tag}.js").write_text(source)
+            manifest["widgets"][name] = {
+                "hash": tag,
+                "html": html_name,
+                "js": f"{name}-{tag}.js",
+                "buildMs": 1500,
+                "dependencies": dependencies,
+            }
+        manifest["files"] = sorted(
+            p.name for p in assets_dir.iterdir() if p.suffix == ".js"
+        )
+        manifest_path = env.get("MANIFEST_PATH") or assets_dir / "manifest.json"
+        Path(manifest_path).write_text(json.dumps(manifest))
+
+    return run
+
+
+def test_build_all_rebuilds_only_changed_widgets(tmp_path, monkeypatch):
+    """Unchanged widgets are skipped; --force rebuilds everything."""
+    project = make_project(tmp_path)
+    calls = []
+    monkeypatch.setattr(compiler.subprocess, "run", fake_build_script(calls))
+    builder = WidgetBuilder(project)
+
+    first = builder.build_all()
+    assert set(first) == {"alpha", "beta"}
+    assert calls[-1] == {"widgets": None, "clean": "1"}
+
+    # Nothing changed: the build script is not run at all
+    builder.build_all()
+    assert len(calls) == 1
+
+    # One widget changed: only it is rebuilt, the other keeps its output
+    (project / "widgets" / "beta" / "index.jsx").write_text("export default 1;")
+    results = builder.build_all()
+    assert calls[-1] == {"widgets": "beta", "clean": "0"}
+    assert results["alpha"].html == first["alpha"].html
+    assert results["beta"].html == "export default 1;"
+
+    # Shared inputs (global CSS) invalidate every widget
+    (project / "widgets" / "index.css").write_text("body{}")
+    builder.build_all()
+    assert calls[-1] == {"widgets": None, "clean": "1"}
+
+    builder.build_all(force=True)
+    assert len(calls) == 4
+    assert calls[-1] == {"widgets": None, "clean": "1"}
+
+
+def test_build_all_refreshes_outdated_build_script(tmp_path, monkeypatch):
+    """A build-all.mts copied by an older FastApps is replaced before building."""
+    project = make_project(tmp_path)
+    calls = []
+    monkeypatch.setattr(compiler.subprocess, "run", fake_build_script(calls))
+    builder = WidgetBuilder(project)
+    framework_script = builder.framework_dir / "build-all.mts"
+
+    builder.build_all()
+    assert (project / "build-all.mts").read_bytes() == framework_script.read_bytes()
+
+    # A stale copy would ignore WIDGETS/CLEAN and wipe the other outputs
+    (project / "widgets" / "beta" / "index.jsx").write_text("export default 1;")
+    (project / "build-all.mts").write_text("// build script from 1.0")
+    builder.build_all()
+    assert (project / "build-all.mts").read_bytes() == framework_script.read_bytes()
+    assert calls[-1] == {"widgets": "beta", "clean": "0"}
+
+
+def test_build_all_parallel_partitions(tmp_path, monkeypatch):
+    """jobs splits widgets across processes and merges their manifests."""
+    project = make_project(tmp_path)
+    widget_dir = project / "widgets" / "gamma"
+    widget_dir.mkdir()
+    (widget_dir / "index.jsx").write_text("export default () => 'gamma';" * 10)
+    calls = []
+    monkeypatch.setattr(compiler.subprocess, "run", fake_build_script(calls))
+    builder = WidgetBuilder(project)
+
+    results = builder.build_all(jobs=2)
+
+    assert set(results) == {"alpha", "beta", "gamma"}
+    partitions = sorted(call["widgets"] for call in calls)
+    assert partitions == ["alpha,beta", "gamma"]
+    assert all(call["clean"] == "0" for call in calls)
+    manifest = read_manifest(project / "assets")
+    assert set(manifest["widgets"]) == {"alpha", "beta", "gamma"}
+    assert builder.last_build_times == {"alpha": 1.5, "beta": 1.5, "gamma": 1.5}
+    assert not (project / ".fastapps" / "manifests").exists()
+
+
+def test_build_all_shared_vendor(tmp_path, monkeypatch):
+    """The vendor chunk is built once and recorded as a widget dependency."""
+    project = make_project(tmp_path)
+    calls = []
+    monkeypatch.setattr(compiler.subprocess, "run", fake_build_script(calls))
+    builder = WidgetBuilder(project)
+
+    results = builder.build_all(shared_vendor=True, jobs=2)
+    # Vendor-only pass first, then one process per partition
+    assert [call.get("vendor_only") for call in calls] == [True, False, False]
+    assert results["alpha"].dependencies == ["vendor-react-0000abcd.js"]
+    manifest = read_manifest(project / "assets")
+    assert manifest["vendor"]["imports"] == {"react": "vendor-react-0000abcd.js"}
+
+    # A missing dependency makes its widgets stale
+    (project / "assets" / "vendor-react-0000abcd.js").unlink()
+    builder.build_all(shared_vendor=True)
+    assert calls[-1]["widgets"] is None and len(calls) == 4
+
+    # Turning the vendor chunk off invalidates every widget
+    builder.build_all()
+    assert len(calls) == 5
+    assert builder.load_build_results()["alpha"].dependencies == []
+
+
+def legacy_fetch_build_results(assets_dir):
+    """fetch_build_results() as generated into server/main.py before manifests."""
+    results = {}
+    for html_file in assets_dir.glob("*-*.html"):
+        match = re.match(r"(.+)-([0-9a-f]{4})\.html$", html_file.name)
+        if match:
+            name, hash_val = match.groups()
+            results[name] = WidgetBuildResult(
+                name=name, hash=hash_val, html=html_file.read_text()
+            )
+    return results
+
+
+def test_old_project_templates_load_new_build_output(tmp_path, monkeypatch):
+    """Projects whose main.py predates the manifest still find every widget."""
+    project = make_project(tmp_path)
+    monkeypatch.setattr(compiler.subprocess, "run", fake_build_script([]))
+    builder = WidgetBuilder(project)
+    builder.build_all()
+    (project / "widgets" / "beta" / "index.jsx").write_text("export default 2;")
+    results = builder.build_all()
+
+    legacy = legacy_fetch_build_results(project / "assets")
+
+    assert set(legacy) == {"alpha", "beta"}
+    assert {name: r.html for name, r in legacy.items()} == {
+        name: r.html for name, r in results.items()
+    }
+    # The real build script names widget HTML the same way
+    script = (Path(compiler.__file__).parent / "build-all.mts").read_text()
+    assert "const LEGACY_HTML_HASH_LENGTH = 4;" in script
+    assert "${name}-${hash.slice(0, LEGACY_HTML_HASH_LENGTH)}.html" in script
+    # Short HTML names are never marked immutable
+    manifest = read_manifest(project / "assets")
+    assert not any(name.endswith(".html") for name in manifest["files"])
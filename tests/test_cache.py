@@ -0,0 +1,263 @@
+"""Tests for widget result caching."""
+
+import asyncio
+
+import pytest
+
+from fastapps import WidgetMCPServer
+from fastapps.core.cache import MemoryCacheBackend, ResultCache, SQLiteCacheBackend
+
+from .test_server import call_tool, make_widget
+
+
+def test_result_cache_hits_and_lru_eviction():
+    """Least recently used entries are evicted once max_entries is reached."""
+    cache = ResultCache(ttl=60, max_entries=2)
+    calls = []
+
+    async def compute(value):
+        calls.append(value)
+        return value * 2
+
+    async def run():
+        assert await cache.get_or_compute("a", lambda: compute(1)) == 2
+        assert await cache.get_or_compute("b", lambda: compute(2)) == 4
+        assert await cache.get_or_compute("a", lambda: compute(1)) == 2
+        await cache.get_or_compute("c", lambda: compute(3))
+        assert await cache.get_or_compute("b", lambda: compute(2)) == 4
+
+    asyncio.run(run())
+
+    assert calls == [1, 2, 3, 2]
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 4
+    assert stats["evictions"] == 2
+    assert stats["size"] == 2
+
+
+def test_memory_backend_expires_entries(monkeypatch):
+    """Entries older than the TTL are reported missing."""
+    now = [1000.0]
+    monkeypatch.setattr("fastapps.core.cache.time.monotonic", lambda: now[0])
+    backend = MemoryCacheBackend()
+
+    async def run():
+        await backend.set("key", "old", ttl=10)
+        first = await backend.get("key")
+        now[0] += 11
+        return first, await backend.get("key")
+
+    assert asyncio.run(run()) == ((True, "old"), (False, None))
+
+
+def test_sqlite_backend_shared_between_instances(tmp_path):
+    """Two backends on the same file (e.g., two workers) share results."""
+    path = tmp_path / "cache.db"
+    writer = ResultCache(ttl=60, backend=SQLiteCacheBackend(path), namespace="w")
+    reader = ResultCache(ttl=60, backend=SQLiteCacheBackend(path), namespace="w")
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return {"items": [1, 2, 3]}
+
+    async def run():
+        await writer.get_or_compute(("query",), compute)
+        return await reader.get_or_compute(("query",), compute)
+
+    assert asyncio.run(run()) == {"items": [1, 2, 3]}
+    assert calls == [1]
+    assert reader.stats()["hits"] == 1
+
+
+def test_sqlite_backend_evicts_least_recently_used(tmp_path):
+    """The on-disk backend keeps at most max_entries values."""
+    backend = SQLiteCacheBackend(tmp_path / "cache.db", max_entries=2)
+
+    async def run():
+        await backend.set("a", 1, ttl=60)
+        await backend.set("b", 2, ttl=60)
+        await backend.get("a")
+        await backend.set("c", 3, ttl=60)
+        return [await backend.get(key) for key in ("a", "b", "c")]
+
+    assert asyncio.run(run()) == [(True, 1), (False, None), (True, 3)]
+    assert backend.stats() == {"size": 2, "evictions": 1}
+
+
+def test_result_cache_single_flight():
+    """Concurrent identical lookups share one computation."""
+    cache = ResultCache(ttl=60)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"value": 42}
+
+    async def run():
+        return await asyncio.gather(
+            *(cache.get_or_compute("key", compute) for _ in range(5))
+        )
+
+    results = asyncio.run(run())
+
+    assert calls == [1]
+    assert results == [{"value": 42}] * 5
+    assert cache.stats()["coalesced"] == 4
+
+
+def test_result_cache_hands_out_independent_copies():
+    """Mutating a returned result never leaks into other callers or hits."""
+    cache = ResultCache(ttl=60)
+
+    async def compute():
+        await asyncio.sleep(0.01)
+        return {"items": [1, 2]}
+
+    async def mutate():
+        result = await cache.get_or_compute("key", compute)
+        result["items"].append("mutated")
+        return result
+
+    async def run():
+        first, second = await asyncio.gather(mutate(), mutate())
+        hit = await cache.get_or_compute("key", compute)
+        hit["items"].clear()
+        return first, second, await cache.get_or_compute("key", compute)
+
+    first, second, later = asyncio.run(run())
+
+    assert first == second == {"items": [1, 2, "mutated"]}
+    assert first is not second
+    assert later == {"items": [1, 2]}
+
+
+def test_result_cache_does_not_cache_errors():
+    """Failures propagate to waiters and are retried on the next call."""
+    cache = ResultCache(ttl=60)
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("backend down")
+        return "ok"
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await cache.get_or_compute("key", flaky)
+        return await cache.get_or_compute("key", flaky)
+
+    assert asyncio.run(run()) == "ok"
+    assert len(attempts) == 2
+
+
+def test_server_caches_widget_results():
+    """Widgets declaring cache_ttl reuse results for identical input."""
+    widget = make_widget("cached", cache_ttl=60)
+    executions = []
+    original_execute = widget.execute
+
+    async def counting_execute(input_data, context=None, user=None):
+        executions.append(input_data.message)
+        return await original_execute(input_data, context, user)
+
+    widget.execute = counting_execute
+    server = WidgetMCPServer("test", [widget])
+
+    call_tool(server, "cached", message="a")
+    call_tool(server, "cached", message="a")
+    call_tool(server, "cached", message="b")
+
+    assert executions == ["a", "b"]
+    assert server.get_cache_stats()["cached"]["hits"] == 1
+
+
+def test_cancelled_leader_does_not_cancel_waiters():
+    """Cancelling the call that started a computation leaves waiters running."""
+    cache = ResultCache(ttl=60)
+
+    async def compute():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def run():
+        leader = asyncio.create_task(cache.get_or_compute("key", compute))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(cache.get_or_compute("key", compute))
+        await asyncio.sleep(0)
+        leader.cancel()
+        result = await follower
+        return leader.cancelled(), result
+
+    assert asyncio.run(run()) == (True, "done")
+    assert cache.stats()["size"] == 1
+
+
+def test_authenticated_results_vary_by_user_by_default():
+    """Results of authenticated calls are never shared between callers."""
+    from mcp.server.auth.provider import AccessToken
+
+    from fastapps import UserContext
+
+    widget = make_widget("private")
+    data = widget.input_schema(message="hi")
+
+    def key(token=None):
+        user = UserContext(
+            AccessToken(token=token, client_id="app", scopes=[]) if token else None
+        )
+        return widget.get_cache_key(data, user=user)
+
+    assert key("token-a") != key("token-b")
+    assert key("token-a") == key("token-a")
+    assert key() == (data.model_dump_json(),)
+
+    type(widget).cache_vary_by_user = False
+    assert key("token-a") == key("token-b")
+
+
+def test_backend_failures_fall_through_to_execution(tmp_path, capsys):
+    """Unserializable results and broken backends never fail the call."""
+    import datetime
+
+    cache = ResultCache(ttl=60, backend=SQLiteCacheBackend(tmp_path / "cache.db"))
+
+    async def compute():
+        return {"day": datetime.date(2024, 1, 1)}
+
+    async def run():
+        first = await cache.get_or_compute("key", compute)
+        cache.backend.close()
+        # Reads from the closed database fail too; execute() still runs
+        return first, await cache.get_or_compute("key", compute)
+
+    first, second = asyncio.run(run())
+
+    assert first == second == {"day": datetime.date(2024, 1, 1)}
+    assert cache.stats()["misses"] == 2
+    # write, read, write, then backend stats
+    assert cache.errors == 4
+    assert capsys.readouterr().out.count("Warning: result cache") == 1
+
+
+def test_sqlite_backend_batches_access_time_updates(tmp_path):
+    """Cache hits buffer their LRU touch instead of writing per read."""
+    backend = SQLiteCacheBackend(tmp_path / "cache.db", touch_batch_size=3)
+    statements = []
+
+    async def run():
+        for key in "abc":
+            await backend.set(key, 1, ttl=60)
+        backend._conn.set_trace_callback(statements.append)
+        for key in "ab":
+            await backend.get(key)
+        writes_before_flush = [s for s in statements if s.startswith("UPDATE")]
+        await backend.get("c")
+        return writes_before_flush
+
+    assert asyncio.run(run()) == []
+    # One batch covering every buffered key
+    assert len([s for s in statements if s.startswith("UPDATE")]) == 3
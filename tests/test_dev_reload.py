@@ -0,0 +1,127 @@
+"""Tests for `fastapps dev` watch mode."""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from fastapps import WidgetMCPServer
+from fastapps.builder import compiler
+from fastapps.builder.watcher import SourceWatcher
+from fastapps.cli.commands.dev import DevReloader
+
+from .test_builder import fake_build_script, make_project
+
+TOOL_SOURCE = """
+from pydantic import BaseModel
+from fastapps import BaseWidget
+
+
+class Input(BaseModel):
+    pass
+
+
+class {cls}(BaseWidget):
+    identifier = "{name}"
+    title = "{title}"
+    input_schema = Input
+
+    async def execute(self, input_data, context=None, user=None):
+        return {{}}
+"""
+
+
+def write_tool(project, name, title):
+    path = project / "server" / "tools" / f"{name}_tool.py"
+    path.write_text(
+        TOOL_SOURCE.format(cls=name.title() + "Tool", name=name, title=title)
+    )
+    # Same-second rewrites must still look changed to importlib
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+    return path
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    project = make_project(tmp_path)
+    tools_dir = project / "server" / "tools"
+    tools_dir.mkdir(parents=True)
+    (project / "server" / "__init__.py").write_text("")
+    (tools_dir / "__init__.py").write_text("")
+    monkeypatch.syspath_prepend(str(project))
+    yield project
+    for name in [m for m in sys.modules if m == "server" or m.startswith("server.")]:
+        del sys.modules[name]
+
+
+def test_source_watcher_reports_changes(tmp_path):
+    """Added, modified and removed files are reported once per change."""
+    source = tmp_path / "widgets" / "alpha" / "index.jsx"
+    source.parent.mkdir(parents=True)
+    source.write_text("a")
+    (tmp_path / "widgets" / "node_modules").mkdir()
+    watcher = SourceWatcher([tmp_path / "widgets"], debounce=0)
+
+    assert watcher.poll() == set()
+    source.write_text("ab")
+    added = tmp_path / "widgets" / "alpha" / "util.js"
+    added.write_text("x")
+    (tmp_path / "widgets" / "node_modules" / "dep.js").write_text("ignored")
+    assert watcher.poll() == {source, added}
+    assert watcher.poll() == set()
+
+    added.unlink()
+    assert watcher.poll() == {added}
+
+
+def test_dev_reloader_swaps_widgets(project, monkeypatch):
+    """Widget edits rebuild only that widget; tool edits reload the module."""
+    calls = []
+    monkeypatch.setattr(compiler.subprocess, "run", fake_build_script(calls))
+    compiler.WidgetBuilder(project).build_all()
+    write_tool(project, "alpha", "Alpha v1")
+
+    server = WidgetMCPServer(name="test", widgets=[])
+    reloader = DevReloader(SimpleNamespace(server=server), project)
+
+    # Tool module added: widgets load from the existing build, no rebuild
+    reloader({project / "server" / "tools" / "alpha_tool.py"})
+    assert len(calls) == 1
+    assert server.widgets_by_id["alpha"].title == "Alpha v1"
+
+    # Widget source changed: incremental build, new HTML is served
+    source = project / "widgets" / "alpha" / "index.jsx"
+    source.write_text("export default () => 'alpha v2';")
+    reloader({source})
+    assert calls[-1]["widgets"] == "alpha"
+    assert "alpha v2" in server.widgets_by_id["alpha"].build_result.html
+
+    # Tool module changed: the class is re-imported
+    reloader({write_tool(project, "alpha", "Alpha v2")})
+    assert server.widgets_by_id["alpha"].title == "Alpha v2"
+
+
+def test_dev_reloader_survives_unexpected_build_errors(project, monkeypatch, capsys):
+    """Any rebuild failure is reported and the previous widgets stay served."""
+    calls = []
+    monkeypatch.setattr(compiler.subprocess, "run", fake_build_script(calls))
+    compiler.WidgetBuilder(project).build_all()
+    write_tool(project, "alpha", "Alpha")
+
+    server = WidgetMCPServer(name="test", widgets=[])
+    reloader = DevReloader(SimpleNamespace(server=server), project)
+    reloader({project / "server" / "tools" / "alpha_tool.py"})
+    previous = server.widgets_by_id["alpha"]
+
+    def missing_node(*args, **kwargs):
+        raise FileNotFoundError("npx not found")
+
+    monkeypatch.setattr(compiler.subprocess, "run", missing_node)
+    source = project / "widgets" / "alpha" / "index.jsx"
+    source.write_text("export default () => 'alpha v2';")
+    reloader({source})
+
+    assert "Build failed, keeping previous widgets" in capsys.readouterr().out
+    assert server.widgets_by_id["alpha"] is previous
@@ -0,0 +1,99 @@
+"""Tests for running widgets in thread and process pools."""
+
+import asyncio
+import os
+import time
+
+import pytest
+from pydantic import BaseModel
+
+from fastapps import BaseWidget, WidgetBuildResult, WidgetMCPServer
+
+from .test_server import call_tool, make_widget
+
+
+class PidInput(BaseModel):
+    pass
+
+
+class PidWidget(BaseWidget):
+    identifier = "pid"
+    title = "Pid"
+    input_schema = PidInput
+    execution_mode = "process"
+
+    async def execute(self, input_data, context=None, user=None):
+        return {"pid": os.getpid()}
+
+
+def test_thread_mode_does_not_block_event_loop():
+    """Blocking code in a thread-mode widget leaves the event loop responsive."""
+
+    class BlockingWidget(BaseWidget):
+        identifier = "blocking"
+        title = "Blocking"
+        input_schema = PidInput
+        execution_mode = "thread"
+
+        async def execute(self, input_data, context=None, user=None):
+            time.sleep(0.1)
+            return {"done": True}
+
+    widget = BlockingWidget(WidgetBuildResult(name="blocking", hash="abcd", html=""))
+    server = WidgetMCPServer("test", [widget], thread_pool_size=2)
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.01)
+
+    async def run():
+        result, _ = await asyncio.gather(
+            server.executors.run(widget, PidInput(), None, None), ticker()
+        )
+        return result
+
+    try:
+        assert asyncio.run(run()) == {"done": True}
+    finally:
+        server.close()
+
+    assert len(ticks) == 5
+    assert ticks[-1] - ticks[0] < 0.09
+
+
+def test_process_mode_runs_in_worker_process():
+    """Process-mode widgets execute in the shared process pool."""
+    widget = PidWidget(WidgetBuildResult(name="pid", hash="abcd", html=""))
+    server = WidgetMCPServer("test", [widget], process_pool_size=1)
+
+    try:
+        result = call_tool(server, "pid")
+    finally:
+        server.close()
+
+    assert result.isError is False
+    assert result.structuredContent["pid"] != os.getpid()
+
+
+def test_invalid_execution_mode():
+    """Unknown execution modes are rejected when the server is built."""
+    with pytest.raises(ValueError):
+        WidgetMCPServer("test", [make_widget("bad", execution_mode="gpu")])
+
+
+def test_process_mode_does_not_pickle_widget_html():
+    """Only the widget's state, not its build output, is sent to workers."""
+    import pickle
+
+    from fastapps.core.executors import _process_payload
+
+    html = "<script>" + "x" * 2_000_000 + "</script>"
+    widget = PidWidget(WidgetBuildResult(name="pid", hash="abcd", html=html))
+
+    payload = _process_payload(widget)
+
+    assert len(pickle.dumps(payload)) < 10_000
+    assert payload.build_result.hash == "abcd"
+    assert widget.build_result.html == html
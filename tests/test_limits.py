@@ -0,0 +1,113 @@
+"""Tests for per-widget execution limits."""
+
+import asyncio
+
+import pytest
+
+from fastapps import WidgetMCPServer
+from fastapps.core.limits import (
+    ExecutionLimiter,
+    WidgetSaturatedError,
+    WidgetTimeoutError,
+)
+
+from .test_server import call_tool, make_widget
+
+
+def test_limiter_bounds_concurrency_and_rejects_when_queue_full():
+    """Calls beyond max_concurrency queue; beyond max_queue they are rejected."""
+    limiter = ExecutionLimiter(max_concurrency=1, max_queue=1)
+    running = []
+
+    async def slow():
+        running.append(1)
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def run():
+        return await asyncio.gather(
+            *(limiter.run(slow) for _ in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+
+    assert results[:2] == ["done", "done"]
+    assert isinstance(results[2], WidgetSaturatedError)
+    stats = limiter.stats()
+    assert stats["rejections"] == 1
+    assert stats["max_queue_depth"] == 1
+    assert stats["queued"] == 0
+    assert stats["active"] == 0
+
+
+def test_limiter_times_out():
+    """Executions longer than the timeout raise WidgetTimeoutError."""
+    limiter = ExecutionLimiter(timeout=0.01)
+
+    async def hang():
+        await asyncio.sleep(1)
+
+    with pytest.raises(WidgetTimeoutError):
+        asyncio.run(limiter.run(hang))
+    assert limiter.stats()["timeouts"] == 1
+
+
+def test_server_returns_structured_timeout_error():
+    """A timed-out widget produces a structured, retryable tool error."""
+    widget = make_widget("slow", timeout=0.01)
+
+    async def hang(input_data, context=None, user=None):
+        await asyncio.sleep(1)
+
+    widget.execute = hang
+    server = WidgetMCPServer("test", [widget])
+
+    result = call_tool(server, "slow")
+
+    assert result.isError is True
+    assert result.structuredContent["error"]["code"] == "timeout"
+    assert result.structuredContent["error"]["retryable"] is True
+    assert server.get_execution_stats()["slow"]["timeouts"] == 1
+
+
+def test_timed_out_thread_work_keeps_its_slot():
+    """A timed-out worker thread still counts against max_concurrency."""
+    import threading
+    import time
+
+    from fastapps.core.executors import WidgetExecutors
+
+    widget = make_widget("blocking", execution_mode="thread")
+    release = threading.Event()
+    started = []
+
+    def blocking_execute(input_data, context=None, user=None):
+        started.append(time.monotonic())
+        release.wait(1)
+        return {"done": True}
+
+    widget.execute = blocking_execute
+    executors = WidgetExecutors(thread_workers=4)
+    limiter = ExecutionLimiter(max_concurrency=1, timeout=0.02)
+
+    def dispatch():
+        return executors.run(widget, widget.input_schema(), None, None)
+
+    async def run():
+        with pytest.raises(WidgetTimeoutError):
+            await limiter.run(dispatch)
+        # The first worker is still running, so the slot is still taken
+        assert limiter.stats()["active"] == 1
+        second = asyncio.create_task(limiter.run(dispatch))
+        await asyncio.sleep(0.05)
+        assert len(started) == 1
+        release.set()
+        assert await second == {"done": True}
+
+    try:
+        asyncio.run(run())
+    finally:
+        executors.shutdown()
+
+    assert len(started) == 2
+    assert limiter.stats()["active"] == 0
@@ -0,0 +1,93 @@
+"""Tests for the Prometheus-style metrics endpoint."""
+
+import asyncio
+
+from starlette.testclient import TestClient
+
+from fastapps import WidgetMCPServer
+from fastapps.core.metrics import Histogram, ServerMetrics, TimedTokenVerifier
+
+from .test_server import call_tool, make_widget
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Bucket counts are cumulative and end with +Inf."""
+    histogram = Histogram("latency_seconds", "Latency.", ["phase"], buckets=(0.1, 1))
+    histogram.observe(0.05, "execute")
+    histogram.observe(0.5, "execute")
+    histogram.observe(5, "execute")
+
+    lines = histogram.render()
+
+    assert 'latency_seconds_bucket{phase="execute",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{phase="execute",le="1"} 2' in lines
+    assert 'latency_seconds_bucket{phase="execute",le="+Inf"} 3' in lines
+    assert 'latency_seconds_count{phase="execute"} 3' in lines
+
+
+def test_tool_calls_are_recorded():
+    """Calls, errors, phases and response sizes are recorded per widget."""
+    server = WidgetMCPServer("test", [make_widget("alpha")], enable_metrics=True)
+
+    call_tool(server, "alpha", message="hi")
+    call_tool(server, "alpha", message=["not", "a", "string"])
+
+    metrics = server.metrics
+    assert metrics.tool_calls.value("alpha") == 2
+    assert metrics.tool_errors.value("alpha", "error") == 1
+    assert metrics.tool_phase_seconds.count("alpha", "validate") == 2
+    assert metrics.tool_phase_seconds.count("alpha", "execute") == 1
+    assert metrics.tool_response_bytes.count("alpha") == 2
+    assert metrics.tool_phase_seconds.count("alpha", "build_result") == 1
+
+
+def test_metrics_endpoint():
+    """get_app() serves /metrics only when metrics are enabled."""
+    server = WidgetMCPServer(
+        "test", [make_widget("alpha", cache_ttl=60)], enable_metrics=True
+    )
+    call_tool(server, "alpha")
+
+    response = TestClient(server.get_app()).get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'fastapps_tool_calls_total{widget="alpha"} 1' in response.text
+    assert 'fastapps_cache_misses_total{widget="alpha"} 1' in response.text
+    assert "# TYPE fastapps_cache_misses_total counter" in response.text
+
+    disabled = WidgetMCPServer("test", [make_widget("alpha")])
+    assert TestClient(disabled.get_app()).get("/metrics").status_code == 404
+
+
+def test_timed_token_verifier_records_latency():
+    """Wrapped verifiers record latency labelled by outcome."""
+
+    class StubVerifier:
+        async def verify_token(self, token):
+            return None if token == "bad" else object()
+
+    metrics = ServerMetrics()
+    verifier = TimedTokenVerifier(StubVerifier(), metrics)
+
+    asyncio.run(verifier.verify_token("good"))
+    asyncio.run(verifier.verify_token("bad"))
+
+    assert metrics.auth_verify_seconds.count("valid") == 1
+    assert metrics.auth_verify_seconds.count("invalid") == 1
+
+
+def test_response_size_is_estimated_without_reserializing():
+    """The estimate tracks the real response size using snapshot sizes."""
+    html = "<div>" + "x" * 50_000 + "</div>"
+    server = WidgetMCPServer(
+        "test", [make_widget("alpha", html=html)], enable_metrics=True
+    )
+    traces = []
+    server.add_hook("on_response", traces.append)
+
+    result = call_tool(server, "alpha", message="hi")
+
+    actual = len(result.model_dump_json(by_alias=True, exclude_none=True))
+    estimate = traces[0].attributes["mcp.response_bytes"]
+    assert 0.95 * actual < estimate <= actual
@@ -0,0 +1,332 @@
+"""Tests for WidgetMCPServer request handlers."""
+
+import asyncio
+
+import pytest
+from mcp import types
+from pydantic import BaseModel
+
+from fastapps import BaseWidget, WidgetBuildResult, WidgetMCPServer
+
+
+class EchoInput(BaseModel):
+    message: str = "hello"
+
+
+def make_widget(identifier: str, html: str = "<div></div>", **attrs) -> BaseWidget:
+    """Create a simple echo widget instance for testing."""
+
+    class EchoWidget(BaseWidget):
+        input_schema = EchoInput
+
+        async def execute(self, input_data, context=None, user=None):
+            return {"message": input_data.message, "locale": context.resolved_locale}
+
+    for name, value in attrs.items():
+        setattr(EchoWidget, name, value)
+    EchoWidget.identifier = identifier
+    EchoWidget.title = identifier.title()
+    return EchoWidget(WidgetBuildResult(name=identifier, hash="abcd", html=html))
+
+
+def call_handler(server: WidgetMCPServer, request):
+    """Invoke the registered low-level handler for a request."""
+    handler = server.mcp._mcp_server.request_handlers[type(request)]
+    return asyncio.run(handler(request)).root
+
+
+def list_tools(server: WidgetMCPServer) -> types.ListToolsResult:
+    return call_handler(server, types.ListToolsRequest(method="tools/list"))
+
+
+def test_list_tools_is_cached():
+    """Repeated tools/list calls should reuse the precomputed result."""
+    server = WidgetMCPServer("test", [make_widget("alpha"), make_widget("beta")])
+
+    first = list_tools(server)
+    second = list_tools(server)
+
+    assert first is second
+    assert [tool.name for tool in first.tools] == ["alpha", "beta"]
+    assert first.tools[0].inputSchema["properties"]["message"]["type"] == "string"
+
+
+def test_set_widgets_rebuilds_tool_list():
+    """Replacing widgets should invalidate the cached tool list."""
+    server = WidgetMCPServer("test", [make_widget("alpha")])
+    before = list_tools(server)
+
+    server.set_widgets([make_widget("alpha"), make_widget("gamma")])
+    after = list_tools(server)
+
+    assert after is not before
+    assert [tool.name for tool in after.tools] == ["alpha", "gamma"]
+    assert "gamma" in server.widgets_by_id
+
+
+def test_read_resource_serves_snapshot():
+    """resources/read should return the precomputed snapshot for a widget."""
+    server = WidgetMCPServer("test", [make_widget("alpha", html="<p>alpha</p>")])
+    request = types.ReadResourceRequest(
+        method="resources/read",
+        params=types.ReadResourceRequestParams(uri="ui://widget/alpha.html"),
+    )
+
+    first = call_handler(server, request)
+    second = call_handler(server, request)
+
+    assert first is second
+    assert first.contents[0].text == "<p>alpha</p>"
+
+    snapshot = server.get_resource_snapshot("ui://widget/alpha.html")
+    assert snapshot.etag.startswith('"')
+    assert snapshot.contents.text is snapshot.embedded["resource"]["text"]
+
+
+def test_read_resource_unknown_uri():
+    """Unknown URIs should return an empty result with an error."""
+    server = WidgetMCPServer("test", [make_widget("alpha")])
+    request = types.ReadResourceRequest(
+        method="resources/read",
+        params=types.ReadResourceRequestParams(uri="ui://widget/missing.html"),
+    )
+
+    result = call_handler(server, request)
+
+    assert result.contents == []
+    assert "Unknown resource" in result.meta["error"]
+
+
+def test_resource_listings_and_memory_usage():
+    """Listings are built without HTML; reads build sized snapshots."""
+    html = "<div>" + "x" * 4096 + "</div>"
+    server = WidgetMCPServer("test", [make_widget("alpha", html=html)])
+
+    resources = call_handler(
+        server, types.ListResourcesRequest(method="resources/list")
+    )
+    templates = call_handler(
+        server,
+        types.ListResourceTemplatesRequest(method="resources/templates/list"),
+    )
+
+    assert [str(r.uri) for r in resources.resources] == ["ui://widget/alpha.html"]
+    assert templates.resourceTemplates[0].uriTemplate == "ui://widget/alpha.html"
+    assert server.resource_memory_usage() == {}
+
+    call_handler(
+        server,
+        types.ReadResourceRequest(
+            method="resources/read",
+            params=types.ReadResourceRequestParams(uri="ui://widget/alpha.html"),
+        ),
+    )
+    usage = server.resource_memory_usage()["ui://widget/alpha.html"]
+    assert usage["html"] > len(html)
+    assert usage["variants"] == 1
+
+
+def call_tool(server: WidgetMCPServer, name: str, _meta=None, **arguments):
+    request = types.CallToolRequest(
+        method="tools/call",
+        params=types.CallToolRequestParams(name=name, arguments=arguments, _meta=_meta),
+    )
+    return call_handler(server, request)
+
+
+def test_listings_advertise_shared_vendor_chunk(monkeypatch):
+    """Shared build assets are advertised in tool/resource _meta and the CSP."""
+    monkeypatch.setenv("PUBLIC_URL", "https://demo.example.com")
+    widget = make_widget("alpha")
+    widget.build_result.dependencies = ["vendor-react-1a2b3c4d.js"]
+    server = WidgetMCPServer("test", [widget])
+
+    tool = list_tools(server).tools[0]
+    resource = call_handler(
+        server, types.ListResourcesRequest(method="resources/list")
+    ).resources[0]
+
+    vendor_url = "https://demo.example.com/assets/vendor-react-1a2b3c4d.js"
+    assert tool.meta["fastapps/dependencies"] == [vendor_url]
+    assert resource.meta["fastapps/dependencies"] == [vendor_url]
+    csp = resource.meta["openai/widgetCSP"]
+    assert "https://demo.example.com" in csp["resource_domains"]
+
+
+def test_call_tool_embeds_cached_widget_resource():
+    """Default response mode should embed the pre-dumped widget resource."""
+    server = WidgetMCPServer("test", [make_widget("alpha", html="<p>alpha</p>")])
+
+    first = call_tool(server, "alpha", message="hi")
+    second = call_tool(server, "alpha", message="again")
+
+    assert first.structuredContent == {"message": "hi", "locale": "en"}
+    embedded = first.meta["openai.com/widget"]
+    assert embedded["resource"]["text"] == "<p>alpha</p>"
+    assert embedded is second.meta["openai.com/widget"]
+
+
+def test_call_tool_reference_mode_omits_html():
+    """Reference mode should only point at the output template."""
+    server = WidgetMCPServer(
+        "test",
+        [make_widget("alpha", html="<p>alpha</p>")],
+        widget_response_mode="reference",
+    )
+
+    result = call_tool(server, "alpha", message="hi")
+
+    assert "openai.com/widget" not in result.meta
+    assert result.meta["openai/outputTemplate"] == "ui://widget/alpha.html"
+
+
+def test_set_widgets_from_another_thread_during_a_call():
+    """A call spanning a reload finishes against the widgets it started with."""
+
+    class SlowWidget(BaseWidget):
+        identifier = "slow"
+        title = "Slow"
+        input_schema = EchoInput
+        max_concurrency = 1
+        cache_ttl = 60
+
+        async def execute(self, input_data, context=None, user=None):
+            await asyncio.to_thread(
+                server.set_widgets, [make_widget("alpha", html="<p>new</p>")]
+            )
+            return {"message": input_data.message}
+
+    slow = SlowWidget(WidgetBuildResult(name="slow", hash="abcd", html="<p>old</p>"))
+    server = WidgetMCPServer("test", [slow])
+
+    result = call_tool(server, "slow", message="hi")
+
+    assert not result.isError
+    assert result.meta["openai.com/widget"]["resource"]["text"] == "<p>old</p>"
+    # Nothing built for the old widgets leaks into the new generation
+    assert server.resource_memory_usage() == {}
+    assert server.get_cache_stats() == {}
+    assert server.get_auth_policy("slow") is None
+    assert [tool.name for tool in list_tools(server).tools] == ["alpha"]
+    assert call_tool(server, "slow").isError
+
+
+def test_invalid_widget_response_mode():
+    """Unknown response modes should be rejected at construction."""
+    with pytest.raises(ValueError):
+        WidgetMCPServer("test", [], widget_response_mode="inline")
+
+
+def test_call_tool_resolves_locale_per_request():
+    """Locale is negotiated per request without touching the shared widget."""
+    widget = make_widget("alpha", supported_locales=["en", "fr-FR"])
+    server = WidgetMCPServer("test", [widget])
+
+    french = call_tool(server, "alpha", _meta={"openai/locale": "fr-CA"})
+    default = call_tool(server, "alpha")
+
+    assert french.meta["openai/locale"] == "fr-FR"
+    assert french.structuredContent["locale"] == "fr-FR"
+    assert french.meta["openai.com/widget"]["resource"]["meta"]["openai/locale"] == (
+        "fr-FR"
+    )
+    assert default.meta["openai/locale"] == "en"
+    assert widget.resolved_locale == "en"
+
+
+def test_list_tools_cached_per_locale():
+    """Each requested locale gets its own cached tool list."""
+    server = WidgetMCPServer(
+        "test", [make_widget("alpha", supported_locales=["en", "es"])]
+    )
+    request = types.ListToolsRequest(
+        method="tools/list",
+        params=types.PaginatedRequestParams(_meta={"openai/locale": "es-MX"}),
+    )
+
+    spanish = call_handler(server, request)
+
+    assert spanish is call_handler(server, request)
+    assert spanish.tools[0].meta["openai/locale"] == "es"
+    assert list_tools(server).tools[0].meta["openai/locale"] == "en"
+
+
+def test_auth_policies_compiled_per_widget():
+    """Auth decorators and server inheritance resolve once into AuthPolicy."""
+    from fastapps import auth_required, no_auth
+
+    alpha = make_widget("alpha")
+    auth_required(scopes=["read", "write"])(type(alpha))
+    beta = make_widget("beta")
+    no_auth(type(beta))
+    gamma = make_widget("gamma")
+
+    server = WidgetMCPServer("test", [alpha, beta, gamma])
+    server.server_requires_auth = True
+    server.server_auth_scopes = ["user"]
+    server.set_widgets([alpha, beta, gamma])
+
+    policy = server.get_auth_policy("alpha")
+    assert policy.requires_auth
+    assert policy.scopes == frozenset({"read", "write"})
+    assert policy.missing_scopes(["read"]) == ["write"]
+    assert policy.missing_scopes(["write", "read", "extra"]) == []
+    assert not server.get_auth_policy("beta").requires_auth
+    # Undecorated widgets inherit the server's requirement
+    assert server.get_auth_policy("gamma").requires_auth
+
+    schemes = {
+        tool.name: tool.meta["securitySchemes"] for tool in list_tools(server).tools
+    }
+    assert schemes["alpha"] == [{"type": "oauth2", "scopes": ["read", "write"]}]
+    assert schemes["beta"] == [{"type": "noauth"}]
+    assert schemes["gamma"] == [{"type": "oauth2", "scopes": ["user"]}]
+
+    result = call_tool(server, "gamma", message="hi")
+    assert result.isError
+    assert result.content[0].text == "Authentication required for this tool"
+    assert not call_tool(server, "beta", message="hi").isError
+
+
+def test_authenticated_call_uses_verified_token():
+    """Tool calls read the bearer token verified by the MCP auth middleware."""
+    from mcp.server.auth.middleware.auth_context import auth_context_var
+    from mcp.server.auth.middleware.bearer_auth import AuthenticatedUser
+    from mcp.server.auth.provider import AccessToken
+
+    from fastapps import auth_required
+
+    class WhoamiWidget(BaseWidget):
+        identifier = "whoami"
+        title = "Whoami"
+        input_schema = EchoInput
+
+        async def execute(self, input_data, context=None, user=None):
+            return {"client": user.client_id, "scopes": sorted(user.scopes)}
+
+    auth_required(scopes=["read"])(WhoamiWidget)
+    widget = WhoamiWidget(WidgetBuildResult(name="whoami", hash="abcd", html=""))
+    server = WidgetMCPServer("test", [widget])
+
+    def call_as(scopes):
+        token = AccessToken(token="opaque", client_id="client-1", scopes=scopes)
+        reset = auth_context_var.set(AuthenticatedUser(token))
+        try:
+            return call_tool(server, "whoami")
+        finally:
+            auth_context_var.reset(reset)
+
+    result = call_as(["read", "profile"])
+    assert not result.isError
+    assert result.structuredContent == {
+        "client": "client-1",
+        "scopes": ["profile", "read"],
+    }
+
+    denied = call_as(["profile"])
+    assert denied.isError
+    assert "Missing required scopes: read" in denied.content[0].text
+
+    anonymous = call_tool(server, "whoami")
+    assert anonymous.isError
+    assert anonymous.content[0].text == "Authentication required for this tool"
@@ -0,0 +1,153 @@
+"""Tests for tools/call hooks and span export."""
+
+import json
+
+import pytest
+
+from fastapps import FileSpanExporter, WidgetMCPServer
+
+from .test_server import call_tool, make_widget
+
+
+def test_hooks_run_in_order_with_phase_timings():
+    """Hooks fire around validation and execution and see phase timings."""
+    server = WidgetMCPServer("test", [make_widget("alpha")])
+    events = []
+
+    @server.hook("before_validate")
+    def before_validate(trace):
+        events.append(("before_validate", dict(trace.phases)))
+
+    @server.hook("after_execute")
+    async def after_execute(trace):
+        events.append(("after_execute", dict(trace.phases)))
+
+    @server.hook("on_response")
+    def on_response(trace):
+        events.append(("on_response", dict(trace.phases)))
+
+    call_tool(server, "alpha", message="hi")
+
+    assert [name for name, _ in events] == [
+        "before_validate",
+        "after_execute",
+        "on_response",
+    ]
+    assert events[0][1] == {}
+    assert set(events[1][1]) == {"validate", "execute"}
+    assert set(events[2][1]) == {"validate", "execute", "build_result"}
+
+
+def test_hooks_can_rewrite_arguments_and_results():
+    """before_validate and after_execute hooks may replace call data."""
+    server = WidgetMCPServer("test", [make_widget("alpha")])
+
+    def shout(trace):
+        trace.arguments["message"] = trace.arguments["message"].upper()
+
+    def tag(trace):
+        trace.result_data = {**trace.result_data, "tagged": True}
+
+    server.add_hook("before_validate", shout)
+    server.add_hook("after_execute", tag)
+
+    result = call_tool(server, "alpha", message="hi")
+
+    assert result.structuredContent["message"] == "HI"
+    assert result.structuredContent["tagged"] is True
+
+
+def test_on_error_hook_and_failing_hooks():
+    """on_error sees the exception; a raising hook never fails the call."""
+    server = WidgetMCPServer("test", [make_widget("alpha")])
+    errors = []
+
+    def broken(trace):
+        raise RuntimeError("hook bug")
+
+    server.add_hook("on_response", broken)
+    server.add_hook("on_error", lambda trace: errors.append(trace.error))
+
+    assert call_tool(server, "alpha", message="hi").isError is False
+    assert call_tool(server, "alpha", message=["bad"]).isError is True
+    assert len(errors) == 1
+    assert errors[0] is not None
+
+    with pytest.raises(ValueError):
+        server.add_hook("after_everything", broken)
+
+
+def test_file_span_exporter(tmp_path):
+    """Each call is written as an OTLP/JSON line with phase child spans."""
+    path = tmp_path / "spans.jsonl"
+    server = WidgetMCPServer(
+        "test", [make_widget("alpha")], span_exporter=FileSpanExporter(path)
+    )
+
+    call_tool(server, "alpha", message="hi")
+
+    lines = path.read_text().splitlines()
+    assert len(lines) == 1
+    spans = json.loads(lines[0])["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    root, *phases = spans
+    assert root["name"] == "tools/call alpha"
+    assert root["status"]["code"] == 1
+    assert {span["name"] for span in phases} == {"validate", "execute", "build_result"}
+    for span in phases:
+        assert span["traceId"] == root["traceId"]
+        assert span["parentSpanId"] == root["spanId"]
+        assert int(span["startTimeUnixNano"]) >= int(root["startTimeUnixNano"])
+        assert int(span["endTimeUnixNano"]) <= int(root["endTimeUnixNano"])
+
+
+def test_span_exporter_batches_in_background(tmp_path):
+    """Exports only enqueue; batches are written together and the queue is bounded."""
+    import asyncio
+
+    from fastapps.core.tracing import ToolCallTrace
+
+    path = tmp_path / "spans.jsonl"
+    exporter = FileSpanExporter(path, flush_interval=60, max_queue=3)
+
+    async def run():
+        for i in range(4):
+            trace = ToolCallTrace(f"tool-{i}", {})
+            trace.finish(None)
+            await exporter.export(trace)
+        # Nothing is written on the request path
+        assert not path.exists()
+        await exporter.shutdown()
+
+    asyncio.run(run())
+
+    lines = path.read_text().splitlines()
+    assert len(lines) == 1
+    spans = json.loads(lines[0])["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert [span["name"] for span in spans] == [
+        f"tools/call tool-{i}" for i in range(3)
+    ]
+    assert exporter.dropped == 1
+
+
+def test_unobserved_calls_skip_the_trace(monkeypatch):
+    """Without hooks, metrics or an exporter no ToolCallTrace is built."""
+    from fastapps.core import server as server_module
+
+    created = []
+
+    class CountingTrace(server_module.ToolCallTrace):
+        def __init__(self, tool, arguments):
+            created.append(tool)
+            super().__init__(tool, arguments)
+
+    monkeypatch.setattr(server_module, "ToolCallTrace", CountingTrace)
+    server = WidgetMCPServer("test", [make_widget("alpha")])
+
+    result = call_tool(server, "alpha", message="hi", _meta={"openai/locale": "en"})
+    assert not result.isError
+    assert result.structuredContent["message"] == "hi"
+    assert created == []
+
+    server.add_hook("on_response", lambda trace: None)
+    call_tool(server, "alpha", message="hi")
+    assert created == ["alpha"]
@@ -1,5 +1,23 @@
 """Tests for FastApps widget functionality."""
 
+from pydantic import BaseModel
+
+from fastapps import BaseWidget, WidgetBuildResult
+
+
+class LocalizedWidget(BaseWidget):
+    identifier = "localized"
+    title = "Localized"
+    input_schema = BaseModel
+    supported_locales = ["en", "en-US", "fr-FR", "es"]
+
+    async def execute(self, input_data, context=None, user=None):
+        return {}
+
+
+def make_localized_widget() -> LocalizedWidget:
+    return LocalizedWidget(WidgetBuildResult(name="localized", hash="abcd", html=""))
+
 
 def test_widget_data_structure(sample_widget_data):
     """Test widget data structure."""
@@ -14,3 +32,34 @@ def test_widget_data_keys(sample_widget_data):
     assert "message" in sample_widget_data
     assert "status" in sample_widget_data
     assert len(sample_widget_data) == 2
+
+
+def test_negotiate_locale_rules():
+    """Negotiation follows exact, language-only, then prefix matching."""
+    widget = make_localized_widget()
+
+    assert widget.negotiate_locale("en-US") == "en-US"
+    assert widget.negotiate_locale("es-MX") == "es"
+    assert widget.negotiate_locale("fr-CA") == "fr-FR"
+    assert widget.negotiate_locale("de-DE") == "en"
+    assert widget.negotiate_locale(None) == "en"
+
+
+def test_negotiate_locale_is_memoized():
+    """Repeated negotiations should be served from the lookup table."""
+    widget = make_localized_widget()
+
+    widget.negotiate_locale("es-MX")
+    widget.supported_locales = ["en"]
+
+    assert widget.negotiate_locale("es-MX") == "es"
+    assert widget.resolved_locale == "en"
+
+
+def test_metadata_for_explicit_locale():
+    """Metadata helpers should accept an explicit locale without mutation."""
+    widget = make_localized_widget()
+
+    assert widget.get_tool_meta("fr-FR")["openai/locale"] == "fr-FR"
+    assert widget.get_resource_meta("es")["openai/locale"] == "es"
+    assert widget.get_tool_meta()["openai/locale"] == "en"